@@ -0,0 +1,389 @@
+"""
+Client for the BDJobs job search API.
+
+Requests go through a pooled keep-alive ``requests.Session`` with connect
+and read timeouts. Connection errors and 502/503/504 responses are retried,
+read timeouts are not, and every search gives up after an overall
+deadline. A circuit breaker stops calling BDJobs for a while after
+repeated failures, so a slow or broken upstream costs a worker a few
+seconds at most instead of piling up blocked requests.
+
+Search results are cached per query with stale-while-revalidate: fresh
+entries are served as is, stale ones are served immediately while a
+background thread refreshes them, and only a cold query waits on BDJobs.
+
+``asearch`` is the async variant used by the async views. Under uvicorn,
+the ASGI lifespan opens one pooled ``httpx.AsyncClient`` on the server's
+event loop (``open_async``), so a process can wait on many cold queries at
+once without tying up threads. Anywhere else, e.g. under WSGI where each
+async view runs on a loop of its own, cold queries go through the pooled
+sync session on a thread instead.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+from sikari import metrics
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PATH = "/Jobs/api/JobSearch/GetJobSearch"
+RETRY_STATUSES = (502, 503, 504)
+# Errors raised by responses that are not JSON or not shaped as expected
+MALFORMED = (ValueError, AttributeError, TypeError)
+
+upstream_requests = metrics.counter(
+    "bdjobs_requests_total", "Requests sent to the BDJobs API"
+)
+upstream_failures = metrics.counter(
+    "bdjobs_failures_total", "Failed requests to the BDJobs API"
+)
+stale_served = metrics.counter(
+    "bdjobs_stale_served_total", "Stale BDJobs results served while refreshing"
+)
+
+
+class BDJobsError(Exception):
+    """BDJobs could not be reached or returned an unusable response."""
+
+
+class CircuitOpenError(BDJobsError):
+    """Requests are short-circuited after repeated BDJobs failures."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and
+    ``allow`` refuses calls for ``reset_timeout`` seconds. Then a single
+    trial call is let through: success closes the circuit, failure opens
+    it again. A trial that is cancelled or fails unexpectedly is released,
+    so the next caller gets to try.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self._trial = True
+            return True
+
+    def release(self) -> None:
+        """Give back a trial call that ended without a result."""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+def backoff(attempt: int) -> float:
+    """Seconds to wait before retry number ``attempt`` (from 0)."""
+    return 0.3 * 2**attempt
+
+
+def normalize_job(job: dict) -> dict:
+    """Map a BDJobs search result to the fields of ``BDJobSchema``."""
+    return {
+        "id": job.get("Jobid"),
+        "title": job.get("jobTitle"),
+        "company": job.get("companyName"),
+        "location": job.get("location"),
+        "is_remote": job.get("OnlineJob", False),
+        "recommended_experience": job.get("experience"),
+        "description": job.get("jobContext"),
+        "deadline": job.get("deadline"),
+    }
+
+
+class BDJobsClient:
+    """
+    BDJobs search client with a per-query stale-while-revalidate cache.
+
+    Args:
+        base_url: Scheme and host of the BDJobs API
+        connect_timeout: Seconds to wait for a connection
+        read_timeout: Seconds to wait for response data
+        retries: Retries on connection errors and 502/503/504 responses
+        deadline: Seconds a fetch may take overall, retries included
+        fresh_for: Seconds a cached result is served without refreshing
+        stale_for: Seconds a cached result may still be served while it
+            is refreshed in the background
+        pool_size: Keep-alive connections kept to BDJobs
+        breaker: Circuit breaker, a default one when omitted
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        retries: int = 2,
+        deadline: float = 15.0,
+        fresh_for: int = 300,
+        stale_for: int = 3600,
+        pool_size: int = 10,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.deadline = deadline
+        self.pool_size = pool_size
+        self.fresh_for = fresh_for
+        self.stale_for = stale_for
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        # Retries are done by fetch, which can keep them within the deadline
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="bdjobs-refresh"
+        )
+        self._refreshing: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # Opened by open_async; httpx clients are bound to their event loop
+        self._async_client: httpx.AsyncClient | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def from_settings(cls) -> "BDJobsClient":
+        return cls(
+            settings.BDJOBS_BASE_URL,
+            connect_timeout=settings.BDJOBS_CONNECT_TIMEOUT,
+            read_timeout=settings.BDJOBS_READ_TIMEOUT,
+            deadline=settings.BDJOBS_DEADLINE,
+            fresh_for=settings.BDJOBS_CACHE_FRESH,
+            stale_for=settings.BDJOBS_CACHE_STALE,
+        )
+
+    def fetch(self, query: str) -> list[dict]:
+        """
+        Search BDJobs, bypassing the cache.
+
+        Raises:
+            CircuitOpenError: The circuit is open
+            BDJobsError: The request failed or the response was not JSON
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("BDJobs circuit is open")
+        upstream_requests.inc()
+        try:
+            response = self._get(query, time.monotonic() + self.deadline)
+            response.raise_for_status()
+            jobs = [normalize_job(job) for job in response.json().get("data") or []]
+        except MALFORMED + (requests.RequestException,) as exc:
+            upstream_failures.inc()
+            self.breaker.record_failure()
+            raise BDJobsError(str(exc)) from exc
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return jobs
+
+    def _get(self, query: str, deadline: float) -> requests.Response:
+        """
+        Send a search request, retrying until ``deadline`` (monotonic time).
+
+        Connection errors and 502/503/504 responses are retried with
+        exponential backoff; a read timeout means BDJobs is slow, so it is
+        not. Timeouts are shortened to the time left before the deadline.
+
+        Raises:
+            requests.RequestException: The request failed or the deadline
+                passed
+        """
+        connect, read = self.timeout
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.Timeout("BDJobs deadline exceeded")
+            try:
+                response = self.session.get(
+                    f"{self.base_url}{SEARCH_PATH}",
+                    params=self.params(query),
+                    timeout=(min(connect, remaining), min(read, remaining)),
+                )
+            except requests.ConnectionError:
+                if attempt >= self.retries:
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt >= self.retries
+                ):
+                    return response
+            time.sleep(max(0.0, min(backoff(attempt), deadline - time.monotonic())))
+            attempt += 1
+
+    def params(self, query: str) -> dict:
+        return {"isPro": 1, "rpp": 50, "pg": 1, "keyword": query}
+
+    async def open_async(self) -> None:
+        """Open the pooled async client on the running event loop."""
+        if self._async_client is None:
+            connect, read = self.timeout
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(read, connect=connect),
+                limits=httpx.Limits(max_keepalive_connections=self.pool_size),
+                transport=httpx.AsyncHTTPTransport(retries=self.retries),
+            )
+            self._async_loop = asyncio.get_running_loop()
+
+    async def aclose(self) -> None:
+        """Close the async client opened by ``open_async``."""
+        client, self._async_client, self._async_loop = self._async_client, None, None
+        if client is not None:
+            await client.aclose()
+
+    async def afetch(self, query: str) -> list[dict]:
+        """
+        Async variant of ``fetch``.
+
+        Uses the client of ``open_async`` when it was opened on the running
+        loop, and ``fetch`` on a thread otherwise. Connection errors are
+        retried by the transport and 502/503/504 responses here, with the
+        same backoff and deadline as ``fetch``.
+        """
+        client = self._async_client
+        if client is None or self._async_loop is not asyncio.get_running_loop():
+            return await sync_to_async(self.fetch, thread_sensitive=False)(query)
+        if not self.breaker.allow():
+            raise CircuitOpenError("BDJobs circuit is open")
+        upstream_requests.inc()
+        try:
+            async with asyncio.timeout(self.deadline):
+                for attempt in range(self.retries + 1):
+                    response = await client.get(SEARCH_PATH, params=self.params(query))
+                    if response.status_code not in RETRY_STATUSES:
+                        break
+                    if attempt < self.retries:
+                        await asyncio.sleep(backoff(attempt))
+            response.raise_for_status()
+            jobs = [normalize_job(job) for job in response.json().get("data") or []]
+        except MALFORMED + (httpx.HTTPError, TimeoutError) as exc:
+            upstream_failures.inc()
+            self.breaker.record_failure()
+            raise BDJobsError(str(exc)) from exc
+        except BaseException:
+            # Cancelled, e.g. the client disconnected
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return jobs
+
+    def cache_key(self, query: str) -> str:
+        digest = hashlib.sha256(query.strip().lower().encode()).hexdigest()
+        return f"bdjobs:search:{digest}"
+
+    def search(self, query: str) -> list[dict]:
+        """
+        Search BDJobs through the stale-while-revalidate cache.
+
+        Raises:
+            BDJobsError: Nothing is cached and BDJobs is unavailable
+        """
+        key = self.cache_key(query)
+        entry = cache.get(key)
+        if entry is None:
+            return self._refresh(key, query)
+        if time.time() - entry["fetched_at"] >= self.fresh_for:
+            stale_served.inc()
+            self.refresh_in_background(query)
+        return entry["results"]
+
+    async def asearch(self, query: str) -> list[dict]:
+        """Async variant of ``search``; stale entries refresh on a thread."""
+        key = self.cache_key(query)
+        entry = await cache.aget(key)
+        if entry is None:
+            try:
+                results = await self.afetch(query)
+            except BDJobsError:
+                logger.warning("BDJobs search failed for %r", query, exc_info=True)
+                raise
+            await cache.aset(
+                key,
+                {"results": results, "fetched_at": time.time()},
+                timeout=self.fresh_for + self.stale_for,
+            )
+            return results
+        if time.time() - entry["fetched_at"] >= self.fresh_for:
+            stale_served.inc()
+            self.refresh_in_background(query)
+        return entry["results"]
+
+    def refresh_in_background(self, query: str) -> Future:
+        """Refresh a query's cache entry once, however many callers ask."""
+        key = self.cache_key(query)
+        with self._lock:
+            future = self._refreshing.get(key)
+            if future is None:
+                future = self._executor.submit(self._refresh, key, query)
+                self._refreshing[key] = future
+                future.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        return future
+
+    def _refresh(self, key: str, query: str) -> list[dict]:
+        try:
+            results = self.fetch(query)
+        except BDJobsError:
+            logger.warning("BDJobs search failed for %r", query, exc_info=True)
+            raise
+        cache.set(
+            key,
+            {"results": results, "fetched_at": time.time()},
+            timeout=self.fresh_for + self.stale_for,
+        )
+        return results
+
+
+_client: BDJobsClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> BDJobsClient:
+    """Process-wide client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = BDJobsClient.from_settings()
+        return _client
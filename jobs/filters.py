@@ -1,16 +1,34 @@
 import django_filters
 
+from users.fuzzy import DEFAULT_SIMILARITY, fuzzy_filter, fuzzy_skill_ids
+
 from .models import Job
 
 
 class JobFilter(django_filters.FilterSet):
     skill = django_filters.CharFilter(method="filter_skill")
-    location = django_filters.CharFilter(field_name="location", lookup_expr="icontains")
+    location = django_filters.CharFilter(method="filter_location")
     job_type = django_filters.CharFilter(field_name="job_type", lookup_expr="iexact")
+    # Minimum trigram similarity of the fuzzy skill and location filters
+    similarity = django_filters.NumberFilter(method="filter_similarity")
 
     class Meta:
         model = Job
         fields = ["skill", "location", "job_type", "is_remote"]
 
+    @property
+    def threshold(self):
+        similarity = self.form.cleaned_data.get("similarity")
+        return DEFAULT_SIMILARITY if similarity is None else float(similarity)
+
+    def filter_similarity(self, queryset, name, value):
+        # Only read by the fuzzy filters
+        return queryset
+
     def filter_skill(self, queryset, name, value):
-        return queryset.filter(required_skills__name__icontains=value)
+        return queryset.filter(
+            required_skills__in=fuzzy_skill_ids(value, self.threshold)
+        )
+
+    def filter_location(self, queryset, name, value):
+        return fuzzy_filter(queryset, "location", value, self.threshold)
@@ -0,0 +1,33 @@
+"""
+Management command to pre-warm the YouTube search cache.
+
+Runs a search for every skill name that is not cached yet, so the first
+users searching a skill get cached results.
+
+Usage:
+    python manage.py warm_youtube_cache
+    python manage.py warm_youtube_cache --limit 10
+"""
+
+from django.core.management.base import BaseCommand
+
+from jobs.youtube import get_service
+from users.models import Skill
+
+
+class Command(BaseCommand):
+    help = "Pre-warm the YouTube search cache for every skill name"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=5,
+            help="Number of results cached per skill",
+        )
+
+    def handle(self, *args, **options):
+        names = Skill.objects.order_by("name").values_list("name", flat=True)
+        self.stdout.write(f"Warming YouTube searches for {len(names)} skills...")
+        ran, failed = get_service().warm(names, limit=options["limit"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Ran {ran} searches ({failed} failed)"))
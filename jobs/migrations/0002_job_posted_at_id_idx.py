@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0001_initial"),
+        ("users", "0012_userrecommendation"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(fields=["posted_at", "id"], name="job_posted_at_id_idx"),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.8 on 2026-10-17 17:46
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+POSTGRES_INDEX = "job_search_vector_gin"
+SQLITE_TABLE = "jobs_job_fts"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX {POSTGRES_INDEX} ON jobs_job USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            """
+            UPDATE jobs_job AS j SET search_vector =
+                setweight(to_tsvector('english', coalesce(j.title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce((
+                    SELECT string_agg(s.name, ' ')
+                    FROM users_skill s
+                    JOIN jobs_job_required_skills r ON r.skill_id = s.id
+                    WHERE r.job_id = j.id
+                ), '')), 'A')
+                || setweight(to_tsvector('english', coalesce(j.company, '')), 'B')
+                || setweight(to_tsvector('english', coalesce(j.description, '')), 'C')
+            """
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {SQLITE_TABLE} USING fts5("
+            "title, company, description, skills, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            f"""
+            INSERT INTO {SQLITE_TABLE} (rowid, title, company, description, skills)
+            SELECT j.id, j.title, j.company, coalesce(j.description, ''),
+                coalesce((
+                    SELECT group_concat(s.name, ' ')
+                    FROM users_skill s
+                    JOIN jobs_job_required_skills r ON r.skill_id = s.id
+                    WHERE r.job_id = j.id
+                ), '')
+            FROM jobs_job j
+            """
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {POSTGRES_INDEX}")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SQLITE_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0002_job_posted_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:05
+
+from django.db import migrations
+
+INDEX = "job_location_trgm"
+
+
+def create_index(apps, schema_editor):
+    # Trigram indexes only exist on PostgreSQL; other backends use the
+    # in-memory index of users.fuzzy
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX {INDEX} ON jobs_job USING gin (location gin_trgm_ops)"
+        )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0003_job_search"),
+        # pg_trgm extension
+        ("users", "0013_skill_name_trgm"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
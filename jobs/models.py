@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from users.models import Skill
@@ -21,6 +22,15 @@ class Job(models.Model):
     )
     description = models.TextField(blank=True, null=True)
     posted_at = models.DateTimeField(auto_now_add=True)
+    # Full-text search document maintained by jobs.search (PostgreSQL only;
+    # its GIN index is created by migration 0003)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = (
+            # Keyset pagination of the job listing on (posted_at, id)
+            models.Index(fields=["posted_at", "id"], name="job_posted_at_id_idx"),
+        )
 
     def __str__(self):
         return f"{self.title} @ {self.company}"
@@ -16,6 +16,13 @@ class JobSchema(Schema):
     posted_at: str
 
 
+class JobPageSchema(Schema):
+    """One page of jobs from keyset pagination."""
+
+    items: list[JobSchema]
+    next_cursor: str | None = None
+
+
 class BDJobSchema(Schema):
     id: Optional[int] = None
     title: Optional[str] = None
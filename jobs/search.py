@@ -0,0 +1,145 @@
+"""
+Full-text search over the job catalog.
+
+Jobs are ranked over their title, company, description and required skill
+names. On PostgreSQL the document is stored in ``Job.search_vector`` and
+served by a GIN index; on SQLite it lives in the ``jobs_job_fts`` FTS5
+virtual table keyed by job id. Other backends fall back to ``icontains``
+lookups. The index is kept up to date from ``jobs.signals``.
+"""
+
+import json
+import re
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+
+from users.models import Skill
+
+from .models import Job
+
+# Text search configuration used for the PostgreSQL document and queries
+SEARCH_CONFIG = "english"
+
+# FTS5 table created by migration 0003 on SQLite
+FTS_TABLE = "jobs_job_fts"
+
+# bm25 column weights for title, company, description and skills
+FTS_WEIGHTS = (10.0, 5.0, 1.0, 5.0)
+
+
+def _skill_names():
+    """Subquery aggregating the required skill names of the outer job."""
+    names = (
+        Skill.objects.filter(jobs=OuterRef("pk"))
+        .values("jobs")
+        .annotate(names=StringAgg("name", " "))
+        .values("names")
+    )
+    return Coalesce(Subquery(names), Value(""), output_field=TextField())
+
+
+def _search_vector():
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(_skill_names(), weight="A", config=SEARCH_CONFIG)
+        + SearchVector("company", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def _fts_query(q: str) -> str:
+    """Quote every word of ``q`` so user input is never parsed as FTS5 syntax."""
+    return " ".join(f'"{term}"' for term in re.findall(r"\w+", q))
+
+
+def update_search_index(job_ids=None) -> None:
+    """
+    Recompute the search document of the given jobs.
+
+    Args:
+        job_ids: Ids of the jobs to reindex, or None to rebuild every job.
+            Ids of deleted jobs are dropped from the index.
+    """
+    if connection.vendor == "postgresql":
+        jobs = (
+            Job.objects.all() if job_ids is None else Job.objects.filter(pk__in=job_ids)
+        )
+        jobs.update(search_vector=_search_vector())
+    elif connection.vendor == "sqlite":
+        jobs = Job.objects.prefetch_related("required_skills")
+        with connection.cursor() as cursor:
+            if job_ids is None:
+                cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            else:
+                job_ids = list(job_ids)
+                jobs = jobs.filter(pk__in=job_ids)
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLE} "
+                    "WHERE rowid IN (SELECT value FROM json_each(%s))",
+                    [json.dumps(job_ids)],
+                )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} "
+                "(rowid, title, company, description, skills) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                [
+                    (
+                        job.pk,
+                        job.title,
+                        job.company,
+                        job.description or "",
+                        " ".join(s.name for s in job.required_skills.all()),
+                    )
+                    for job in jobs
+                ],
+            )
+
+
+def search_jobs(q: str, limit: int) -> list[Job]:
+    """
+    Search jobs, best match first.
+
+    Args:
+        q: Free text query
+        limit: Maximum number of jobs to return
+
+    Returns:
+        List of Job objects with ``required_skills`` prefetched
+    """
+    jobs = Job.objects.prefetch_related("required_skills")
+
+    if connection.vendor == "postgresql":
+        query = SearchQuery(q, search_type="websearch", config=SEARCH_CONFIG)
+        return list(
+            jobs.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-posted_at", "-id")[:limit]
+        )
+
+    if connection.vendor == "sqlite":
+        match = _fts_query(q)
+        if not match:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, %s, %s, %s, %s) LIMIT %s",
+                [match, *FTS_WEIGHTS, limit],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        found = jobs.in_bulk(ids)
+        return [found[pk] for pk in ids if pk in found]
+
+    terms = Q()
+    for term in q.split():
+        terms &= (
+            Q(title__icontains=term)
+            | Q(company__icontains=term)
+            | Q(description__icontains=term)
+            | Q(required_skills__name__icontains=term)
+        )
+    return list(jobs.filter(terms).distinct().order_by("-posted_at", "-id")[:limit])
@@ -0,0 +1,57 @@
+"""
+Signal receivers keeping the job search index of ``jobs.search`` up to date.
+
+Skill names are part of a job's search document, so changes to the
+``required_skills`` relation and renames or deletions of skills reindex
+the affected jobs as well.
+"""
+
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from users.models import Skill
+
+from .models import Job
+from .search import update_search_index
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def job_changed(sender, instance, **kwargs):
+    update_search_index([instance.pk])
+
+
+@receiver(m2m_changed, sender=Job.required_skills.through)
+def job_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            update_search_index([instance.pk])
+    elif action == "pre_clear":
+        # clear() does not report which jobs it unlinks
+        instance._search_clear_pks = set(instance.jobs.values_list("pk", flat=True))
+    elif action == "post_clear":
+        update_search_index(instance.__dict__.pop("_search_clear_pks", set()))
+    elif action in ("post_add", "post_remove"):
+        update_search_index(pk_set)
+
+
+@receiver(post_save, sender=Skill)
+def skill_saved(sender, instance, created, **kwargs):
+    if not created:
+        update_search_index(instance.jobs.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Skill)
+def skill_deleting(sender, instance, **kwargs):
+    # Through rows are removed by cascade without m2m_changed
+    instance._search_job_pks = set(instance.jobs.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Skill)
+def skill_deleted(sender, instance, **kwargs):
+    update_search_index(instance.__dict__.pop("_search_job_pks", set()))
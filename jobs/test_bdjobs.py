@@ -0,0 +1,290 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from jobs import bdjobs
+from jobs.bdjobs import BDJobsClient, BDJobsError, CircuitBreaker, CircuitOpenError
+from sikari.lifespan import LifespanMiddleware
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class StubBDJobs:
+    """Local HTTP server standing in for the BDJobs API."""
+
+    def __init__(self):
+        self.status = 200
+        self.delay = 0
+        self.titles = ["Python Developer"]
+        # Response body replacing the generated one
+        self.payload = None
+        self.queries = []
+        # Client port of each request, one per connection used
+        self.ports = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.queries.append(self.path)
+                stub.ports.append(self.client_address[1])
+                time.sleep(stub.delay)
+                payload = stub.payload or {
+                    "data": [
+                        {"Jobid": i, "jobTitle": title, "companyName": "Acme"}
+                        for i, title in enumerate(stub.titles)
+                    ]
+                }
+                body = json.dumps(payload).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            # Keep-alive, so clients can reuse connections
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        # Clients that timed out hang up before delayed responses are written
+        self.server.handle_error = lambda *args: None
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@override_settings(CACHES=LOCMEM)
+class BDJobsClientTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.stub = StubBDJobs()
+        self.addCleanup(self.stub.close)
+
+    def client_for(self, **kwargs):
+        return BDJobsClient(self.stub.url, retries=0, **kwargs)
+
+    def test_fetch_normalizes_results(self):
+        results = self.client_for().fetch("python dev")
+        self.assertEqual(results[0]["title"], "Python Developer")
+        self.assertEqual(results[0]["company"], "Acme")
+        self.assertIn("keyword=python+dev", self.stub.queries[0])
+
+    def test_fresh_results_come_from_cache(self):
+        client = self.client_for()
+        client.search("python")
+        self.assertEqual(client.search(" Python "), client.search("python"))
+        self.assertEqual(len(self.stub.queries), 1)
+
+    def test_stale_results_are_served_while_refreshing(self):
+        client = self.client_for(fresh_for=0)
+        client.search("python")
+        self.stub.titles = ["Senior Python Developer"]
+
+        stale = client.search("python")
+        self.assertEqual(stale[0]["title"], "Python Developer")
+        client.refresh_in_background("python").result(timeout=5)
+
+        client.fresh_for = 60
+        self.assertEqual(client.search("python")[0]["title"], "Senior Python Developer")
+
+    def test_stale_results_survive_upstream_failure(self):
+        client = self.client_for(fresh_for=0)
+        client.search("python")
+        self.stub.status = 500
+
+        with self.assertLogs("jobs.bdjobs", "WARNING"):
+            self.assertEqual(client.search("python")[0]["title"], "Python Developer")
+            with self.assertRaises(BDJobsError):
+                client.refresh_in_background("python").result(timeout=5)
+
+    def test_retries_unavailable_upstream(self):
+        self.stub.status = 503
+        with self.assertRaises(BDJobsError):
+            BDJobsClient(self.stub.url, retries=2).fetch("python")
+        self.assertEqual(len(self.stub.queries), 3)
+
+    def test_read_timeout_is_not_retried(self):
+        self.stub.delay = 0.3
+        with self.assertRaises(BDJobsError):
+            BDJobsClient(self.stub.url, read_timeout=0.1, retries=2).fetch("python")
+        self.assertEqual(len(self.stub.queries), 1)
+
+    def test_retries_stop_at_deadline(self):
+        self.stub.status = 503
+        client = BDJobsClient(self.stub.url, retries=10, deadline=0.5)
+        started = time.monotonic()
+        with self.assertRaises(BDJobsError):
+            client.fetch("python")
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertLess(len(self.stub.queries), 5)
+
+    def test_circuit_opens_after_repeated_failures(self):
+        self.stub.status = 500
+        client = self.client_for(breaker=CircuitBreaker(failure_threshold=2))
+        for _ in range(2):
+            with self.assertRaises(BDJobsError):
+                client.fetch("python")
+        with self.assertRaises(CircuitOpenError):
+            client.fetch("python")
+        self.assertEqual(len(self.stub.queries), 2)
+
+    def test_circuit_closes_after_successful_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        client = self.client_for(breaker=breaker)
+        self.stub.status = 500
+        with self.assertRaises(BDJobsError):
+            client.fetch("python")
+
+        self.stub.status = 200
+        client.fetch("python")
+        self.assertIsNone(breaker.opened_at)
+
+    def test_malformed_results_fail_the_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.stub.payload = {"data": [1, 2]}
+        with self.assertRaises(BDJobsError):
+            self.client_for(breaker=breaker).fetch("python")
+        self.assertEqual(breaker.failures, 2)
+        self.assertTrue(breaker.allow())
+
+
+@override_settings(CACHES=LOCMEM)
+class AsyncBDJobsClientTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.stub = StubBDJobs()
+        self.addCleanup(self.stub.close)
+
+    def run_opened(self, client, func):
+        """Await ``func()`` on one loop with the client's async pool open."""
+
+        async def main():
+            await client.open_async()
+            try:
+                return await func()
+            finally:
+                await client.aclose()
+
+        return async_to_sync(main)()
+
+    def test_search_is_cached(self):
+        client = BDJobsClient(self.stub.url, retries=0)
+
+        async def search_twice():
+            first = await client.asearch("python")
+            return first, await client.asearch(" Python ")
+
+        first, second = self.run_opened(client, search_twice)
+        self.assertEqual(first[0]["title"], "Python Developer")
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.stub.queries), 1)
+
+    def test_concurrent_searches(self):
+        client = BDJobsClient(self.stub.url, retries=0)
+
+        async def search_many():
+            queries = [f"query {i}" for i in range(20)]
+            return await asyncio.gather(*(client.asearch(q) for q in queries))
+
+        self.assertEqual(len(self.run_opened(client, search_many)), 20)
+        self.assertEqual(len(self.stub.queries), 20)
+
+    def test_async_pool_reuses_connections(self):
+        client = BDJobsClient(self.stub.url, retries=0)
+
+        async def fetch_three():
+            for query in ("a", "b", "c"):
+                await client.afetch(query)
+
+        self.run_opened(client, fetch_three)
+        self.assertEqual(len(set(self.stub.ports)), 1)
+        self.assertIsNone(client._async_client)
+
+    def test_without_async_pool_uses_session(self):
+        # As under WSGI, where every async view call runs on a new loop
+        client = BDJobsClient(self.stub.url, retries=0)
+        for query in ("a", "b", "c"):
+            self.assertEqual(len(async_to_sync(client.afetch)(query)), 1)
+        self.assertEqual(len(set(self.stub.ports)), 1)
+
+    def test_cancelled_trial_is_released(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        client = BDJobsClient(self.stub.url, retries=0, breaker=breaker)
+        self.stub.delay = 0.5
+
+        async def disconnect():
+            with self.assertRaises(TimeoutError):
+                await asyncio.wait_for(client.afetch("python"), 0.1)
+
+        self.run_opened(client, disconnect)
+        self.assertTrue(breaker.allow())
+
+    def test_retries_unavailable_upstream(self):
+        self.stub.status = 503
+        client = BDJobsClient(self.stub.url, retries=1)
+        with (
+            self.assertLogs("jobs.bdjobs", "WARNING"),
+            self.assertRaises(BDJobsError),
+        ):
+            self.run_opened(client, lambda: client.asearch("python"))
+        self.assertEqual(len(self.stub.queries), 2)
+
+    def test_lifespan_opens_and_closes_pool(self):
+        client = BDJobsClient(self.stub.url)
+        messages = ["lifespan.startup", "lifespan.shutdown"]
+        sent = []
+
+        async def receive():
+            return {"type": messages.pop(0)}
+
+        async def send(message):
+            sent.append((message["type"], client._async_client is not None))
+
+        with mock.patch.object(bdjobs, "get_client", return_value=client):
+            async_to_sync(LifespanMiddleware(None))({"type": "lifespan"}, receive, send)
+        self.assertEqual(
+            sent,
+            [
+                ("lifespan.startup.complete", True),
+                ("lifespan.shutdown.complete", False),
+            ],
+        )
+
+
+@override_settings(CACHES=LOCMEM)
+class BDJobsEndpointTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.stub = StubBDJobs()
+        self.addCleanup(self.stub.close)
+        bdjobs._client = None
+        self.addCleanup(setattr, bdjobs, "_client", None)
+
+    def test_search(self):
+        with self.settings(BDJOBS_BASE_URL=self.stub.url):
+            response = self.client.get("/api/bdjobs/search", {"query": "python"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["title"], "Python Developer")
+
+    def test_unavailable_upstream(self):
+        self.stub.status = 500
+        with (
+            self.settings(BDJOBS_BASE_URL=self.stub.url),
+            self.assertLogs("jobs.bdjobs"),
+        ):
+            response = self.client.get("/api/bdjobs/search", {"query": "python"})
+        self.assertEqual(response.status_code, 503)
@@ -0,0 +1,133 @@
+import threading
+from io import StringIO
+from typing import ClassVar
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from jobs import youtube
+from jobs.youtube import YouTubeSearchError, YouTubeSearchService
+from users.models import Skill
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class FakeExtractor:
+    """Offline extractor recording its calls, optionally blocking on a gate."""
+
+    calls: ClassVar[list] = []
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.started = threading.Event()
+        self.calls = FakeExtractor.calls
+
+    def __call__(self, query, limit):
+        self.calls.append((query, limit))
+        self.started.set()
+        if self.gate:
+            self.gate.wait(5)
+        return [
+            {"title": f"{query} #{i}", "url": f"https://youtu.be/{i}"}
+            for i in range(limit)
+        ]
+
+
+class YouTubeSearchServiceTests(SimpleTestCase):
+    def setUp(self):
+        FakeExtractor.calls.clear()
+
+    def test_results_are_cached_per_normalized_query_and_limit(self):
+        service = YouTubeSearchService(FakeExtractor())
+        first = service.search("Django  Tutorial", 3)
+        self.assertEqual(service.search(" django tutorial ", 3), first)
+        service.search("django tutorial", 4)
+        self.assertEqual(
+            FakeExtractor.calls, [("django tutorial", 3), ("django tutorial", 4)]
+        )
+
+    def test_least_recently_used_entries_are_evicted(self):
+        service = YouTubeSearchService(FakeExtractor(), max_entries=2)
+        service.search("a")
+        service.search("b")
+        service.search("a")
+        service.search("c")  # evicts "b"
+        service.search("a")
+        service.search("b")
+        self.assertEqual([q for q, _ in FakeExtractor.calls], ["a", "b", "c", "b"])
+
+    def test_expired_entries_are_refetched(self):
+        service = YouTubeSearchService(FakeExtractor(), ttl=0)
+        service.search("a")
+        service.search("a")
+        self.assertEqual(len(FakeExtractor.calls), 2)
+
+    def test_concurrent_identical_searches_share_one_extraction(self):
+        gate = threading.Event()
+        extractor = FakeExtractor(gate)
+        service = YouTubeSearchService(extractor)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(service.search("a")))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        extractor.started.wait(5)
+        gate.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(FakeExtractor.calls), 1)
+        self.assertEqual(len(results), 4)
+
+    def test_saturated_service_fails_fast(self):
+        gate = threading.Event()
+        service = YouTubeSearchService(FakeExtractor(gate), max_pending=1)
+        service.submit("a")
+        with self.assertRaises(YouTubeSearchError):
+            service.search("b")
+        gate.set()
+
+    def test_extractor_errors_are_wrapped(self):
+        def broken(query, limit):
+            raise RuntimeError("offline")
+
+        with self.assertRaises(YouTubeSearchError):
+            YouTubeSearchService(broken).search("a")
+
+    def test_async_timeout_does_not_cancel_shared_search(self):
+        gate = threading.Event()
+        service = YouTubeSearchService(FakeExtractor(gate), timeout=0.01)
+        with self.assertRaises(YouTubeSearchError):
+            async_to_sync(service.asearch)("a")
+        shared = service.submit("a")
+        gate.set()
+        self.assertEqual(len(shared.result(timeout=5)), 5)
+        self.assertEqual(async_to_sync(service.asearch)("a"), shared.result())
+        self.assertEqual(len(FakeExtractor.calls), 1)
+
+
+@override_settings(CACHES=LOCMEM, YOUTUBE_EXTRACTOR="jobs.test_youtube.FakeExtractor")
+class YouTubeSearchIntegrationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        FakeExtractor.calls.clear()
+        youtube._service = None
+        self.addCleanup(setattr, youtube, "_service", None)
+
+    def test_endpoint(self):
+        response = self.client.get("/api/youtube/search", {"query": "Go", "limit": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["title"] for r in response.json()], ["go #0", "go #1"])
+
+    def test_warm_command_searches_every_skill_once(self):
+        Skill.objects.create(name="Python")
+        Skill.objects.create(name="Docker")
+        youtube.get_service().search("python")
+
+        out = StringIO()
+        call_command("warm_youtube_cache", stdout=out)
+        self.assertIn("Ran 1 searches", out.getvalue())
+        self.assertCountEqual(FakeExtractor.calls, [("python", 5), ("docker", 5)])
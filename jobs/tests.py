@@ -0,0 +1,191 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from sikari.caching import route_hits
+from sikari.pagination import encode_cursor
+from users.models import Skill
+
+from .models import Job
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class JobsRouteCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.python = Skill.objects.create(name="Python")
+        self.job = Job.objects.create(title="Python Dev", company="Tech Corp")
+        self.job.required_skills.set([self.python])
+
+    def test_list_jobs_served_from_cache(self):
+        first = self.client.get("/api/jobs?skill=python&job_type=Full-time")
+        self.assertEqual(first.status_code, 200)
+
+        # Same query parameters in a different order hit the same entry
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/jobs?job_type=Full-time&skill=python")
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second["Content-Type"], first["Content-Type"])
+
+    def test_job_write_invalidates_cached_routes(self):
+        self.client.get(f"/api/jobs/{self.job.id}")
+
+        # The catalog version is bumped once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = "Senior Python Dev"
+            self.job.save()
+
+        response = self.client.get(f"/api/jobs/{self.job.id}")
+        self.assertEqual(response.json()["title"], "Senior Python Dev")
+
+    async def test_get_job_over_asgi(self):
+        first = await self.async_client.get(f"/api/jobs/{self.job.id}")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["required_skills"], ["Python"])
+
+        hits = route_hits.value
+        second = await self.async_client.get(f"/api/jobs/{self.job.id}")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(route_hits.value, hits + 1)
+
+    def test_errors_are_not_cached(self):
+        self.assertEqual(self.client.get("/api/jobs/999").status_code, 404)
+        # bulk_create sends no signals, so no version bump hides a cached 404
+        Job.objects.bulk_create([Job(id=999, title="Late", company="Tech Corp")])
+        self.assertEqual(self.client.get("/api/jobs/999").status_code, 200)
+
+
+class JobsPaginationTests(TestCase):
+    def setUp(self):
+        python = Skill.objects.create(name="Python")
+        jobs = Job.objects.bulk_create(
+            Job(title=f"Job {i}", company="Tech Corp") for i in range(7)
+        )
+        for job in jobs:
+            job.required_skills.set([python])
+        # Two jobs share a timestamp so the id tie-breaker is exercised
+        newest = jobs[0].posted_at
+        for offset, job in enumerate(jobs):
+            job.posted_at = newest - timedelta(minutes=min(offset, 5))
+        Job.objects.bulk_update(jobs, ["posted_at"])
+        self.expected = [
+            job.id
+            for job in sorted(jobs, key=lambda j: (j.posted_at, j.id), reverse=True)
+        ]
+
+    def test_cursor_walks_every_job_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            page = self.client.get("/api/jobs", params).json()
+            self.assertLessEqual(len(page["items"]), 3)
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.expected)
+
+    def test_query_count_is_independent_of_page_size(self):
+        for limit in (1, 7):
+            with self.assertNumQueries(2):
+                response = self.client.get("/api/jobs", {"limit": limit})
+            self.assertEqual(len(response.json()["items"]), limit)
+
+    def test_limit_is_capped(self):
+        response = self.client.get("/api/jobs", {"limit": 10_000})
+        self.assertEqual(len(response.json()["items"]), 7)
+        self.assertIsNone(response.json()["next_cursor"])
+
+    def test_invalid_cursor(self):
+        posted_at = "2026-01-01T00:00:00+00:00"
+        for cursor in (
+            "garbage",
+            encode_cursor("not-a-date", 1),
+            encode_cursor(posted_at, "abc"),
+            encode_cursor(posted_at, None),
+            encode_cursor("2026-01-01T00:00:00", 1),
+        ):
+            response = self.client.get("/api/jobs", {"cursor": cursor})
+            self.assertEqual(response.status_code, 400)
+
+
+class JobSearchTests(TestCase):
+    def setUp(self):
+        self.django = Skill.objects.create(name="Django")
+        self.backend = Job.objects.create(
+            title="Backend Engineer",
+            company="Tech Corp",
+            description="Build APIs for the analyst team",
+        )
+        self.backend.required_skills.set([self.django])
+        self.analyst = Job.objects.create(
+            title="Data Analyst",
+            company="Numbers Ltd",
+            description="Reporting and dashboards",
+        )
+
+    def search(self, q):
+        response = self.client.get("/api/jobs/search", {"q": q})
+        self.assertEqual(response.status_code, 200)
+        return [job["id"] for job in response.json()]
+
+    def test_ranks_title_above_description(self):
+        self.assertEqual(self.search("analyst"), [self.analyst.id, self.backend.id])
+        # Every term must match; stemming matches plural forms
+        self.assertEqual(self.search("analyst dashboard"), [self.analyst.id])
+        self.assertEqual(self.search("engineers"), [self.backend.id])
+
+    def test_skill_changes_are_indexed(self):
+        self.assertEqual(self.search("django"), [self.backend.id])
+
+        self.django.name = "Flask"
+        self.django.save()
+        self.assertEqual(self.search("django"), [])
+        self.assertEqual(self.search("flask"), [self.backend.id])
+
+        self.backend.required_skills.clear()
+        self.assertEqual(self.search("flask"), [])
+
+    def test_deleted_jobs_leave_the_index(self):
+        self.analyst.delete()
+        self.assertEqual(self.search("analyst"), [self.backend.id])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('backend" OR (data'), [])
+        self.assertEqual(self.search("***"), [])
+
+
+class JobsFuzzyFilterTests(TestCase):
+    def setUp(self):
+        django = Skill.objects.create(name="Django")
+        self.dhaka = Job.objects.create(
+            title="Backend Dev", company="Tech Corp", location="Dhaka, Bangladesh"
+        )
+        self.dhaka.required_skills.set([django])
+        self.remote = Job.objects.create(
+            title="Data Analyst", company="Numbers Ltd", location="Chittagong"
+        )
+
+    def list_ids(self, **params):
+        response = self.client.get("/api/jobs", params)
+        self.assertEqual(response.status_code, 200)
+        return [job["id"] for job in response.json()["items"]]
+
+    def test_misspelled_skill(self):
+        self.assertEqual(self.list_ids(skill="Djnago"), [self.dhaka.id])
+        self.assertEqual(self.list_ids(skill="Djnago", similarity=0.9), [])
+
+    def test_similarity_out_of_range(self):
+        for similarity in (-0.1, 1.5):
+            response = self.client.get(
+                "/api/jobs", {"skill": "Djnago", "similarity": similarity}
+            )
+            self.assertEqual(response.status_code, 400)
+
+    def test_misspelled_location(self):
+        self.assertEqual(self.list_ids(location="dhka"), [self.dhaka.id])
+        self.assertEqual(self.list_ids(location="chittagog"), [self.remote.id])
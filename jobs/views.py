@@ -1,39 +1,120 @@
-import requests
-from django.shortcuts import get_object_or_404
-from django.views.decorators.cache import cache_page
+from datetime import datetime
+
+from django.db.models import Q
+from django.shortcuts import aget_object_or_404
 from ninja.errors import HttpError
 from ninja_extra import api_controller, http_get, http_post
-from yt_dlp import YoutubeDL
 
-from users.models import Skill
+from sikari.caching import CATALOG, cache_route
+from sikari.pagination import (
+    DEFAULT_PAGE_SIZE,
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+)
+from users.registry import skill_registry
 
+from . import bdjobs, search, youtube
 from .filters import JobFilter
 from .models import Job
-from .schema import BDJobSchema, CreateJobSchema, JobSchema, YouTubeSearchResult
+from .schema import (
+    BDJobSchema,
+    CreateJobSchema,
+    JobPageSchema,
+    JobSchema,
+    YouTubeSearchResult,
+)
 
 
 @api_controller(tags=["Jobs API"])
 class JobsAPI:
-    @cache_page(60)
-    @http_get("/jobs", response=list[JobSchema])
+    @http_get("/jobs", response=JobPageSchema)
+    @cache_route(60, depends_on=[CATALOG])
     def list_jobs(
         self,
         request,
         skill: str | None = None,
         location: str | None = None,
         job_type: str | None = None,
+        similarity: float | None = None,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
     ):
+        """
+        List jobs, newest first, one page at a time.
+
+        ``skill`` and ``location`` match fuzzily, at a trigram similarity of
+        at least ``similarity`` (0-1). Pass the returned ``next_cursor`` back
+        as ``cursor`` to get the next page; it is null on the last page.
+        """
+        if similarity is not None and not 0 <= similarity <= 1:
+            raise HttpError(400, "similarity must be between 0 and 1")
+        limit = clamp_limit(limit)
         qs = Job.objects.all()
         # Use django-filter (required)
         qs = JobFilter(
-            data={"skill": skill, "location": location, "job_type": job_type},
+            data={
+                "skill": skill,
+                "location": location,
+                "job_type": job_type,
+                "similarity": similarity,
+            },
             queryset=qs,
         ).qs
         # interpret "remote" location specially
         if location and location.lower() == "remote":
             qs = qs.filter(is_remote=True)
+        if cursor:
+            posted_at, last_id = decode_cursor(cursor, 2)
+            try:
+                posted_at = datetime.fromisoformat(posted_at)
+            except (TypeError, ValueError):
+                raise HttpError(400, "Invalid cursor")
+            if posted_at.tzinfo is None or not isinstance(last_id, int):
+                raise HttpError(400, "Invalid cursor")
+            # Keyset on (posted_at, id), served by the job_posted_at_id index
+            qs = qs.filter(
+                Q(posted_at__lt=posted_at) | Q(posted_at=posted_at, id__lt=last_id)
+            )
+        page = list(
+            qs.distinct()
+            .order_by("-posted_at", "-id")
+            .prefetch_related("required_skills")[: limit + 1]
+        )
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1].posted_at.isoformat(), page[-1].id)
+
+        results = []
+        for j in page:
+            results.append(
+                {
+                    "id": j.id,
+                    "title": j.title,
+                    "company": j.company,
+                    "location": j.location,
+                    "is_remote": j.is_remote,
+                    "required_skills": [s.name for s in j.required_skills.all()],
+                    "recommended_experience": j.recommended_experience,
+                    "job_type": j.job_type,
+                    "description": j.description,
+                    "posted_at": j.posted_at.isoformat(),
+                }
+            )
+        return {"items": results, "next_cursor": next_cursor}
+
+    @http_get("/jobs/search", response=list[JobSchema])
+    @cache_route(60, depends_on=[CATALOG])
+    def search_jobs(self, request, q: str, limit: int = DEFAULT_PAGE_SIZE):
+        """
+        Full-text search over job titles, companies, descriptions and skills.
+
+        Results are ordered by relevance, best match first.
+        """
         results = []
-        for j in qs.distinct().order_by("-posted_at"):
+        for j in search.search_jobs(q, clamp_limit(limit)):
             results.append(
                 {
                     "id": j.id,
@@ -50,10 +131,12 @@ class JobsAPI:
             )
         return results
 
-    @cache_page(60)
     @http_get("/jobs/{job_id}", response=JobSchema)
-    def get_job(self, request, job_id: int):
-        job = get_object_or_404(Job, pk=job_id)
+    @cache_route(60, depends_on=[CATALOG])
+    async def get_job(self, request, job_id: int):
+        job = await aget_object_or_404(
+            Job.objects.prefetch_related("required_skills"), pk=job_id
+        )
         return {
             "id": job.id,
             "title": job.title,
@@ -82,14 +165,7 @@ class JobsAPI:
             description=data.description,
         )
         if data.required_skills:
-            skill_objs = []
-            for name in data.required_skills:
-                name = name.strip()
-                if not name:
-                    continue
-                skill_obj, _ = Skill.objects.get_or_create(name=name)
-                skill_objs.append(skill_obj)
-            j.required_skills.set(skill_objs)
+            j.required_skills.set(skill_registry.resolve_many(data.required_skills))
         return {
             "id": j.id,
             "title": j.title,
@@ -104,60 +180,19 @@ class JobsAPI:
         }
 
 
-def youtube_search(query, limit=5):
-    """
-    Perform a YouTube search with yt-dlp and return the first `limit` results.
-    """
-    ydl_opts = {
-        "quiet": True,
-        "skip_download": True,
-        "extract_flat": True,  # prevents full metadata download
-    }
-
-    search_query = f"ytsearch{limit}:{query}"
-
-    with YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(search_query, download=False)
-
-    results = []
-    for entry in info.get("entries", [])[:limit]:
-        results.append(
-            {
-                "title": entry.get("title"),
-                "url": f"https://www.youtube.com/watch?v={entry.get('id')}",
-                "thumbnail": f"https://img.youtube.com/vi/{entry.get('id')}/default.jpg",
-                "channel": entry.get("channel"),
-                "duration": entry.get("duration"),
-            }
-        )
-
-    return results
-
-
 @api_controller(tags=["External Search API"])
 class ExternalJobs:
-    @cache_page(60)
     @http_get("/bdjobs/search", response=list[BDJobSchema])
-    def fetch_bdjobs(self, request, query: str):
-        response = requests.get(
-            f"https://api.bdjobs.com/Jobs/api/JobSearch/GetJobSearch?isPro=1&rpp=50&pg=1&keyword={query}"
-        )
-
-        return [
-            {
-                "id": job["Jobid"],
-                "title": job["jobTitle"],
-                "company": job["companyName"],
-                "location": job["location"],
-                "is_remote": job.get("OnlineJob", False),
-                "recommended_experience": job["experience"],
-                "description": job["jobContext"],
-                "deadline": job["deadline"],
-            }
-            for job in response.json().get("data", [])[:5]
-        ]
+    async def fetch_bdjobs(self, request, query: str):
+        try:
+            results = await bdjobs.get_client().asearch(query)
+        except bdjobs.BDJobsError:
+            raise HttpError(503, "BDJobs is unavailable, try again later")
+        return results[:5]
 
-    @cache_page(60)
     @http_get("/youtube/search", response=list[YouTubeSearchResult])
-    def youtube_search_endpoint(self, request, query: str, limit: int = 5):
-        return youtube_search(query, limit)
+    async def youtube_search_endpoint(self, request, query: str, limit: int = 5):
+        try:
+            return await youtube.get_service().asearch(query, limit)
+        except youtube.YouTubeSearchError:
+            raise HttpError(503, "YouTube search is unavailable, try again later")
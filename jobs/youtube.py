@@ -0,0 +1,291 @@
+"""
+YouTube search service backed by yt-dlp.
+
+Searches run on a small bounded thread pool, each thread reusing its own
+``YoutubeDL`` instance. Concurrent identical searches share a single
+extraction, and results are cached per normalized query and limit in an
+in-process LRU with a TTL, backed by the Django cache so they survive
+restarts and are shared between workers.
+
+The extractor is any callable ``(query, limit) -> list[dict]``, selected
+with the ``YOUTUBE_EXTRACTOR`` setting, so tests can run offline.
+``asearch`` lets async views await a search without holding a thread.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import ClassVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from yt_dlp import YoutubeDL
+
+from sikari import metrics
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the number of results of one search
+MAX_RESULTS = 20
+
+searches = metrics.counter("youtube_searches_total", "YouTube searches requested")
+extractions = metrics.counter(
+    "youtube_extractions_total", "YouTube searches run through the extractor"
+)
+coalesced = metrics.counter(
+    "youtube_coalesced_total", "YouTube searches that joined a running extraction"
+)
+
+
+class YouTubeSearchError(Exception):
+    """The search failed, timed out or the service is saturated."""
+
+
+class YtDlpExtractor:
+    """Flat yt-dlp search, keeping one ``YoutubeDL`` per thread."""
+
+    options: ClassVar[dict] = {
+        "quiet": True,
+        "skip_download": True,
+        "extract_flat": True,  # prevents full metadata download
+    }
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def __call__(self, query: str, limit: int) -> list[dict]:
+        ydl = getattr(self._local, "ydl", None)
+        if ydl is None:
+            ydl = self._local.ydl = YoutubeDL(self.options)
+        info = ydl.extract_info(f"ytsearch{limit}:{query}", download=False)
+
+        results = []
+        for entry in (info.get("entries") or [])[:limit]:
+            results.append(
+                {
+                    "title": entry.get("title"),
+                    "url": f"https://www.youtube.com/watch?v={entry.get('id')}",
+                    "thumbnail": f"https://img.youtube.com/vi/{entry.get('id')}/default.jpg",
+                    "channel": entry.get("channel"),
+                    "duration": entry.get("duration"),
+                }
+            )
+        return results
+
+
+def search_key(query: str, limit: int) -> tuple[str, int]:
+    """
+    Cache and coalescing key of a search.
+
+    The query is lowercased with whitespace collapsed so equivalent queries
+    share entries, and the limit is bounded to ``1..MAX_RESULTS``.
+    """
+    return " ".join(query.lower().split()), max(1, min(limit, MAX_RESULTS))
+
+
+class YouTubeSearchService:
+    """
+    Pooled, coalescing and cached YouTube search.
+
+    Args:
+        extractor: Callable ``(query, limit) -> list[dict]``
+        workers: Threads running extractions
+        max_pending: Extractions allowed to run or wait at once; more
+            fail fast instead of queueing
+        ttl: Seconds a result is cached
+        max_entries: Results kept in the in-process LRU
+        timeout: Seconds a caller waits for an extraction
+    """
+
+    def __init__(
+        self,
+        extractor,
+        workers: int = 2,
+        max_pending: int = 32,
+        ttl: int = 24 * 60 * 60,
+        max_entries: int = 1024,
+        timeout: float = 30.0,
+    ):
+        self.extractor = extractor
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="youtube-search"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lru: OrderedDict[tuple, tuple[float, list]] = OrderedDict()
+        self._inflight: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "YouTubeSearchService":
+        return cls(
+            import_string(settings.YOUTUBE_EXTRACTOR)(),
+            workers=settings.YOUTUBE_SEARCH_WORKERS,
+            ttl=settings.YOUTUBE_CACHE_TTL,
+            max_entries=settings.YOUTUBE_CACHE_SIZE,
+            timeout=settings.YOUTUBE_SEARCH_TIMEOUT,
+        )
+
+    def cache_key(self, key: tuple) -> str:
+        query, limit = key
+        return f"youtube:search:{hashlib.sha256(query.encode()).hexdigest()}:{limit}"
+
+    def _lru_get(self, key: tuple):
+        # Callers hold self._lock
+        entry = self._lru.get(key)
+        if entry is not None:
+            expires, results = entry
+            if expires > time.monotonic():
+                self._lru.move_to_end(key)
+                return results
+            del self._lru[key]
+        return None
+
+    def _cached(self, key: tuple):
+        with self._lock:
+            results = self._lru_get(key)
+        if results is not None:
+            return results
+        results = cache.get(self.cache_key(key))
+        if results is not None:
+            self._remember(key, results)
+        return results
+
+    def _remember(self, key: tuple, results: list) -> None:
+        with self._lock:
+            self._lru[key] = (time.monotonic() + self.ttl, results)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def submit(self, query: str, limit: int = 5) -> Future:
+        """
+        Start a search, or join the one already running for the same key.
+
+        Raises:
+            YouTubeSearchError: Too many extractions are pending
+        """
+        key = search_key(query, limit)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                coalesced.inc()
+                return future
+            # An extraction may have finished since the caller's cache check
+            results = self._lru_get(key)
+            if results is not None:
+                future = Future()
+                future.set_result(results)
+                return future
+            if not self._slots.acquire(blocking=False):
+                raise YouTubeSearchError("Too many YouTube searches in progress")
+            future = self._executor.submit(self._extract, key)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _: self._finish(key))
+        return future
+
+    def _finish(self, key: tuple) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        self._slots.release()
+
+    def _extract(self, key: tuple) -> list[dict]:
+        extractions.inc()
+        results = self.extractor(*key)
+        cache.set(self.cache_key(key), results, timeout=self.ttl)
+        self._remember(key, results)
+        return results
+
+    def search(self, query: str, limit: int = 5) -> list[dict]:
+        """
+        Search YouTube, serving cached results when available.
+
+        Raises:
+            YouTubeSearchError: The extraction failed or timed out, or the
+                service is saturated
+        """
+        searches.inc()
+        results = self._cached(search_key(query, limit))
+        if results is not None:
+            return results
+        try:
+            return self.submit(query, limit).result(timeout=self.timeout)
+        except FutureTimeoutError as exc:
+            raise YouTubeSearchError("YouTube search timed out") from exc
+        except YouTubeSearchError:
+            raise
+        except Exception as exc:
+            raise YouTubeSearchError(str(exc)) from exc
+
+    async def asearch(self, query: str, limit: int = 5) -> list[dict]:
+        """Async variant of ``search``."""
+        searches.inc()
+        key = search_key(query, limit)
+        results = await sync_to_async(self._cached, thread_sensitive=False)(key)
+        if results is not None:
+            return results
+        try:
+            future = asyncio.wrap_future(self.submit(query, limit))
+            # Shielded so a caller timing out does not cancel a joined search
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except TimeoutError as exc:
+            raise YouTubeSearchError("YouTube search timed out") from exc
+        except YouTubeSearchError:
+            raise
+        except Exception as exc:
+            raise YouTubeSearchError(str(exc)) from exc
+
+    def warm(self, queries, limit: int = 5) -> tuple[int, int]:
+        """
+        Run the searches of ``queries`` that are not cached yet.
+
+        At most ``max_pending`` searches are in flight at once.
+
+        Returns:
+            Tuple of the number of searches run and the number that failed
+        """
+        window: deque[tuple[str, Future]] = deque()
+        ran = failed = 0
+
+        def wait_oldest():
+            nonlocal failed
+            query, future = window.popleft()
+            try:
+                future.result()
+            except Exception:
+                failed += 1
+                logger.warning("Warming YouTube search %r failed", query, exc_info=True)
+
+        for query in queries:
+            if self._cached(search_key(query, limit)) is not None:
+                continue
+            if len(window) >= self.max_pending:
+                wait_oldest()
+            window.append((query, self.submit(query, limit)))
+            ran += 1
+        while window:
+            wait_oldest()
+        return ran, failed
+
+
+_service: YouTubeSearchService | None = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> YouTubeSearchService:
+    """Process-wide search service, created on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = YouTubeSearchService.from_settings()
+        return _service
@@ -1,5 +1,7 @@
 import django_filters
 
+from users.fuzzy import DEFAULT_SIMILARITY, fuzzy_skill_ids
+
 from .models import LearningResource
 
 
@@ -7,10 +9,22 @@ class ResourceFilter(django_filters.FilterSet):
     skill = django_filters.CharFilter(method="filter_skill")
     cost = django_filters.CharFilter(field_name="cost", lookup_expr="iexact")
     platform = django_filters.CharFilter(field_name="platform", lookup_expr="icontains")
+    # Minimum trigram similarity of the fuzzy skill filter
+    similarity = django_filters.NumberFilter(method="filter_similarity")
 
     class Meta:
         model = LearningResource
         fields = ["skill", "cost", "platform"]
 
+    @property
+    def threshold(self):
+        similarity = self.form.cleaned_data.get("similarity")
+        return DEFAULT_SIMILARITY if similarity is None else float(similarity)
+
+    def filter_similarity(self, queryset, name, value):
+        # Only read by the fuzzy skill filter
+        return queryset
+
     def filter_skill(self, queryset, name, value):
-        return queryset.filter(related_skills__name__icontains=value)
+        skill_ids = fuzzy_skill_ids(value, self.threshold)
+        return queryset.filter(related_skills__in=skill_ids)
@@ -11,6 +11,25 @@ class LearningResourceSchema(Schema):
     description: str | None = None
 
 
+class LearningResourceListItemSchema(Schema):
+    """A listed resource; only the fields asked for with ``fields=`` are set."""
+
+    id: int
+    title: str | None = None
+    platform: str | None = None
+    url: str | None = None
+    related_skills: list[str] | None = None
+    cost: str | None = None
+    description: str | None = None
+
+
+class LearningResourcePageSchema(Schema):
+    """One page of resources from keyset pagination."""
+
+    items: list[LearningResourceListItemSchema]
+    next_cursor: str | None = None
+
+
 class CreateLearningResourceSchema(Schema):
     title: str
     platform: str | None = None
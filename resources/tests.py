@@ -0,0 +1,59 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from users.models import Skill
+
+from .models import LearningResource
+
+
+class ResourcesPaginationTests(TestCase):
+    def setUp(self):
+        python = Skill.objects.create(name="Python")
+        resources = LearningResource.objects.bulk_create(
+            LearningResource(
+                title=f"Course {i}",
+                url=f"https://example.com/{i}",
+                description="long text " * 100,
+            )
+            for i in range(5)
+        )
+        for resource in resources:
+            resource.related_skills.set([python])
+        self.expected = sorted((r.id for r in resources), reverse=True)
+
+    def test_cursor_walks_every_resource_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = self.client.get("/api/resources", params).json()
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.expected)
+
+    def test_query_count_is_independent_of_page_size(self):
+        for limit in (1, 5):
+            with self.assertNumQueries(2):
+                response = self.client.get("/api/resources", {"limit": limit})
+            item = response.json()["items"][0]
+            self.assertEqual(item["related_skills"], ["Python"])
+            self.assertIn("description", item)
+
+    def test_fields_projection_skips_unrequested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/resources", {"fields": "title,url"})
+        # No skills prefetch and no description column
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("description", queries[0]["sql"])
+        item = response.json()["items"][0]
+        self.assertEqual(set(item), {"id", "title", "url"})
+
+    def test_unknown_field(self):
+        response = self.client.get("/api/resources", {"fields": "title,secret"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/resources", {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 400)
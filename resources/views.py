@@ -1,50 +1,108 @@
-from django.shortcuts import get_object_or_404
-from django.views.decorators.cache import cache_page
+from django.shortcuts import aget_object_or_404
 from ninja.errors import HttpError
 from ninja_extra import api_controller, http_get, http_post
 
-from users.models import Skill
+from sikari.caching import CATALOG, cache_route
+from sikari.pagination import (
+    DEFAULT_PAGE_SIZE,
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+)
+from users.registry import skill_registry
 
 from .filters import ResourceFilter
 from .models import LearningResource
-from .schema import CreateLearningResourceSchema, LearningResourceSchema
+from .schema import (
+    CreateLearningResourceSchema,
+    LearningResourceListItemSchema,
+    LearningResourcePageSchema,
+    LearningResourceSchema,
+)
+
+# Fields that can be requested with ``fields=`` on the resource listing
+RESOURCE_FIELDS = tuple(LearningResourceListItemSchema.model_fields)
 
 
 @api_controller
 class ResourcesAPI:
-    @cache_page(60)
-    @http_get("/resources", response=list[LearningResourceSchema])
+    @http_get("/resources", response=LearningResourcePageSchema, exclude_unset=True)
+    @cache_route(60, depends_on=[CATALOG])
     def list_resources(
         self,
         request,
         skill: str | None = None,
         cost: str | None = None,
         platform: str | None = None,
+        similarity: float | None = None,
+        fields: str | None = None,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
     ):
+        """
+        List resources by descending id, one page at a time.
+
+        ``fields`` is a comma separated subset of the resource fields to
+        return, e.g. ``fields=title,url`` to skip the description; ``id`` is
+        always included. ``skill`` matches fuzzily, at a trigram similarity
+        of at least ``similarity`` (0-1). Pass the returned ``next_cursor``
+        back as ``cursor`` to get the next page.
+        """
+        if fields:
+            selected = {f.strip() for f in fields.split(",") if f.strip()}
+            unknown = selected - set(RESOURCE_FIELDS)
+            if unknown:
+                raise HttpError(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+            selected.add("id")
+        else:
+            selected = set(RESOURCE_FIELDS)
+        columns = [
+            f for f in RESOURCE_FIELDS if f in selected and f != "related_skills"
+        ]
+
+        if similarity is not None and not 0 <= similarity <= 1:
+            raise HttpError(400, "similarity must be between 0 and 1")
+        limit = clamp_limit(limit)
         # Use django-filter (required)
         qs = ResourceFilter(
-            data={"skill": skill, "cost": cost, "platform": platform},
+            data={
+                "skill": skill,
+                "cost": cost,
+                "platform": platform,
+                "similarity": similarity,
+            },
             queryset=LearningResource.objects.all(),
         ).qs
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            if not isinstance(last_id, int):
+                raise HttpError(400, "Invalid cursor")
+            qs = qs.filter(id__lt=last_id)
+        qs = qs.distinct().only(*columns).order_by("-id")
+        if "related_skills" in selected:
+            qs = qs.prefetch_related("related_skills")
+        page = list(qs[: limit + 1])
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1].id)
+
         results = []
-        for r in qs.distinct():
-            results.append(
-                {
-                    "id": r.id,
-                    "title": r.title,
-                    "platform": r.platform,
-                    "url": r.url,
-                    "related_skills": [s.name for s in r.related_skills.all()],
-                    "cost": r.cost,
-                    "description": r.description,
-                }
-            )
-        return results
+        for r in page:
+            item = {field: getattr(r, field) for field in columns}
+            if "related_skills" in selected:
+                item["related_skills"] = [s.name for s in r.related_skills.all()]
+            results.append(item)
+        return {"items": results, "next_cursor": next_cursor}
 
-    @cache_page(60)
     @http_get("/resources/{resource_id}", response=LearningResourceSchema)
-    def get_resource(self, request, resource_id: int):
-        resource = get_object_or_404(LearningResource, pk=resource_id)
+    @cache_route(60, depends_on=[CATALOG])
+    async def get_resource(self, request, resource_id: int):
+        resource = await aget_object_or_404(
+            LearningResource.objects.prefetch_related("related_skills"),
+            pk=resource_id,
+        )
         return {
             "id": resource.id,
             "title": resource.title,
@@ -68,14 +126,7 @@ class ResourcesAPI:
             description=data.description,
         )
         if data.related_skills:
-            skill_objs = []
-            for name in data.related_skills:
-                name = name.strip()
-                if not name:
-                    continue
-                skill_obj, _ = Skill.objects.get_or_create(name=name)
-                skill_objs.append(skill_obj)
-            r.related_skills.set(skill_objs)
+            r.related_skills.set(skill_registry.resolve_many(data.related_skills))
         return {
             "id": r.id,
             "title": r.title,
@@ -2,16 +2,29 @@ from ninja_extra import NinjaExtraAPI
 
 from jobs.views import ExternalJobs, JobsAPI
 from resources.views import ResourcesAPI
+from sikari import dbpool  # noqa: F401  (registers the pool gauges)
+from sikari.metrics import MetricsAPI
 from users.dashboard import DashboardAPI, MatchingAPI
+from users.hashing import HashingOverloaded
 from users.views import (
     NinjaJWTController,
     PDFController,
     RegisterAPI,
+    UploadAPI,
     UserAPI,
 )
 
 api = NinjaExtraAPI()
 
+
+@api.exception_handler(HashingOverloaded)
+def hashing_overloaded(request, exc):
+    # Signup and login bursts are shed instead of piling up on the workers
+    response = api.create_response(request, {"detail": str(exc)}, status=503)
+    response["Retry-After"] = "1"
+    return response
+
+
 api.register_controllers(
     UserAPI,
     RegisterAPI,
@@ -21,5 +34,7 @@ api.register_controllers(
     MatchingAPI,
     DashboardAPI,
     PDFController,
+    UploadAPI,
     ExternalJobs,
+    MetricsAPI,
 )
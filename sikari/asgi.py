@@ -14,3 +14,13 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sikari.settings")
 
 application = get_asgi_application()
+
+# Both need the app registry
+from sikari.lifespan import LifespanMiddleware
+from users.registry import skill_registry
+
+# Load the skill name maps before the first request
+skill_registry.warm()
+
+# Open and close the shared upstream clients with the server
+application = LifespanMiddleware(application)
@@ -0,0 +1,195 @@
+"""
+Cache helpers shared by the JobSikari apps.
+
+Cached entries embed the version counters they were built from. Bumping a
+counter invalidates every entry depending on it without having to know
+their keys.
+"""
+
+import hashlib
+import random
+from functools import wraps
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from sikari import metrics
+
+# Bumped on any Job or LearningResource write (including skill changes)
+CATALOG = "catalog"
+# Bumped on any Skill write, read by users.registry
+SKILLS = "skills"
+
+
+def version_key(name: str) -> str:
+    """Cache key holding the version counter ``name``."""
+    return f"version:{name}"
+
+
+def user_version(user_id: int) -> str:
+    """Name of the version counter of a single user's data."""
+    return f"user:{user_id}"
+
+
+def _initial_version() -> int:
+    # A counter recreated after an eviction or a flush must not repeat the
+    # values that in-process caches (``users.matching``) were built from
+    return random.randrange(1 << 32)
+
+
+def bump_version(name: str) -> None:
+    """Increment a version counter, creating it when missing."""
+    key = version_key(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def current_version(name: str) -> int | None:
+    """
+    Read a version counter, creating it when missing.
+
+    Returns None when the cache backend does not keep values (the dummy
+    backend), in which case nothing may be cached against the counter.
+    """
+    key = version_key(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+route_hits = metrics.counter("route_cache_hits_total", "Cached route responses served")
+route_misses = metrics.counter(
+    "route_cache_misses_total", "Cached routes rendered by their view"
+)
+
+
+def _route_cache_key(request, vary_on_auth: bool) -> str:
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    identity = ""
+    if vary_on_auth:
+        user = getattr(request, "auth", None) or getattr(request, "user", None)
+        identity = str(getattr(user, "pk", "") or "")
+    digest = hashlib.sha256(f"{request.path}?{query}#{identity}".encode()).hexdigest()
+    return f"route:{digest}"
+
+
+def cache_route(timeout: int = 60, depends_on=(), vary_on_auth: bool = False):
+    """
+    Cache the rendered response of a ninja_extra controller route.
+
+    Apply it below ``@http_get`` so ninja_extra still sees the route. Unlike
+    ``cache_page``, which cannot wrap controller methods, the entry is keyed
+    on the path, the sorted query parameters and optionally the caller's
+    identity, and stores the serialized response bytes written by
+    ``RouteCacheMiddleware``.
+
+    Async views are supported and read the cache without blocking.
+
+    Args:
+        timeout: Seconds an entry may be served
+        depends_on: Version counter names (e.g. ``CATALOG``); bumping any of
+            them invalidates the entry before ``timeout``
+        vary_on_auth: Cache separately per authenticated user
+    """
+    names = [version_key(name) for name in depends_on]
+
+    def lookup(request, key, values):
+        """Return the cached response, or mark the request for storing."""
+        versions = tuple(values.get(name, 0) for name in names)
+        entry = values.get(key)
+        if entry is not None and entry["versions"] == versions:
+            route_hits.inc()
+            return HttpResponse(
+                entry["content"],
+                content_type=entry["content_type"],
+                status=entry["status"],
+            )
+        route_misses.inc()
+        request._route_cache = (key, versions, timeout)
+        return None
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def async_view(controller, *args, **kwargs):
+                request = controller.context.request
+                if request.method == "GET":
+                    key = _route_cache_key(request, vary_on_auth)
+                    values = await cache.aget_many([key, *names])
+                    cached = lookup(request, key, values)
+                    if cached is not None:
+                        return cached
+                return await view_func(controller, *args, **kwargs)
+
+            return async_view
+
+        @wraps(view_func)
+        def view(controller, *args, **kwargs):
+            request = controller.context.request
+            if request.method == "GET":
+                key = _route_cache_key(request, vary_on_auth)
+                cached = lookup(request, key, cache.get_many([key, *names]))
+                if cached is not None:
+                    return cached
+            return view_func(controller, *args, **kwargs)
+
+        return view
+
+    return decorator
+
+
+class RouteCacheMiddleware:
+    """
+    Store responses of routes marked for caching by ``cache_route``.
+
+    Runs natively under both WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _entry(self, request, response):
+        pending = getattr(request, "_route_cache", None)
+        if pending and response.status_code == 200 and not response.streaming:
+            key, versions, timeout = pending
+            return (
+                key,
+                timeout,
+                {
+                    "versions": versions,
+                    "content": response.content,
+                    "content_type": response["Content-Type"],
+                    "status": response.status_code,
+                },
+            )
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        entry = self._entry(request, response)
+        if entry:
+            key, timeout, value = entry
+            cache.set(key, value, timeout=timeout)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        entry = self._entry(request, response)
+        if entry:
+            key, timeout, value = entry
+            await cache.aset(key, value, timeout=timeout)
+        return response
@@ -0,0 +1,60 @@
+"""
+Metrics of the psycopg3 connection pool of the default database.
+
+Metrics read ``ConnectionPool.get_stats()`` at scrape time. They report
+zeros when the database is not pooled (SQLite, or ``DB_POOL=false``).
+The current state of the pool is exported as gauges, and its cumulative
+statistics, counted since the pool was created, as ``_total`` counters.
+"""
+
+from django.db import connections
+
+from sikari import metrics
+
+# get_stats() key -> (metric name, description)
+POOL_GAUGES = {
+    "pool_size": ("db_pool_connections", "Connections open in the pool"),
+    "pool_available": ("db_pool_idle_connections", "Idle connections in the pool"),
+    "requests_waiting": (
+        "db_pool_requests_waiting",
+        "Requests waiting for a pool connection",
+    ),
+}
+POOL_COUNTERS = {
+    "requests_num": (
+        "db_pool_requests_total",
+        "Connections requested from the pool",
+    ),
+    "requests_queued": (
+        "db_pool_requests_queued_total",
+        "Connection requests that had to wait",
+    ),
+    "requests_wait_ms": (
+        "db_pool_requests_wait_ms_total",
+        "Milliseconds spent waiting for a pool connection",
+    ),
+    "requests_errors": (
+        "db_pool_requests_errors_total",
+        "Connection requests that timed out or failed",
+    ),
+    "usage_ms": (
+        "db_pool_usage_ms_total",
+        "Milliseconds pool connections were checked out",
+    ),
+}
+
+
+def pool_stats(alias: str = "default") -> dict[str, int]:
+    """``get_stats()`` of the pool of ``alias``, ``{}`` if it is not pooled."""
+    pool = getattr(connections[alias], "pool", None)
+    return pool.get_stats() if pool is not None else {}
+
+
+def _reader(key: str):
+    return lambda: pool_stats().get(key, 0)
+
+
+for key, (name, description) in POOL_GAUGES.items():
+    metrics.gauge(name, description, callback=_reader(key))
+for key, (name, description) in POOL_COUNTERS.items():
+    metrics.counter(name, description, callback=_reader(key))
@@ -0,0 +1,30 @@
+"""
+ASGI lifespan support for the uvicorn deployment.
+
+Django's ASGI handler only speaks HTTP, so ``LifespanMiddleware`` answers
+the lifespan messages itself. On startup it opens the async clients that
+keep connection pools to upstream services on the server's event loop, and
+on shutdown it closes them.
+"""
+
+from jobs import bdjobs
+
+
+class LifespanMiddleware:
+    """Wrap an ASGI application, handling the ``lifespan`` scope."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            return await self.app(scope, receive, send)
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await bdjobs.get_client().open_async()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await bdjobs.get_client().aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,161 @@
+"""
+Lightweight process-local metrics for JobSikari.
+
+Counters, gauges and summaries are kept in memory by each worker process
+and rendered in the Prometheus text exposition format by ``GET /metrics``.
+With several gunicorn workers every scrape reports the values of the
+worker that served it. The endpoint is limited to staff users, like the
+admin, and to scrapers sending ``Authorization: Bearer <METRICS_TOKEN>``.
+Client addresses are not trusted: behind a reverse proxy every request
+comes from the proxy.
+"""
+
+import threading
+from collections.abc import Callable
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from ninja_extra import api_controller, http_get
+from ninja_extra.permissions import IsAdminUser
+
+
+class Metric:
+    """Base class for a named metric."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+
+    def samples(self) -> list[tuple[str, float]]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing value, or one read from a callback."""
+
+    type = "counter"
+
+    def __init__(
+        self, name: str, description: str, callback: Callable[[], float] | None = None
+    ):
+        super().__init__(name, description)
+        self.value = 0.0
+        self.callback = callback
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        value = self.callback() if self.callback else self.value
+        return [(self.name, value)]
+
+
+class Gauge(Metric):
+    """Value that can go up and down, or be read from a callback."""
+
+    type = "gauge"
+
+    def __init__(
+        self, name: str, description: str, callback: Callable[[], float] | None = None
+    ):
+        super().__init__(name, description)
+        self.value = 0.0
+        self.callback = callback
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.inc(-amount)
+
+    def samples(self):
+        value = self.callback() if self.callback else self.value
+        return [(self.name, value)]
+
+
+class Summary(Metric):
+    """Count and sum of observations, e.g. latencies in seconds."""
+
+    type = "summary"
+
+    def __init__(self, name: str, description: str):
+        super().__init__(name, description)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+
+    def samples(self):
+        return [(f"{self.name}_count", self.count), (f"{self.name}_sum", self.sum)]
+
+
+REGISTRY: dict[str, Metric] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(cls, name, description, **kwargs):
+    with _registry_lock:
+        if name not in REGISTRY:
+            REGISTRY[name] = cls(name, description, **kwargs)
+        return REGISTRY[name]
+
+
+def counter(
+    name: str, description: str, callback: Callable[[], float] | None = None
+) -> Counter:
+    """Get or create a counter, optionally reading its value from ``callback``."""
+    return _register(Counter, name, description, callback=callback)
+
+
+def gauge(
+    name: str, description: str, callback: Callable[[], float] | None = None
+) -> Gauge:
+    """Get or create a gauge, optionally reading its value from ``callback``."""
+    return _register(Gauge, name, description, callback=callback)
+
+
+def summary(name: str, description: str) -> Summary:
+    """Get or create a summary."""
+    return _register(Summary, name, description)
+
+
+def render() -> str:
+    """Render every registered metric in the Prometheus text format."""
+    lines = []
+    for metric in sorted(REGISTRY.values(), key=lambda m: m.name):
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for sample, value in metric.samples():
+            lines.append(f"{sample} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class CanScrapeMetrics(IsAdminUser):
+    """Staff users, or clients presenting ``METRICS_TOKEN`` as a bearer token."""
+
+    def has_permission(self, request, controller) -> bool:
+        token = settings.METRICS_TOKEN
+        header = request.META.get("HTTP_AUTHORIZATION", "")
+        if token and constant_time_compare(header, f"Bearer {token}"):
+            return True
+        return super().has_permission(request, controller)
+
+
+@api_controller(tags=["MISCs"], permissions=[CanScrapeMetrics])
+class MetricsAPI:
+    @http_get("/metrics", include_in_schema=False)
+    def metrics(self, request):
+        return HttpResponse(render(), content_type="text/plain; version=0.0.4")
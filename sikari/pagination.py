@@ -0,0 +1,50 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is the opaque, URL-safe encoding of the sort key of the last row
+of a page. The next page is fetched with a ``WHERE`` on that key instead of
+an ``OFFSET``, so deep pages cost the same as the first one.
+"""
+
+import base64
+import json
+
+from ninja.errors import HttpError
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def clamp_limit(limit: int) -> int:
+    """Bound a requested page size to ``1..MAX_PAGE_SIZE``."""
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_cursor(*values) -> str:
+    """Encode the sort key of the last row of a page."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Opaque cursor from a previous page
+        size: Expected number of values in the sort key
+
+    Returns:
+        The list of sort key values
+
+    Raises:
+        HttpError: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HttpError(400, "Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HttpError(400, "Invalid cursor")
+    return values
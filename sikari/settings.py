@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -27,6 +28,7 @@ INSTALLED_APPS = (
         "django.contrib.messages",
         "whitenoise.runserver_nostatic",
         "django.contrib.staticfiles",
+        "django.contrib.postgres",
     ]
     + [
         "users",
@@ -68,6 +70,7 @@ MIDDLEWARE = [
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Static File Serve
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "sikari.caching.RouteCacheMiddleware",  # Stores @cache_route responses
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -95,6 +98,23 @@ WSGI_APPLICATION = "sikari.wsgi.application"
 
 
 DATABASES = {"default": env.db(default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}")}
+# Drop connections that went away (e.g. a Postgres restart) before use
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql" and env.bool(
+    "DB_POOL", default=True
+):
+    # psycopg3 pool shared by the threads of a worker; stats in sikari.dbpool
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+        "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+        # Seconds a request waits for a free connection before failing
+        "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),
+        # Seconds an idle connection above min_size is kept
+        "max_idle": env.float("DB_POOL_MAX_IDLE", default=600.0),
+    }
+else:
+    # Without a pool, keep each thread's connection open between requests
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -131,6 +151,9 @@ AWS_STORAGE_BUCKET_NAME = env("AWS_STORAGE_BUCKET_NAME")
 AWS_S3_ENDPOINT_URL = env("AWS_S3_ENDPOINT_URL")
 AWS_S3_REGION_NAME = env("AWS_S3_REGION_NAME")
 
+# Seconds a presigned direct upload (users.uploads) stays valid
+DIRECT_UPLOAD_EXPIRES = env.int("DIRECT_UPLOAD_EXPIRES", default=15 * 60)
+
 STORAGES = {
     "default": {
         "BACKEND": "storages.backends.s3.S3Storage",
@@ -160,6 +183,59 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# BDJobs API client (jobs.bdjobs)
+BDJOBS_BASE_URL = env("BDJOBS_BASE_URL", default="https://api.bdjobs.com")
+BDJOBS_CONNECT_TIMEOUT = env.float("BDJOBS_CONNECT_TIMEOUT", default=3.05)
+BDJOBS_READ_TIMEOUT = env.float("BDJOBS_READ_TIMEOUT", default=10.0)
+# Overall seconds a BDJobs search may take, retries included
+BDJOBS_DEADLINE = env.float("BDJOBS_DEADLINE", default=15.0)
+# Seconds search results are fresh, then served stale while refreshing
+BDJOBS_CACHE_FRESH = env.int("BDJOBS_CACHE_FRESH", default=300)
+BDJOBS_CACHE_STALE = env.int("BDJOBS_CACHE_STALE", default=3600)
+
+# YouTube search service (jobs.youtube)
+YOUTUBE_EXTRACTOR = env("YOUTUBE_EXTRACTOR", default="jobs.youtube.YtDlpExtractor")
+YOUTUBE_SEARCH_WORKERS = env.int("YOUTUBE_SEARCH_WORKERS", default=2)
+YOUTUBE_SEARCH_TIMEOUT = env.float("YOUTUBE_SEARCH_TIMEOUT", default=30.0)
+YOUTUBE_CACHE_TTL = env.int("YOUTUBE_CACHE_TTL", default=24 * 60 * 60)
+# Results kept in each worker's in-process LRU
+YOUTUBE_CACHE_SIZE = env.int("YOUTUBE_CACHE_SIZE", default=1024)
+
+# CV PDF uploads (users.pdf)
+PDF_MAX_BYTES = env.int("PDF_MAX_BYTES", default=10 * 1024 * 1024)
+PDF_MAX_PAGES = env.int("PDF_MAX_PAGES", default=50)
+# Extraction worker processes; 0 extracts in the request thread
+PDF_WORKERS = env.int("PDF_WORKERS", default=2)
+PDF_TIMEOUT = env.float("PDF_TIMEOUT", default=20.0)
+PDF_CACHE_TTL = env.int("PDF_CACHE_TTL", default=7 * 24 * 60 * 60)
+
+# Threads rendering project image derivatives (users.images); 0 renders inline
+IMAGE_WORKERS = env.int("IMAGE_WORKERS", default=2)
+
+# Threads refreshing recommendations after catalog changes
+# (users.recommendations); 0 refreshes inline after the commit
+RECOMMENDATION_WORKERS = env.int("RECOMMENDATION_WORKERS", default=1)
+
+# Server processes, and threads per process under WSGI, as run by start.sh
+WEB_CONCURRENCY = env.int("WEB_CONCURRENCY", default=2)
+WEB_THREADS = env.int("WEB_THREADS", default=1)
+
+# Password hashing pool (users.hashing), one per server process sharing the CPUs
+PASSWORD_HASH_WORKERS = env.int(
+    "PASSWORD_HASH_WORKERS", default=max(1, (os.cpu_count() or 2) // WEB_CONCURRENCY)
+)
+# Hashes a process lets run or wait at once before requests get a 503. The
+# default never refuses the process's own WSGI threads, which already bound
+# its queue, and queues up to four per hashing thread under ASGI
+PASSWORD_HASH_MAX_PENDING = env.int(
+    "PASSWORD_HASH_MAX_PENDING", default=max(WEB_THREADS, 4 * PASSWORD_HASH_WORKERS)
+)
+PASSWORD_HASH_TIMEOUT = env.float("PASSWORD_HASH_TIMEOUT", default=10.0)
+
+# Bearer token letting a scraper (e.g. Prometheus) read /api/metrics without
+# a staff session (sikari.metrics); unset, only staff can
+METRICS_TOKEN = env.str("METRICS_TOKEN", default="")
+
 # JWT Configuration
 NINJA_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=7),  # Access token expires in 7 days
@@ -0,0 +1,48 @@
+from django.test import TestCase, override_settings
+
+from users.models import User
+
+SCRAPER = {"Authorization": "Bearer s3cret"}
+
+
+class MetricsEndpointTests(TestCase):
+    def test_anonymous_clients_are_refused(self):
+        self.assertEqual(self.client.get("/api/metrics").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_bearer_token(self):
+        response = self.client.get("/api/metrics", headers=SCRAPER)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("# TYPE db_pool_connections gauge", response.content.decode())
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_wrong_token_is_refused(self):
+        response = self.client.get(
+            "/api/metrics", headers={"Authorization": "Bearer wrong"}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_local_clients_are_not_trusted(self):
+        # Behind a reverse proxy every request comes from 127.0.0.1
+        response = self.client.get("/api/metrics", REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(response.status_code, 403)
+
+    def test_staff_session(self):
+        self.client.force_login(
+            User.objects.create_user(
+                email="admin@example.com", password="x", is_staff=True
+            )
+        )
+        self.assertEqual(self.client.get("/api/metrics").status_code, 200)
+
+    def test_non_staff_session_is_refused(self):
+        self.client.force_login(
+            User.objects.create_user(email="jane@example.com", password="x")
+        )
+        self.assertEqual(self.client.get("/api/metrics").status_code, 403)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_pool_statistics_are_counters(self):
+        text = self.client.get("/api/metrics", headers=SCRAPER).content.decode()
+        self.assertIn("# TYPE db_pool_requests_total counter", text)
+        self.assertIn("# TYPE db_pool_usage_ms_total counter", text)
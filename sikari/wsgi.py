@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sikari.settings")
 
 application = get_wsgi_application()
+
+# Load the skill name maps before the first request (needs the app registry)
+from users.registry import skill_registry
+
+skill_registry.warm()
@@ -11,4 +11,9 @@ python manage.py collectstatic --noinput
 #python manage.py seed_all
 
 echo "Starting the server..."
-gunicorn sikari.wsgi:application --bind 0.0.0.0:8000
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    uvicorn sikari.asgi:application --host 0.0.0.0 --port 8000 --workers "${WEB_CONCURRENCY:-2}"
+else
+    gunicorn sikari.wsgi:application --bind 0.0.0.0:8000 \
+        --workers "${WEB_CONCURRENCY:-2}" --threads "${WEB_THREADS:-1}"
+fi
@@ -0,0 +1,125 @@
+"""
+Bulk mutation helpers for profile many-to-many fields.
+
+``sync_m2m`` and ``add_m2m`` diff the wanted ids against the through table
+and issue only the needed inserts and deletes, so updating a profile costs
+the same number of queries for 5 skills as for 50. They send the same
+``m2m_changed`` signals as the related manager, keeping ``users.signals``
+receivers working.
+"""
+
+from collections.abc import Iterable
+
+from django.db import router, transaction
+from django.db.models.signals import m2m_changed
+
+from users.models import Careers
+
+
+def _through(instance, field_name):
+    """Return the field, its through model and the source and target attnames."""
+    field = instance._meta.get_field(field_name)
+    through = field.remote_field.through
+    source = through._meta.get_field(field.m2m_field_name()).attname
+    target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    return field, through, source, target
+
+
+def _send(action, instance, field, through, pk_set, using):
+    m2m_changed.send(
+        sender=through,
+        instance=instance,
+        action=action,
+        reverse=False,
+        model=field.related_model,
+        pk_set=pk_set,
+        using=using,
+    )
+
+
+def _write(instance, field_name, ids, replace):
+    field, through, source, target = _through(instance, field_name)
+    using = router.db_for_write(through, instance=instance)
+    current = set(
+        through._default_manager.using(using)
+        .filter(**{source: instance.pk})
+        .values_list(target, flat=True)
+    )
+    ids = set(ids)
+    to_add = ids - current
+    to_remove = current - ids if replace else set()
+
+    with transaction.atomic(using=using, savepoint=False):
+        if to_remove:
+            _send("pre_remove", instance, field, through, to_remove, using)
+            through._default_manager.using(using).filter(
+                **{source: instance.pk, f"{target}__in": to_remove}
+            ).delete()
+            _send("post_remove", instance, field, through, to_remove, using)
+        if to_add:
+            _send("pre_add", instance, field, through, to_add, using)
+            through._default_manager.using(using).bulk_create(
+                [through(**{source: instance.pk, target: pk}) for pk in to_add]
+            )
+            _send("post_add", instance, field, through, to_add, using)
+    return to_add, to_remove
+
+
+def sync_m2m(instance, field_name: str, ids: Iterable[int]):
+    """
+    Make a many-to-many field hold exactly ``ids``.
+
+    Args:
+        instance: Saved model instance owning the field
+        field_name: Name of the ManyToManyField
+        ids: Target primary keys the field should hold
+
+    Returns:
+        Tuple of the sets of added and removed ids
+    """
+    return _write(instance, field_name, ids, replace=True)
+
+
+def add_m2m(instance, field_name: str, ids: Iterable[int]):
+    """
+    Add ``ids`` to a many-to-many field, skipping the ones already present.
+
+    Args:
+        instance: Saved model instance owning the field
+        field_name: Name of the ManyToManyField
+        ids: Target primary keys to add
+
+    Returns:
+        Set of added ids
+    """
+    added, _ = _write(instance, field_name, ids, replace=False)
+    return added
+
+
+def resolve_careers(titles: Iterable[str]) -> list[int]:
+    """
+    Resolve career titles to Careers ids, creating the missing ones.
+
+    Args:
+        titles: Career titles; blanks are skipped
+
+    Returns:
+        Careers ids in the order of ``titles``, without duplicates
+    """
+    titles = list(dict.fromkeys(t.strip() for t in titles if t and t.strip()))
+    by_title = {}
+    existing = Careers.objects.filter(title__in=titles).order_by("id")
+    for career_id, title in existing.values_list("id", "title"):
+        by_title.setdefault(title, career_id)
+
+    missing = [title for title in titles if title not in by_title]
+    if missing:
+        created = Careers.objects.bulk_create(
+            [Careers(title=title) for title in missing]
+        )
+        if any(career.pk is None for career in created):
+            # Backends that cannot return ids from a bulk insert
+            created = Careers.objects.filter(title__in=missing).order_by("id")
+        for career in created:
+            by_title.setdefault(career.title, career.pk)
+    return [by_title[title] for title in titles]
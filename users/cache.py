@@ -0,0 +1,59 @@
+"""
+Per-user response cache for the dashboard.
+
+An entry is stored under the user's id together with the user and catalog
+version counters it was built from (see ``sikari.caching``). A lookup fetches
+the entry and both counters with a single ``get_many`` round trip and only
+serves the entry when the counters still match.
+"""
+
+from django.core.cache import cache
+
+from sikari import metrics
+from sikari.caching import CATALOG, user_version, version_key
+
+# Cached dashboards are also invalidated by version bumps; this bounds memory
+DASHBOARD_TIMEOUT = 60 * 60
+
+hits = metrics.counter("dashboard_cache_hits_total", "Dashboard cache hits")
+misses = metrics.counter("dashboard_cache_misses_total", "Dashboard cache misses")
+
+
+def _entry_key(user_id: int) -> str:
+    return f"dashboard:{user_id}"
+
+
+def get_dashboard(user_id: int):
+    """
+    Look up a cached dashboard.
+
+    Args:
+        user_id: Id of the requesting user
+
+    Returns:
+        (payload, versions) where payload is None on a miss and versions
+        must be passed back to ``set_dashboard`` after rebuilding it
+    """
+    keys = [
+        _entry_key(user_id),
+        version_key(user_version(user_id)),
+        version_key(CATALOG),
+    ]
+    values = cache.get_many(keys)
+    versions = (values.get(keys[1], 0), values.get(keys[2], 0))
+
+    entry = values.get(keys[0])
+    if entry is not None and entry["versions"] == versions:
+        hits.inc()
+        return entry["payload"], versions
+    misses.inc()
+    return None, versions
+
+
+def set_dashboard(user_id: int, versions, payload) -> None:
+    """Store a dashboard built while the counters were at ``versions``."""
+    cache.set(
+        _entry_key(user_id),
+        {"versions": versions, "payload": payload},
+        timeout=DASHBOARD_TIMEOUT,
+    )
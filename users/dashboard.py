@@ -5,6 +5,8 @@ Provides endpoints for skill-based job/resource recommendations
 and a unified dashboard view for authenticated users.
 """
 
+from typing import Literal
+
 from ninja_extra import api_controller, http_get
 from ninja_jwt.authentication import JWTAuth
 
@@ -12,94 +14,97 @@ from jobs.models import Job
 from jobs.schema import JobRecommendationSchema
 from resources.models import LearningResource
 from resources.schema import ResourceRecommendationSchema
+from users import cache as dashboard_cache
 from users.matching import match_jobs_for_user, match_resources_for_user
+from users.models import UserRecommendation
+from users.recommendations import stored_recommendations
 from users.schema import ProfileSchema
 
 
+def job_recommendation(match) -> dict:
+    """Build a JobRecommendationSchema payload from a hydrated JobMatch."""
+    job = match["job"]
+    return {
+        "job": {
+            "id": job.id,
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "is_remote": job.is_remote,
+            "required_skills": [s.name for s in job.required_skills.all()],
+            "recommended_experience": job.recommended_experience,
+            "job_type": job.job_type,
+            "description": job.description,
+            "posted_at": job.posted_at.isoformat(),
+        },
+        "match_score": match["match_score"],
+        "matching_skills": match["matching_skills"],
+    }
+
+
+def resource_recommendation(match) -> dict:
+    """Build a ResourceRecommendationSchema payload from a hydrated ResourceMatch."""
+    resource = match["resource"]
+    return {
+        "resource": {
+            "id": resource.id,
+            "title": resource.title,
+            "platform": resource.platform,
+            "url": resource.url,
+            "related_skills": [s.name for s in resource.related_skills.all()],
+            "cost": resource.cost,
+            "description": resource.description,
+        },
+        "match_score": match["match_score"],
+        "matching_skills": match["matching_skills"],
+    }
+
+
 @api_controller
 class MatchingAPI:
     """API endpoints for personalized job and resource matching."""
 
     @http_get("/matching/jobs", response=list[JobRecommendationSchema], auth=JWTAuth())
-    def recommended_jobs(self, request, limit: int = 10):
+    def recommended_jobs(
+        self, request, limit: int = 10, scoring: Literal["overlap", "idf"] = "overlap"
+    ):
         """
         Get recommended jobs based on user's skill profile.
 
         Returns jobs ranked by skill overlap with the authenticated user's profile.
+        With ``scoring=idf`` rare skills count more than common ones.
         """
         user = request.user
         profile = user.profile
 
         jobs_qs = Job.objects.prefetch_related("required_skills").all()
-        matches = match_jobs_for_user(profile, jobs_qs, limit=limit)
-
-        results = []
-        for match in matches:
-            job = Job.objects.prefetch_related("required_skills").get(
-                id=match["job_id"]
-            )
-            results.append(
-                {
-                    "job": {
-                        "id": job.id,
-                        "title": job.title,
-                        "company": job.company,
-                        "location": job.location,
-                        "is_remote": job.is_remote,
-                        "required_skills": [s.name for s in job.required_skills.all()],
-                        "recommended_experience": job.recommended_experience,
-                        "job_type": job.job_type,
-                        "description": job.description,
-                        "posted_at": job.posted_at.isoformat(),
-                    },
-                    "match_score": match["match_score"],
-                    "matching_skills": match["matching_skills"],
-                }
-            )
-
-        return results
+        matches = match_jobs_for_user(profile, jobs_qs, limit=limit, scoring=scoring)
+
+        return [job_recommendation(match) for match in matches]
 
     @http_get(
         "/matching/resources",
         response=list[ResourceRecommendationSchema],
         auth=JWTAuth(),
     )
-    def recommended_resources(self, request, limit: int = 10):
+    def recommended_resources(
+        self, request, limit: int = 10, scoring: Literal["overlap", "idf"] = "overlap"
+    ):
         """
         Get recommended learning resources based on user's skill profile.
 
         Returns resources ranked by skill overlap with the authenticated user's profile.
+        With ``scoring=idf`` rare skills count more than common ones.
         """
         user = request.user
         profile = user.profile
 
         resources_qs = LearningResource.objects.prefetch_related("related_skills").all()
-        matches = match_resources_for_user(profile, resources_qs, limit=limit)
-
-        results = []
-        for match in matches:
-            resource = LearningResource.objects.prefetch_related("related_skills").get(
-                id=match["resource_id"]
-            )
-            results.append(
-                {
-                    "resource": {
-                        "id": resource.id,
-                        "title": resource.title,
-                        "platform": resource.platform,
-                        "url": resource.url,
-                        "related_skills": [
-                            s.name for s in resource.related_skills.all()
-                        ],
-                        "cost": resource.cost,
-                        "description": resource.description,
-                    },
-                    "match_score": match["match_score"],
-                    "matching_skills": match["matching_skills"],
-                }
-            )
-
-        return results
+        matches = match_resources_for_user(
+            profile, resources_qs, limit=limit, scoring=scoring
+        )
+
+        return [resource_recommendation(match) for match in matches]
 
 
 class DashboardResponse:
@@ -123,8 +128,17 @@ class DashboardAPI:
             - User profile information
             - Top 5 recommended jobs based on skills
             - Top 5 recommended learning resources based on skills
+
+        Recommendations come from the ``UserRecommendation`` table, which is
+        kept current by ``users.signals``. The whole response is cached per
+        user until the user's data or the catalog changes (``users.cache``).
         """
         user = request.user
+
+        cached, versions = dashboard_cache.get_dashboard(user.id)
+        if cached is not None:
+            return cached
+
         profile = user.profile
 
         # Get profile data
@@ -140,63 +154,17 @@ class DashboardAPI:
             "cv_text": profile.cv_text,
         }
 
-        # Get recommended jobs
-        jobs_qs = Job.objects.prefetch_related("required_skills").all()
-        job_matches = match_jobs_for_user(profile, jobs_qs, limit=5)
-
-        recommended_jobs = []
-        for match in job_matches:
-            job = Job.objects.prefetch_related("required_skills").get(
-                id=match["job_id"]
-            )
-            recommended_jobs.append(
-                {
-                    "job": {
-                        "id": job.id,
-                        "title": job.title,
-                        "company": job.company,
-                        "location": job.location,
-                        "is_remote": job.is_remote,
-                        "required_skills": [s.name for s in job.required_skills.all()],
-                        "recommended_experience": job.recommended_experience,
-                        "job_type": job.job_type,
-                        "description": job.description,
-                        "posted_at": job.posted_at.isoformat(),
-                    },
-                    "match_score": match["match_score"],
-                    "matching_skills": match["matching_skills"],
-                }
-            )
-
-        # Get recommended resources
-        resources_qs = LearningResource.objects.prefetch_related("related_skills").all()
-        resource_matches = match_resources_for_user(profile, resources_qs, limit=5)
-
-        recommended_resources = []
-        for match in resource_matches:
-            resource = LearningResource.objects.prefetch_related("related_skills").get(
-                id=match["resource_id"]
-            )
-            recommended_resources.append(
-                {
-                    "resource": {
-                        "id": resource.id,
-                        "title": resource.title,
-                        "platform": resource.platform,
-                        "url": resource.url,
-                        "related_skills": [
-                            s.name for s in resource.related_skills.all()
-                        ],
-                        "cost": resource.cost,
-                        "description": resource.description,
-                    },
-                    "match_score": match["match_score"],
-                    "matching_skills": match["matching_skills"],
-                }
-            )
-
-        return {
+        # Recommendations are served from the materialized table
+        stored = stored_recommendations(profile)
+        job_matches = stored[UserRecommendation.Kind.JOB]
+        resource_matches = stored[UserRecommendation.Kind.RESOURCE]
+
+        dashboard = {
             "profile": profile_data,
-            "recommended_jobs": recommended_jobs,
-            "recommended_resources": recommended_resources,
+            "recommended_jobs": [job_recommendation(m) for m in job_matches],
+            "recommended_resources": [
+                resource_recommendation(m) for m in resource_matches
+            ],
         }
+        dashboard_cache.set_dashboard(user.id, versions, dashboard)
+        return dashboard
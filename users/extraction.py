@@ -0,0 +1,144 @@
+"""
+Database-backed queue of CV text extractions.
+
+``/pdf/textify?background=true`` stores the upload as an ``ExtractionJob``
+and answers 202 straight away. Workers started with
+``python manage.py run_extraction_worker`` claim pending jobs with a
+conditional update, so any number of them can share the table without a
+broker, extract the text and write it to ``UserProfile.cv_full``.
+
+A job whose worker died mid-extraction is claimed again once it has been
+running for ``stale_after`` seconds, up to ``MAX_ATTEMPTS`` times.
+"""
+
+import io
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from sikari import metrics
+
+from .models import ExtractionJob, UserProfile
+from .pdf import PDFTooLargeError, extract_cv_text
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+Status = ExtractionJob.Status
+
+completed = metrics.counter(
+    "extraction_jobs_completed_total", "Queued CV extractions that succeeded"
+)
+failed = metrics.counter(
+    "extraction_jobs_failed_total", "Queued CV extractions that failed"
+)
+
+
+def enqueue(user, fileobj) -> ExtractionJob:
+    """
+    Queue the extraction of an uploaded PDF for ``user``.
+
+    Raises:
+        PDFTooLargeError: The upload exceeds ``PDF_MAX_BYTES``
+    """
+    if fileobj.size > settings.PDF_MAX_BYTES:
+        raise PDFTooLargeError(f"PDF is larger than {settings.PDF_MAX_BYTES} bytes")
+    fileobj.seek(0)
+    return ExtractionJob.objects.create(user=user, payload=fileobj.read())
+
+
+def _abandon_exhausted(cutoff) -> None:
+    ExtractionJob.objects.filter(
+        status=Status.RUNNING, started_at__lt=cutoff, attempts__gte=MAX_ATTEMPTS
+    ).update(
+        status=Status.FAILED,
+        error="Extraction abandoned after repeated worker failures",
+        payload=b"",
+        finished_at=timezone.now(),
+    )
+
+
+def claim_next(stale_after: float = 300) -> ExtractionJob | None:
+    """
+    Claim the oldest runnable job for this worker.
+
+    Runnable jobs are pending ones and running ones whose worker has not
+    finished them within ``stale_after`` seconds. The claim is a
+    conditional update, so when workers race for a job only one wins.
+
+    Returns:
+        The claimed job, or None when the queue is empty
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=stale_after)
+    _abandon_exhausted(cutoff)
+    runnable = Q(status=Status.PENDING) | Q(
+        status=Status.RUNNING, started_at__lt=cutoff, attempts__lt=MAX_ATTEMPTS
+    )
+    candidates = (
+        ExtractionJob.objects.filter(runnable)
+        .order_by("created_at")
+        .values_list("pk", flat=True)[:10]
+    )
+    for pk in candidates:
+        claimed = ExtractionJob.objects.filter(runnable, pk=pk).update(
+            status=Status.RUNNING, started_at=now, attempts=F("attempts") + 1
+        )
+        if claimed:
+            return ExtractionJob.objects.get(pk=pk)
+    return None
+
+
+def run_job(job: ExtractionJob) -> None:
+    """Extract the text of a claimed job and store the outcome."""
+    try:
+        text = extract_cv_text(io.BytesIO(bytes(job.payload)))
+    except Exception as exc:
+        failed.inc()
+        logger.warning("Extraction job %s failed", job.pk, exc_info=True)
+        job.status, job.error = Status.FAILED, str(exc) or type(exc).__name__
+    else:
+        completed.inc()
+        job.status, job.text = Status.DONE, text
+
+    job.payload = b""
+    job.finished_at = timezone.now()
+    with transaction.atomic():
+        if job.status == Status.DONE:
+            profile = UserProfile.objects.filter(user_id=job.user_id).first()
+            if profile is not None:
+                profile.cv_full = job.text
+                profile.save(update_fields=["cv_full"])
+        job.save(update_fields=["status", "text", "error", "payload", "finished_at"])
+
+
+def work(
+    once: bool = False, poll_interval: float = 2.0, stale_after: float = 300
+) -> int:
+    """
+    Process queued jobs until interrupted.
+
+    Args:
+        once: Stop when the queue is empty instead of polling
+        poll_interval: Seconds to sleep when the queue is empty
+        stale_after: Seconds after which a running job is reclaimed
+
+    Returns:
+        Number of jobs processed
+    """
+    processed = 0
+    while True:
+        job = claim_next(stale_after)
+        if job is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        processed += 1
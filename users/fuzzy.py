@@ -0,0 +1,152 @@
+"""
+Fuzzy (trigram) text filtering for JobSikari.
+
+Filters match a search term against a column by trigram word similarity,
+so misspellings such as "Djnago" still find "Django" and "dhaka" matches
+"Dhaka, Bangladesh". On PostgreSQL this is the ``pg_trgm`` ``%>`` operator
+served by GIN trigram indexes; on other backends the distinct column values
+are loaded into a pure-Python ``TrigramIndex`` computing the same measure.
+"""
+
+import re
+from collections import Counter, defaultdict
+from collections.abc import Hashable, Iterable
+
+from django.db import connection, transaction
+
+from users.models import Skill
+
+# Default minimum word similarity for a fuzzy match
+DEFAULT_SIMILARITY = 0.4
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Split text into trigrams the way ``pg_trgm`` does.
+
+    Words are lowercased alphanumeric runs, padded with two spaces in front
+    and one behind.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Set of trigrams
+    """
+    grams = set()
+    for word in re.findall(r"[^\W_]+", text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query: str, text: str) -> float:
+    """
+    Share of the trigrams of ``query`` that also occur in ``text``.
+
+    Args:
+        query: Search term
+        text: Value to compare against
+
+    Returns:
+        Float between 0.0 and 1.0
+    """
+    query_grams = trigrams(query)
+    if not query_grams:
+        return 0.0
+    return len(query_grams & trigrams(text)) / len(query_grams)
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigrams to keys, for fuzzy lookups in Python.
+
+    Only values sharing at least one trigram with the query are scored.
+    """
+
+    def __init__(self, items: Iterable[tuple[Hashable, str]]):
+        self.postings: defaultdict[str, list] = defaultdict(list)
+        for key, text in items:
+            if not text:
+                continue
+            for gram in trigrams(text):
+                self.postings[gram].append(key)
+
+    def search(self, query: str, threshold: float = DEFAULT_SIMILARITY) -> list:
+        """
+        Find keys whose text is similar to ``query``.
+
+        Args:
+            query: Search term
+            threshold: Minimum word similarity
+
+        Returns:
+            Matching keys, most similar first
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.postings.get(gram, ()))
+        return [
+            key
+            for key, count in shared.most_common()
+            if count / len(query_grams) >= threshold
+        ]
+
+
+def fuzzy_filter(queryset, field: str, value: str, threshold: float):
+    """
+    Filter a queryset to rows whose ``field`` is similar to ``value``.
+
+    Args:
+        queryset: QuerySet to filter
+        field: Name of a text column of the queryset's model
+        value: Search term
+        threshold: Minimum word similarity between 0 and 1
+
+    Returns:
+        Filtered QuerySet, matching the similar values of ``field``
+
+    Raises:
+        ValueError: ``threshold`` is outside 0-1
+    """
+    if not 0 <= threshold <= 1:
+        raise ValueError(f"Similarity must be between 0 and 1, got {threshold}")
+    if connection.vendor == "postgresql":
+        # %> compares against this setting, which lets it use the GIN index.
+        # It is set for this transaction only, so it does not leak to other
+        # requests sharing a pooled connection.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(threshold)],
+            )
+            matches = list(
+                queryset.filter(**{f"{field}__trigram_word_similar": value})
+                .values_list(field, flat=True)
+                .distinct()
+            )
+    else:
+        values = queryset.values_list(field, flat=True).distinct()
+        matches = TrigramIndex((text, text) for text in values).search(value, threshold)
+    return queryset.filter(**{f"{field}__in": matches})
+
+
+def fuzzy_skill_ids(value: str, threshold: float = DEFAULT_SIMILARITY) -> list[int]:
+    """
+    Resolve a possibly misspelled skill name to the ids of similar skills.
+
+    Args:
+        value: Skill name as typed by the user
+        threshold: Minimum word similarity
+
+    Returns:
+        List of Skill ids
+    """
+    if connection.vendor == "postgresql":
+        skills = fuzzy_filter(Skill.objects.all(), "name", value, threshold)
+        return list(skills.values_list("id", flat=True))
+    index = TrigramIndex(Skill.objects.values_list("id", "name"))
+    return index.search(value, threshold)
@@ -0,0 +1,172 @@
+"""
+Password hashing on a bounded thread pool with admission control.
+
+Hashing a password is deliberately slow, and under signup or login bursts
+it would otherwise run on every request thread at once. ``User`` routes
+``set_password`` and ``check_password`` (and their async variants) through
+``HashingPool``, which runs at most ``PASSWORD_HASH_WORKERS`` hashes at a
+time and refuses work with ``HashingOverloaded`` once
+``PASSWORD_HASH_MAX_PENDING`` are running or queued, which the API turns
+into a 503. Async callers await the pool without holding a thread.
+
+Sync callers wait on the pool from their request thread. Under WSGI a
+process has ``WEB_THREADS`` of them, so its hashes are only refused if that
+is more than ``PASSWORD_HASH_MAX_PENDING``. Under ASGI every request gets
+its own thread or coroutine, and the pending limit is what bounds the queue.
+
+Threads are enough: the hashers' C implementations (``hashlib.pbkdf2_hmac``,
+argon2, bcrypt) release the GIL while they run.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+from sikari import metrics
+
+queue_depth = metrics.gauge(
+    "password_hash_queue_depth", "Password hashes running or waiting in the pool"
+)
+hash_seconds = metrics.summary(
+    "password_hash_seconds", "Time spent computing password hashes"
+)
+wait_seconds = metrics.summary(
+    "password_hash_wait_seconds", "Time password hashes waited for a pool thread"
+)
+rejected = metrics.counter(
+    "password_hash_rejected_total", "Password hashes refused because the pool is full"
+)
+
+
+class HashingOverloaded(Exception):
+    """The hashing pool is full or did not answer in time."""
+
+
+class HashingPool:
+    """
+    Bounded pool running password hashers.
+
+    Args:
+        workers: Threads computing hashes
+        max_pending: Hashes allowed to run or wait at once; more are refused
+        timeout: Seconds a synchronous caller waits for its hash
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    @classmethod
+    def from_settings(cls) -> "HashingPool":
+        return cls(
+            settings.PASSWORD_HASH_WORKERS,
+            settings.PASSWORD_HASH_MAX_PENDING,
+            settings.PASSWORD_HASH_TIMEOUT,
+        )
+
+    def _timed(self, queued_at: float, func, *args):
+        started = time.perf_counter()
+        wait_seconds.observe(started - queued_at)
+        try:
+            return func(*args)
+        finally:
+            hash_seconds.observe(time.perf_counter() - started)
+
+    def submit(self, func, *args):
+        """
+        Run ``func(*args)`` on the pool.
+
+        Raises:
+            HashingOverloaded: ``max_pending`` hashes are already in flight
+        """
+        if not self._slots.acquire(blocking=False):
+            rejected.inc()
+            raise HashingOverloaded("Too many password hashes in progress")
+        queue_depth.inc()
+        future = self._executor.submit(self._timed, time.perf_counter(), func, *args)
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self) -> None:
+        queue_depth.dec()
+        self._slots.release()
+
+    def run(self, func, *args):
+        """
+        Run ``func(*args)`` on the pool and wait for its result.
+
+        Raises:
+            HashingOverloaded: The pool is full or the hash took longer than
+                ``timeout``
+        """
+        try:
+            return self.submit(func, *args).result(timeout=self.timeout)
+        except FutureTimeoutError as exc:
+            raise HashingOverloaded("Password hashing timed out") from exc
+
+    async def arun(self, func, *args):
+        """Async variant of ``run``, awaiting the pool off the event loop."""
+        future = asyncio.wrap_future(self.submit(func, *args))
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except TimeoutError as exc:
+            raise HashingOverloaded("Password hashing timed out") from exc
+
+
+_pool: HashingPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> HashingPool:
+    """Process-wide hashing pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashingPool.from_settings()
+        return _pool
+
+
+def _check(raw_password, encoded) -> tuple[bool, bool]:
+    """Check a password in the pool, reporting whether it needs rehashing."""
+    outdated = []
+    valid = hashers.check_password(
+        raw_password, encoded, lambda _: outdated.append(True)
+    )
+    return valid, bool(outdated)
+
+
+def make_password(raw_password) -> str:
+    """``django.contrib.auth.hashers.make_password`` on the pool."""
+    return get_pool().run(hashers.make_password, raw_password)
+
+
+async def amake_password(raw_password) -> str:
+    return await get_pool().arun(hashers.make_password, raw_password)
+
+
+def check_password(raw_password, encoded, setter=None) -> bool:
+    """
+    ``django.contrib.auth.hashers.check_password`` on the pool.
+
+    ``setter`` runs in the calling thread, so a rehash is saved on the
+    caller's database connection.
+    """
+    valid, outdated = get_pool().run(_check, raw_password, encoded)
+    if valid and outdated and setter:
+        setter(raw_password)
+    return valid
+
+
+async def acheck_password(raw_password, encoded, setter=None) -> bool:
+    valid, outdated = await get_pool().arun(_check, raw_password, encoded)
+    if valid and outdated and setter:
+        await setter(raw_password)
+    return valid
@@ -0,0 +1,180 @@
+"""
+Resized WebP and AVIF derivatives of project images.
+
+When a project image is uploaded, ``schedule_derivatives`` renders it at
+each of ``WIDTHS`` (never upscaling) in every format of ``FORMATS`` on a
+small thread pool, and stores the results next to the original, e.g.
+``project_images/shot.png`` gets ``project_images/shot_320w.webp``. The
+stored names land in ``Project.derivatives`` and are exposed as ``srcset``
+strings by ``ProjectOutSchema``, so profile pages download a thumbnail
+sized for the layout and the original only when it is opened.
+
+Pillow releases the GIL while resizing and encoding, so threads give real
+parallelism here without shipping image bytes to other processes.
+"""
+
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections
+from PIL import Image, ImageOps
+
+from sikari import metrics
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = (320, 640, 1280)
+# Encoder options per Pillow format name; the first one is the fallback
+FORMATS = {
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 55},
+}
+
+render_seconds = metrics.summary(
+    "project_image_render_seconds", "Time spent rendering project image derivatives"
+)
+
+
+def derivative_name(name: str, width: int, fmt: str) -> str:
+    """Storage name of the ``width`` pixel ``fmt`` derivative of ``name``."""
+    root, _ = os.path.splitext(name)
+    return f"{root}_{width}w.{fmt}"
+
+
+def render_derivatives(data: bytes) -> list[tuple[int, str, bytes]]:
+    """
+    Resize and encode an image at every width and format.
+
+    Widths at or above the image's own are skipped; an image narrower than
+    all of them is only re-encoded.
+
+    Returns:
+        ``(width, format, encoded bytes)`` tuples
+
+    Raises:
+        PIL.UnidentifiedImageError: The data is not a supported image
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    widths = [width for width in WIDTHS if width < image.width] or [image.width]
+    rendered = []
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt, options in FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, fmt.upper(), **options)
+            rendered.append((width, fmt, buffer.getvalue()))
+    return rendered
+
+
+def delete_derivatives(derivatives: list[dict], storage) -> None:
+    for derivative in derivatives:
+        storage.delete(derivative["name"])
+
+
+def generate_derivatives(project_id: int) -> list[dict]:
+    """
+    Render and store the derivatives of a project's current image.
+
+    If the image is replaced while rendering, the results are discarded and
+    the newer upload's own run fills ``Project.derivatives``.
+
+    Returns:
+        The stored derivatives, ``[]`` if the project has no image
+    """
+    from .models import Project
+
+    project = Project.objects.filter(pk=project_id).only("id", "image").first()
+    if project is None or not project.image:
+        return []
+    name, storage = project.image.name, project.image.storage
+
+    started = time.perf_counter()
+    with storage.open(name, "rb") as original:
+        rendered = render_derivatives(original.read())
+    derivatives = [
+        {
+            "name": storage.save(
+                derivative_name(name, width, fmt), ContentFile(content)
+            ),
+            "width": width,
+            "format": fmt,
+        }
+        for width, fmt, content in rendered
+    ]
+    render_seconds.observe(time.perf_counter() - started)
+
+    updated = Project.objects.filter(pk=project_id, image=name).update(
+        derivatives=derivatives
+    )
+    if not updated:
+        delete_derivatives(derivatives, storage)
+        return []
+    return derivatives
+
+
+def _run(project_id: int, pooled: bool) -> None:
+    if pooled:
+        close_old_connections()
+    try:
+        generate_derivatives(project_id)
+    except Exception:
+        logger.warning(
+            "Rendering derivatives of project %s failed", project_id, exc_info=True
+        )
+    finally:
+        if pooled:
+            close_old_connections()
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def schedule_derivatives(project_id: int) -> None:
+    """
+    Render a project's derivatives on the pool, or inline when
+    ``IMAGE_WORKERS`` is 0.
+    """
+    global _executor
+    if not settings.IMAGE_WORKERS:
+        _run(project_id, pooled=False)
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_WORKERS, thread_name_prefix="image"
+            )
+    _executor.submit(_run, project_id, pooled=True)
+
+
+def srcset(project, fmt: str = "webp") -> str | None:
+    """``srcset`` attribute value of a project's ``fmt`` derivatives."""
+    storage = project.image.storage
+    candidates = [
+        f"{storage.url(derivative['name'])} {derivative['width']}w"
+        for derivative in project.derivatives
+        if derivative["format"] == fmt
+    ]
+    return ", ".join(candidates) or None
+
+
+def thumbnail_url(project) -> str | None:
+    """URL of a project's smallest fallback-format derivative."""
+    fallback = next(iter(FORMATS))
+    widths = [d for d in project.derivatives if d["format"] == fallback]
+    if not widths:
+        return None
+    smallest = min(widths, key=lambda derivative: derivative["width"])
+    return project.image.storage.url(smallest["name"])
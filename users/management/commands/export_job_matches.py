@@ -0,0 +1,74 @@
+"""
+Management command to export job recommendations for every profile as JSONL.
+
+Each output line holds one profile, e.g. for building weekly digest emails.
+
+Usage:
+    python manage.py export_job_matches > matches.jsonl
+    python manage.py export_job_matches --output matches.jsonl --workers 4
+"""
+
+import json
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+from users.matching import match_jobs_for_users
+from users.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = "Stream job recommendations for all profiles as JSON lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="File to write to (defaults to stdout)",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Number of jobs per profile",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes used for ranking",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of profiles ranked per chunk",
+        )
+
+    def handle(self, *args, **options):
+        profiles = UserProfile.objects.select_related("user").order_by("pk")
+        results = match_jobs_for_users(
+            profiles,
+            Job.objects.all(),
+            limit=options["limit"],
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+        )
+
+        count = 0
+        with ExitStack() as stack:
+            out = self.stdout
+            if options["output"]:
+                out = stack.enter_context(open(options["output"], "w"))
+            for profile, matches in results:
+                line = {
+                    "profile_id": profile.pk,
+                    "email": profile.user.email,
+                    "matches": matches,
+                }
+                out.write(json.dumps(line) + "\n")
+                count += 1
+
+        self.stderr.write(
+            self.style.SUCCESS(f"✓ Exported matches for {count} profiles")
+        )
@@ -0,0 +1,28 @@
+"""
+Management command to rebuild the materialized recommendation table.
+
+Usage:
+    python manage.py rebuild_recommendations
+    python manage.py rebuild_recommendations --batch-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+
+from users.recommendations import rebuild_recommendations
+
+
+class Command(BaseCommand):
+    help = "Rebuild stored job and resource recommendations for every profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of profiles written per bulk insert",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding recommendations...")
+        written = rebuild_recommendations(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Stored {written} recommendation rows"))
@@ -0,0 +1,42 @@
+"""
+Management command running a CV text extraction worker.
+
+Usage:
+    python manage.py run_extraction_worker
+    python manage.py run_extraction_worker --once
+"""
+
+from django.core.management.base import BaseCommand
+
+from users.extraction import work
+
+
+class Command(BaseCommand):
+    help = "Extract the text of CVs queued by /pdf/textify?background=true"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when the queue is empty instead of polling",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls of an empty queue",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=float,
+            default=300,
+            help="Seconds after which a running job is assumed abandoned",
+        )
+
+    def handle(self, *args, **options):
+        processed = work(
+            once=options["once"],
+            poll_interval=options["poll_interval"],
+            stale_after=options["stale_after"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"✓ Processed {processed} jobs"))
@@ -19,6 +19,19 @@ class CustomUserManager(BaseUserManager):
         user.save()
         return user
 
+    async def acreate_user(self, email, password, **extra_fields):
+        """
+        Async variant of ``create_user``, hashing the password without
+        holding a thread.
+        """
+        if not email:
+            raise ValueError("The Email must be set")
+        email = self.normalize_email(email)
+        user = self.model(email=email, **extra_fields)
+        await user.aset_password(password)
+        await user.asave()
+        return user
+
     def create_superuser(self, email, password, **extra_fields):
         """
         Create and save a SuperUser with the given email and password.
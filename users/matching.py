@@ -5,7 +5,27 @@ This module provides non-AI matching algorithms that calculate
 job and resource recommendations based on user profile skills.
 """
 
-from typing import TypedDict
+import heapq
+import math
+import threading
+from collections import Counter, OrderedDict, defaultdict, deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from typing import TYPE_CHECKING, NotRequired, TypedDict
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import transaction
+from django.db.models import Count
+
+from sikari.caching import CATALOG, current_version
+
+if TYPE_CHECKING:
+    from jobs.models import Job
+    from resources.models import LearningResource
+    from users.models import UserProfile
 
 
 class JobMatch(TypedDict):
@@ -17,6 +37,8 @@ class JobMatch(TypedDict):
     match_score: float
     matching_skills: list[str]
     total_skills: int
+    # Matched object, only loaded by the single-user matcher
+    job: NotRequired["Job"]
 
 
 class ResourceMatch(TypedDict):
@@ -28,6 +50,8 @@ class ResourceMatch(TypedDict):
     match_score: float
     matching_skills: list[str]
     total_skills: int
+    # Matched object, only loaded by the single-user matcher
+    resource: NotRequired["LearningResource"]
 
 
 def calculate_skill_overlap(user_skills: set[str], required_skills: set[str]) -> float:
@@ -54,54 +78,338 @@ def calculate_skill_overlap(user_skills: set[str], required_skills: set[str]) ->
     return overlap
 
 
-def match_jobs_for_user(user_profile, jobs_queryset, limit: int = 10) -> list[JobMatch]:
+def weighted_skill_overlap(
+    user_skills: set[int], required_skills: set[int], weights: dict[int, float]
+) -> float:
     """
-    Find and rank jobs based on skill overlap with user profile.
+    Calculate skill overlap with every skill counted by its weight.
 
     Args:
-        user_profile: UserProfile instance
-        jobs_queryset: QuerySet of Job objects to match against
-        limit: Maximum number of results to return
+        user_skills: Set of skill ids from user profile
+        required_skills: Set of skill ids required by job/resource
+        weights: Skill id -> weight; missing skills weigh 1.0
 
     Returns:
-        List of JobMatch dictionaries sorted by match_score (descending)
+        Float between 0.0 and 1.0: weight of the shared skills over the
+        weight of the required skills, with the same baselines as
+        ``calculate_skill_overlap``
     """
-    user_skill_names = set(skill.name.lower() for skill in user_profile.skills.all())
+    if not required_skills:
+        return 0.5
 
-    matches = []
-    for job in jobs_queryset:
-        job_skill_names = set(skill.name.lower() for skill in job.required_skills.all())
+    if not user_skills:
+        return 0.0
 
-        match_score = calculate_skill_overlap(user_skill_names, job_skill_names)
+    total = sum(weights.get(skill, 1.0) for skill in required_skills)
+    matching = sum(
+        weights.get(skill, 1.0) for skill in user_skills.intersection(required_skills)
+    )
+    return matching / total
 
-        # Get the actual matching skill names (case-sensitive originals)
-        matching_skills = [
-            skill.name
-            for skill in job.required_skills.all()
-            if skill.name.lower() in user_skill_names
-        ]
 
-        matches.append(
-            {
-                "job_id": job.id,
-                "title": job.title,
-                "company": job.company,
-                "match_score": match_score,
-                "matching_skills": matching_skills,
-                "total_skills": len(job_skill_names),
-            }
+def _weights_cache_key(model) -> str:
+    return f"matching:idf:{model._meta.label_lower}"
+
+
+def skill_weights(model, skill_field: str) -> dict[int, float]:
+    """
+    Inverse document frequency of each skill across a catalog.
+
+    Rare skills (e.g. "Spring Boot") weigh more than ubiquitous ones (e.g.
+    "Git"). The table covers the whole catalog of ``model`` and is cached
+    together with the ``CATALOG`` version it was computed at, so it is only
+    served while that version is current. Like ``catalog_index``, it is
+    computed on every call inside a transaction or without a cache backend.
+
+    Args:
+        model: Job or LearningResource
+        skill_field: Name of the M2M field pointing at Skill
+
+    Returns:
+        Dict mapping skill id to ``log((1 + N) / (1 + df)) + 1``
+    """
+    key = _weights_cache_key(model)
+    version = None
+    if not transaction.get_connection(model.objects.db).in_atomic_block:
+        # Read before the catalog, so the table never outlives the version it saw
+        version = current_version(CATALOG)
+    if version is not None:
+        entry = cache.get(key)
+        if entry is not None and entry["version"] == version:
+            return entry["weights"]
+
+    field = model._meta.get_field(skill_field)
+    target = f"{field.m2m_reverse_field_name()}_id"
+    total = model.objects.count()
+    weights = {
+        row[target]: math.log((1 + total) / (1 + row["df"])) + 1
+        for row in field.remote_field.through.objects.values(target).annotate(
+            df=Count("pk")
         )
+    }
+    if version is not None:
+        cache.set(key, {"version": version, "weights": weights}, timeout=None)
+    return weights
+
 
-    # Sort by match_score descending, then by number of matching skills
-    matches.sort(
-        key=lambda x: (x["match_score"], len(x["matching_skills"])), reverse=True
+# Scoring modes accepted by the matchers
+SCORING_MODES = ("overlap", "idf")
+
+
+class SkillIndex:
+    """
+    Inverted index from skill id to the catalog items that require it.
+
+    The index is built from the M2M through table of ``skill_field`` with a
+    single query, so ranking only has to visit the posting lists of the
+    user's own skills instead of materialising a skill set for every item.
+
+    Attributes:
+        item_ids: Item ids in queryset order (used to break ties)
+        postings: Skill id -> list of item ids requiring that skill
+        item_skills: Item id -> list of its skill ids
+        skill_counts: Item id -> number of skills the item requires
+    """
+
+    def __init__(self, item_ids, pairs):
+        self.item_ids = list(dict.fromkeys(item_ids))
+        self.position = {item_id: i for i, item_id in enumerate(self.item_ids)}
+        self.postings = defaultdict(list)
+        self.item_skills = defaultdict(list)
+        for item_id, skill_id in pairs:
+            self.postings[skill_id].append(item_id)
+            self.item_skills[item_id].append(skill_id)
+        self.skill_counts = {
+            item_id: len(self.item_skills.get(item_id, ())) for item_id in self.item_ids
+        }
+        # Items without skills score a constant baseline for every user
+        self.unskilled = [
+            item_id for item_id in self.item_ids if not self.skill_counts[item_id]
+        ]
+
+    @classmethod
+    def from_queryset(cls, queryset, skill_field: str) -> "SkillIndex":
+        """
+        Build an index for the items of ``queryset`` using its ``skill_field`` M2M.
+
+        Args:
+            queryset: QuerySet of Job or LearningResource objects
+            skill_field: Name of the M2M field pointing at Skill
+
+        Returns:
+            SkillIndex covering every item in the queryset
+        """
+        queryset = queryset.prefetch_related(None)
+        field = queryset.model._meta.get_field(skill_field)
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+
+        item_ids = queryset.values_list("pk", flat=True)
+        pairs = field.remote_field.through.objects.filter(
+            **{f"{source}__in": queryset.values("pk")}
+        ).values_list(f"{source}_id", f"{target}_id")
+        return cls(item_ids, pairs)
+
+    def overlap_counts(self, user_skill_ids) -> Counter:
+        """Count shared skills for every item sharing at least one with the user."""
+        counts = Counter()
+        for skill_id in user_skill_ids:
+            counts.update(self.postings.get(skill_id, ()))
+        return counts
+
+
+# Indexes kept by ``catalog_index`` in this process, for one CATALOG version
+INDEX_CACHE_SIZE = 8
+_indexes: OrderedDict = OrderedDict()
+_indexes_version = None
+_indexes_lock = threading.Lock()
+
+
+def catalog_index(queryset, skill_field: str) -> SkillIndex:
+    """
+    SkillIndex of ``queryset``, built once per process and catalog version.
+
+    Indexes are kept in memory per SQL query of ``queryset`` (the
+    ``INDEX_CACHE_SIZE`` most recently used) and all dropped when the
+    ``CATALOG`` version counter of ``sikari.caching`` changes. Without a
+    cache backend keeping that counter, or inside a transaction, whose
+    uncommitted catalog changes other requests must not see, the index is
+    built on every call.
+
+    Args:
+        queryset: QuerySet of Job or LearningResource objects
+        skill_field: Name of the M2M field pointing at Skill
+
+    Returns:
+        SkillIndex shared with other callers; it must not be modified
+    """
+    global _indexes_version
+    try:
+        key = (queryset.model._meta.label_lower, skill_field, str(queryset.query))
+    except EmptyResultSet:
+        key = None
+    version = None
+    if key and not transaction.get_connection(queryset.db).in_atomic_block:
+        # Read before the catalog, so an index never outlives the version it saw
+        version = current_version(CATALOG)
+    if version is None:
+        return SkillIndex.from_queryset(queryset, skill_field)
+
+    with _indexes_lock:
+        if _indexes_version != version:
+            _indexes.clear()
+            _indexes_version = version
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+
+    index = SkillIndex.from_queryset(queryset, skill_field)
+    with _indexes_lock:
+        if _indexes_version == version:
+            _indexes[key] = index
+            while len(_indexes) > INDEX_CACHE_SIZE:
+                _indexes.popitem(last=False)
+    return index
+
+
+def top_k(entries, k: int) -> list:
+    """
+    Select the ``k`` best entries from a stream with a bounded heap.
+
+    Runs in O(n log k) time and O(k) memory instead of sorting every entry.
+
+    Args:
+        entries: Iterable of (match_score, matching_count, position, item_id)
+        k: Number of entries to keep
+
+    Returns:
+        The best entries, ordered by match_score then matching_count
+        (descending), ties broken by catalog position (ascending)
+    """
+    return heapq.nsmallest(k, entries, key=lambda e: (-e[0], -e[1], e[2]))
+
+
+def rank_items(index: SkillIndex, user_skill_ids, limit: int, weights=None):
+    """
+    Rank indexed items for a user, consistent with ``calculate_skill_overlap``.
+
+    Only items sharing a skill with the user are scored. Items requiring no
+    skills (baseline 0.5) and items sharing none (0.0) have constant scores
+    and are merged in catalog order, so they are only visited while there is
+    still room under ``limit``.
+
+    Args:
+        index: SkillIndex of the catalog
+        user_skill_ids: Set of skill ids from the user profile
+        limit: Maximum number of results to return
+        weights: Optional skill id -> weight mapping; scores then use
+            ``weighted_skill_overlap`` instead of plain overlap
+
+    Returns:
+        List of (item_id, match_score, matching_skill_ids) tuples, best first
+    """
+
+    def score(item_id, count):
+        if weights is None:
+            return count / index.skill_counts[item_id]
+        skill_ids = set(index.item_skills[item_id])
+        return weighted_skill_overlap(skill_ids & user_skill_ids, skill_ids, weights)
+
+    counts = index.overlap_counts(user_skill_ids)
+    entries = (
+        (score(item_id, count), count, index.position[item_id], item_id)
+        for item_id, count in counts.items()
+    )
+    scored = top_k(entries, max(limit, 0))
+
+    # Candidates scoring below the no-skills baseline rank after unskilled items
+    baseline = calculate_skill_overlap(set(), set())
+    split = next(
+        (i for i, entry in enumerate(scored) if entry[0] < baseline), len(scored)
+    )
+    candidates = [entry[3] for entry in scored]
+    seen = set(counts).union(index.unskilled)
+    ranked = chain(
+        candidates[:split],
+        index.unskilled,
+        candidates[split:],
+        (item_id for item_id in index.item_ids if item_id not in seen),
+    )
+
+    results = []
+    for item_id in islice(ranked, max(limit, 0)):
+        skill_ids = index.item_skills.get(item_id, [])
+        matching_ids = [s for s in skill_ids if s in user_skill_ids]
+        if weights is None:
+            match_score = calculate_skill_overlap(set(matching_ids), set(skill_ids))
+        else:
+            match_score = weighted_skill_overlap(
+                set(matching_ids), set(skill_ids), weights
+            )
+        results.append((item_id, match_score, matching_ids))
+    return results
+
+
+def _scoring_weights(scoring: str, model, skill_field: str):
+    """Resolve a ``scoring`` mode to the weights passed to ``rank_items``."""
+    if scoring not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {scoring}")
+    if scoring == "overlap":
+        return None
+    return skill_weights(model, skill_field)
+
+
+def match_jobs_for_user(
+    user_profile,
+    jobs_queryset,
+    limit: int = 10,
+    scoring: str = "overlap",
+) -> list[JobMatch]:
+    """
+    Find and rank jobs based on skill overlap with user profile.
+
+    Args:
+        user_profile: UserProfile instance
+        jobs_queryset: QuerySet of Job objects to match against
+        limit: Maximum number of results to return
+        scoring: "overlap" counts every skill equally, "idf" weights skills
+            by ``skill_weights``
+
+    Returns:
+        List of JobMatch dictionaries sorted by match_score (descending). The
+        matched Job objects are loaded in one ``in_bulk`` pass over
+        ``jobs_queryset``, so its prefetches apply to them.
+    """
+    user_skills = {skill.id: skill.name for skill in user_profile.skills.all()}
+    index = catalog_index(jobs_queryset, "required_skills")
+    ranked = rank_items(
+        index,
+        user_skills.keys(),
+        limit,
+        _scoring_weights(scoring, jobs_queryset.model, "required_skills"),
     )
 
-    return matches[:limit]
+    jobs = jobs_queryset.in_bulk([item_id for item_id, _, _ in ranked])
+    return [
+        {
+            "job_id": job_id,
+            "title": jobs[job_id].title,
+            "company": jobs[job_id].company,
+            "match_score": match_score,
+            "matching_skills": [user_skills[s] for s in matching_ids],
+            "total_skills": index.skill_counts[job_id],
+            "job": jobs[job_id],
+        }
+        for job_id, match_score, matching_ids in ranked
+    ]
 
 
 def match_resources_for_user(
-    user_profile, resources_queryset, limit: int = 10
+    user_profile,
+    resources_queryset,
+    limit: int = 10,
+    scoring: str = "overlap",
 ) -> list[ResourceMatch]:
     """
     Find and rank learning resources based on skill overlap with user profile.
@@ -110,41 +418,157 @@ def match_resources_for_user(
         user_profile: UserProfile instance
         resources_queryset: QuerySet of LearningResource objects to match against
         limit: Maximum number of results to return
+        scoring: "overlap" counts every skill equally, "idf" weights skills
+            by ``skill_weights``
 
     Returns:
-        List of ResourceMatch dictionaries sorted by match_score (descending)
+        List of ResourceMatch dictionaries sorted by match_score (descending).
+        The matched LearningResource objects are loaded in one ``in_bulk``
+        pass over ``resources_queryset``, so its prefetches apply to them.
     """
-    user_skill_names = set(skill.name.lower() for skill in user_profile.skills.all())
+    user_skills = {skill.id: skill.name for skill in user_profile.skills.all()}
+    index = catalog_index(resources_queryset, "related_skills")
+    ranked = rank_items(
+        index,
+        user_skills.keys(),
+        limit,
+        _scoring_weights(scoring, resources_queryset.model, "related_skills"),
+    )
 
-    matches = []
-    for resource in resources_queryset:
-        resource_skill_names = set(
-            skill.name.lower() for skill in resource.related_skills.all()
-        )
+    resources = resources_queryset.in_bulk([item_id for item_id, _, _ in ranked])
+    return [
+        {
+            "resource_id": resource_id,
+            "title": resources[resource_id].title,
+            "platform": resources[resource_id].platform or "",
+            "match_score": match_score,
+            "matching_skills": [user_skills[s] for s in matching_ids],
+            "total_skills": index.skill_counts[resource_id],
+            "resource": resources[resource_id],
+        }
+        for resource_id, match_score, matching_ids in ranked
+    ]
 
-        match_score = calculate_skill_overlap(user_skill_names, resource_skill_names)
 
-        # Get the actual matching skill names (case-sensitive originals)
-        matching_skills = [
-            skill.name
-            for skill in resource.related_skills.all()
-            if skill.name.lower() in user_skill_names
-        ]
+def _rank_chunk(index, limit, weights, chunk):
+    """Rank a chunk of (profile_id, skill_ids) pairs against ``index``."""
+    return [
+        (profile_id, rank_items(index, skill_ids, limit, weights))
+        for profile_id, skill_ids in chunk
+    ]
 
-        matches.append(
-            {
-                "resource_id": resource.id,
-                "title": resource.title,
-                "platform": resource.platform or "",
-                "match_score": match_score,
-                "matching_skills": matching_skills,
-                "total_skills": len(resource_skill_names),
-            }
-        )
 
-    # Sort by match_score descending, then by number of matching skills
-    matches.sort(
-        key=lambda x: (x["match_score"], len(x["matching_skills"])), reverse=True
+# State of a batch ranking worker process, set by ``_init_batch_worker``
+_batch_state = {}
+
+
+def _init_batch_worker(index, limit, weights):
+    _batch_state.update(index=index, limit=limit, weights=weights)
+
+
+def _rank_batch(chunk):
+    """Pool task: rank a chunk against the worker process's index."""
+    return _rank_chunk(
+        _batch_state["index"], _batch_state["limit"], _batch_state["weights"], chunk
     )
 
-    return matches[:limit]
+
+def match_jobs_for_users(
+    profiles,
+    jobs_queryset,
+    limit: int = 10,
+    workers: int = 1,
+    chunk_size: int = 500,
+    scoring: str = "overlap",
+) -> Iterator[tuple["UserProfile", list[JobMatch]]]:
+    """
+    Rank jobs for many profiles, loading the job catalog only once.
+
+    The catalog is indexed once (a sparse skill x job matrix held as posting
+    lists) and every profile row of the sparse user x skill matrix is
+    multiplied against it by accumulating its skills' posting lists. Profile
+    skills are read from the through table in one query per chunk.
+
+    Args:
+        profiles: QuerySet of UserProfile objects
+        jobs_queryset: QuerySet of Job objects to match against
+        limit: Maximum number of results per profile
+        workers: Number of processes ranking chunks in parallel (1 ranks
+            in-process)
+        chunk_size: Number of profiles loaded and ranked per chunk
+        scoring: "overlap" or "idf", as for ``match_jobs_for_user``
+
+    Yields:
+        (UserProfile, list of JobMatch) pairs in ``profiles`` order; the
+        matches carry no ``job`` object
+    """
+    index = SkillIndex.from_queryset(jobs_queryset, "required_skills")
+    weights = _scoring_weights(scoring, jobs_queryset.model, "required_skills")
+    jobs = {
+        job_id: (title, company)
+        for job_id, title, company in jobs_queryset.prefetch_related(None).values_list(
+            "id", "title", "company"
+        )
+    }
+    skill_field = profiles.model._meta.get_field("skills")
+    skill_names = dict(skill_field.related_model.objects.values_list("id", "name"))
+
+    def chunks():
+        batch = []
+        for profile in profiles.iterator(chunk_size=chunk_size):
+            batch.append(profile)
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def profile_skills(batch):
+        source = skill_field.m2m_field_name()
+        skills = defaultdict(set)
+        pairs = skill_field.remote_field.through.objects.filter(
+            **{f"{source}__in": batch}
+        ).values_list(f"{source}_id", f"{skill_field.m2m_reverse_field_name()}_id")
+        for profile_id, skill_id in pairs:
+            skills[profile_id].add(skill_id)
+        return [(profile.pk, skills[profile.pk]) for profile in batch]
+
+    def ranked_batches():
+        if workers <= 1:
+            rank = partial(_rank_chunk, index, limit, weights)
+            for batch in chunks():
+                yield batch, rank(profile_skills(batch))
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(index, limit, weights),
+        ) as executor:
+            # Keep a bounded window of chunks in flight so output streams in order
+            in_flight = deque()
+            for batch in chunks():
+                future = executor.submit(_rank_batch, profile_skills(batch))
+                in_flight.append((batch, future))
+                if len(in_flight) >= workers * 2:
+                    batch, future = in_flight.popleft()
+                    yield batch, future.result()
+            for batch, future in in_flight:
+                yield batch, future.result()
+
+    for batch, results in ranked_batches():
+        for profile, (_, ranked) in zip(batch, results):
+            yield (
+                profile,
+                [
+                    {
+                        "job_id": job_id,
+                        "title": jobs[job_id][0],
+                        "company": jobs[job_id][1],
+                        "match_score": match_score,
+                        "matching_skills": [skill_names[s] for s in matching_ids],
+                        "total_skills": index.skill_counts[job_id],
+                    }
+                    for job_id, match_score, matching_ids in ranked
+                ],
+            )
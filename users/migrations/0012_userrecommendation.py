@@ -0,0 +1,77 @@
+# Generated by Django 5.2.8 on 2026-10-17 17:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0001_initial"),
+        ("resources", "0001_initial"),
+        ("users", "0011_alter_userprofile_experience"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserRecommendation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("job", "Job"), ("resource", "Resource")],
+                        max_length=10,
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("match_score", models.FloatField()),
+                ("matching_skills", models.JSONField(blank=True, default=list)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="jobs.job",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recommendations",
+                        to="users.userprofile",
+                    ),
+                ),
+                (
+                    "resource",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="resources.learningresource",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["profile", "kind", "rank"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("profile", "kind", "rank"),
+                        name="unique_recommendation_rank",
+                    )
+                ],
+            },
+        ),
+    ]
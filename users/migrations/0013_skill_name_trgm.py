@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:05
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+INDEX = "skill_name_trgm"
+
+
+def create_index(apps, schema_editor):
+    # Trigram indexes only exist on PostgreSQL; other backends use the
+    # in-memory index of users.fuzzy
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX {INDEX} ON users_skill USING gin (name gin_trgm_ops)"
+        )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0012_userrecommendation"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_index, drop_index),
+    ]
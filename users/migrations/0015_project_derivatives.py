@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0014_extractionjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="derivatives",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:41
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0015_project_derivatives"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="userrecommendation",
+            options={"ordering": ("profile", "kind", "rank")},
+        ),
+    ]
@@ -1,14 +1,22 @@
+import uuid
+
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 from django.utils.text import slugify
 from django_lifecycle import (
     AFTER_CREATE,
+    AFTER_DELETE,
+    AFTER_SAVE,
+    AFTER_UPDATE,
     BEFORE_CREATE,
+    BEFORE_UPDATE,
     LifecycleModel,
-    LifecycleModelMixin,
     hook,
 )
 
+from sikari.caching import CATALOG, SKILLS, bump_version, user_version
+
+from . import hashing, images
 from .managers import CustomUserManager
 
 
@@ -21,6 +29,32 @@ class User(AbstractUser):
 
     objects = CustomUserManager()
 
+    # Hashing goes through the bounded users.hashing pool
+
+    def set_password(self, raw_password):
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return hashing.check_password(raw_password, self.password, setter)
+
+    async def aset_password(self, raw_password):
+        self.password = await hashing.amake_password(raw_password)
+        self._password = raw_password
+
+    async def acheck_password(self, raw_password):
+        async def setter(raw_password):
+            await self.aset_password(raw_password)
+            self._password = None
+            await self.asave(update_fields=["password"])
+
+        return await hashing.acheck_password(raw_password, self.password, setter)
+
     def __str__(self):
         return self.username
 
@@ -33,6 +67,19 @@ class Skill(LifecycleModel):
     def set_slug(self):
         self.slug = slugify(self.name)
 
+    @hook(AFTER_UPDATE, has_changed=True, when="name", on_commit=True)
+    @hook(AFTER_DELETE, on_commit=True)
+    def bump_catalog_version(self):
+        # Skill names are rendered in cached catalog and dashboard responses
+        bump_version(CATALOG)
+
+    @hook(AFTER_CREATE)
+    @hook(AFTER_UPDATE, has_changed=True, when_any=["name", "slug"])
+    @hook(AFTER_DELETE)
+    def bump_registry_version(self):
+        # Other workers reload their users.registry maps
+        bump_version(SKILLS)
+
     def __str__(self):
         return self.name
 
@@ -79,6 +126,11 @@ class UserProfile(LifecycleModel):
         Careers, related_name="suggested_users", blank=True
     )
 
+    @hook(AFTER_SAVE)
+    @hook(AFTER_DELETE)
+    def bump_cache_version(self):
+        bump_version(user_version(self.user_id))
+
     def __str__(self):
         return f"Profile of {self.fullname} ({self.user.email})"
 
@@ -94,12 +146,105 @@ class GeneratedRoadmap(models.Model):
     )
 
 
-class Project(models.Model):
+class Project(LifecycleModel):
     user = models.ForeignKey(to=User, on_delete=models.CASCADE, related_name="projects")
     image = models.ImageField(upload_to="project_images/", blank=True, null=True)
+    # Resized copies of image, filled in by users.images
+    derivatives = models.JSONField(default=list, blank=True, editable=False)
     title = models.CharField(max_length=255)
     description = models.TextField()
     link = models.URLField(blank=True, null=True)
 
+    @hook(BEFORE_UPDATE, has_changed=True, when="image")
+    def drop_derivatives(self):
+        stale, storage = self.derivatives, self.image.storage
+        self.derivatives = []
+        if stale:
+            transaction.on_commit(lambda: images.delete_derivatives(stale, storage))
+
+    @hook(AFTER_SAVE, has_changed=True, when="image")
+    def render_derivatives(self):
+        if self.image:
+            pk = self.pk
+            transaction.on_commit(lambda: images.schedule_derivatives(pk))
+
+    @hook(AFTER_DELETE)
+    def delete_derivatives(self):
+        if self.derivatives:
+            images.delete_derivatives(self.derivatives, self.image.storage)
+
     def __str__(self):
         return f"{self.title} by {self.user.email}"
+
+
+class UserRecommendation(models.Model):
+    """Materialized top-N job/resource match for a profile."""
+
+    class Kind(models.TextChoices):
+        JOB = "job", "Job"
+        RESOURCE = "resource", "Resource"
+
+    profile = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name="recommendations"
+    )
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    job = models.ForeignKey(
+        "jobs.Job", on_delete=models.CASCADE, blank=True, null=True, related_name="+"
+    )
+    resource = models.ForeignKey(
+        "resources.LearningResource",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="+",
+    )
+    rank = models.PositiveSmallIntegerField()
+    match_score = models.FloatField()
+    matching_skills = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ("profile", "kind", "rank")
+        constraints = (
+            models.UniqueConstraint(
+                fields=["profile", "kind", "rank"], name="unique_recommendation_rank"
+            ),
+        )
+
+    def __str__(self):
+        return f"#{self.rank} {self.kind} for {self.profile_id}"
+
+
+class ExtractionJob(models.Model):
+    """CV upload waiting for, or done with, text extraction by a worker."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="extraction_jobs"
+    )
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    # Uploaded PDF, emptied once the job finishes
+    payload = models.BinaryField()
+    text = models.TextField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=["status", "created_at"], name="extraction_job_queue_idx"
+            ),
+        )
+
+    def __str__(self):
+        return f"Extraction {self.id} ({self.status})"
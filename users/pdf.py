@@ -0,0 +1,298 @@
+"""
+PDF text extraction for uploaded CVs.
+
+Text is read straight from the uploaded file object: small uploads are
+already in memory, and uploads Django spooled to disk are memory-mapped,
+so the document is never copied. ``iter_pdf_text`` parses and yields one
+page at a time, and uploads over ``PDF_MAX_BYTES`` or ``PDF_MAX_PAGES`` are
+refused before any text is extracted.
+
+``extract_cv_text`` is the path used by the API: results are cached by the
+SHA-256 of the file, and extraction runs on a bounded process pool
+(``PDF_WORKERS``), with the pages of long documents split across workers
+and a per-document timeout (``PDF_TIMEOUT``).
+"""
+
+import hashlib
+import io
+import math
+import mmap
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from itertools import chain
+
+from django.conf import settings
+from django.core.cache import cache
+from pypdf import PdfReader
+
+from sikari import metrics
+
+# Fewest pages handed to one pool task; shorter documents are not split
+MIN_PAGES_PER_TASK = 4
+
+queue_depth = metrics.gauge(
+    "pdf_extraction_queue_depth", "PDF page ranges queued or running in the pool"
+)
+extraction_seconds = metrics.summary(
+    "pdf_extraction_seconds", "Time spent extracting text from uncached PDFs"
+)
+cache_hits = metrics.counter(
+    "pdf_extraction_cache_hits_total", "PDF uploads served from the text cache"
+)
+timeouts = metrics.counter(
+    "pdf_extraction_timeouts_total", "PDF extractions that exceeded PDF_TIMEOUT"
+)
+
+
+class PDFTooLargeError(ValueError):
+    """The PDF exceeds the configured byte or page cap."""
+
+
+class PDFExtractionTimeout(Exception):
+    """Extraction took longer than the configured timeout."""
+
+
+def _size(fileobj) -> int:
+    size = getattr(fileobj, "size", None)
+    if size is None:
+        size = fileobj.seek(0, os.SEEK_END)
+    return size
+
+
+@contextmanager
+def _open_stream(fileobj):
+    """Yield a seekable stream over the upload without copying it."""
+    raw = getattr(fileobj, "file", fileobj)
+    try:
+        fileno = raw.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileno = None
+    if fileno is None:
+        raw.seek(0)
+        yield raw
+        return
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
+def iter_pdf_text(
+    fileobj, max_pages: int | None = None, max_bytes: int | None = None
+) -> Iterator[str]:
+    """
+    Yield the text of each page of a PDF.
+
+    Args:
+        fileobj: Uploaded file, or any seekable binary file object
+        max_pages: Page cap, ``settings.PDF_MAX_PAGES`` when omitted
+        max_bytes: Size cap, ``settings.PDF_MAX_BYTES`` when omitted
+
+    Raises:
+        PDFTooLargeError: The PDF exceeds one of the caps
+        pypdf.errors.PdfReadError: The file is not a readable PDF
+    """
+    max_pages = settings.PDF_MAX_PAGES if max_pages is None else max_pages
+    max_bytes = settings.PDF_MAX_BYTES if max_bytes is None else max_bytes
+
+    size = _size(fileobj)
+    if size > max_bytes:
+        raise PDFTooLargeError(f"PDF is larger than {max_bytes} bytes")
+    if not size:
+        return
+
+    with _open_stream(fileobj) as stream:
+        reader = PdfReader(stream)
+        if len(reader.pages) > max_pages:
+            raise PDFTooLargeError(f"PDF has more than {max_pages} pages")
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+
+def extract_pdf_text(fileobj, **caps) -> str:
+    """
+    Extract the text of a PDF, pages separated by newlines.
+
+    Takes the same arguments and raises the same errors as ``iter_pdf_text``.
+    """
+    text = io.StringIO()
+    for number, page_text in enumerate(iter_pdf_text(fileobj, **caps)):
+        if number:
+            text.write("\n")
+        text.write(page_text)
+    return text.getvalue().strip()
+
+
+def _extract_pages(data: bytes, start: int, stop: int) -> list[str]:
+    """Pool task: extract the text of pages ``start`` to ``stop``."""
+    reader = PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+class ExtractionPool:
+    """
+    Bounded process pool extracting page ranges of PDFs.
+
+    A document that takes longer than ``timeout`` retires the pool: its queued
+    tasks are cancelled, its worker processes are terminated and new work goes
+    to a fresh pool, so stuck workers never outlive their pool. Other
+    documents whose tasks were cancelled or lost with the retired pool are
+    resubmitted once.
+
+    Args:
+        workers: Worker processes
+        timeout: Seconds a document may take before its tasks are abandoned
+    """
+
+    def __init__(self, workers: int, timeout: float):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers do not inherit the web server's threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _retire(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # shutdown() drops the process table, so take it first
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+    def _submit(self, data: bytes, start: int, stop: int) -> tuple:
+        """Queue one page range, returning the executor and its future."""
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_extract_pages, data, start, stop)
+        except RuntimeError:
+            # Retired by another document's timeout, or broken
+            self._retire(executor)
+            executor = self._get_executor()
+            future = executor.submit(_extract_pages, data, start, stop)
+        queue_depth.inc()
+        future.add_done_callback(lambda _: queue_depth.dec())
+        return executor, future
+
+    def extract(self, data: bytes, page_count: int) -> str:
+        """
+        Extract the text of a PDF, splitting its pages across the workers.
+
+        Raises:
+            PDFExtractionTimeout: The document took longer than ``timeout``
+        """
+        deadline = time.monotonic() + self.timeout
+        size = max(MIN_PAGES_PER_TASK, math.ceil(page_count / self.workers))
+        tasks = {
+            (start, min(start + size, page_count)): None
+            for start in range(0, page_count, size)
+        }
+        retried = False
+        while True:
+            for pages, task in tasks.items():
+                if task is None:
+                    tasks[pages] = self._submit(data, *pages)
+            futures = [future for _, future in tasks.values()]
+            _, not_done = wait(futures, timeout=max(0, deadline - time.monotonic()))
+            if not_done:
+                timeouts.inc()
+                stuck = set()
+                for executor, future in tasks.values():
+                    if future in not_done:
+                        future.cancel()
+                        stuck.add(executor)
+                for executor in stuck:
+                    self._retire(executor)
+                raise PDFExtractionTimeout(
+                    f"PDF extraction took longer than {self.timeout} seconds"
+                )
+            lost = [
+                pages
+                for pages, (_, future) in tasks.items()
+                if future.cancelled() or isinstance(future.exception(), BrokenExecutor)
+            ]
+            if not lost or retried:
+                break
+            retried = True
+            for pages in lost:
+                tasks[pages] = None
+
+        pages = chain.from_iterable(future.result() for _, future in tasks.values())
+        return "\n".join(pages).strip()
+
+
+_pool: ExtractionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ExtractionPool:
+    """Process-wide extraction pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractionPool(settings.PDF_WORKERS, settings.PDF_TIMEOUT)
+        return _pool
+
+
+def _sha256(stream) -> str:
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def extract_cv_text(fileobj) -> str:
+    """
+    Extract the text of an uploaded CV, serving repeated uploads from cache.
+
+    Extraction runs on the process pool unless ``PDF_WORKERS`` is 0.
+
+    Raises:
+        PDFTooLargeError: The PDF exceeds the byte or page cap
+        PDFExtractionTimeout: Extraction exceeded ``PDF_TIMEOUT``
+        pypdf.errors.PdfReadError: The file is not a readable PDF
+    """
+    if _size(fileobj) > settings.PDF_MAX_BYTES:
+        raise PDFTooLargeError(f"PDF is larger than {settings.PDF_MAX_BYTES} bytes")
+    if not _size(fileobj):
+        return ""
+
+    with _open_stream(fileobj) as stream:
+        key = f"pdf:text:{_sha256(stream)}"
+        text = cache.get(key)
+        if text is not None:
+            cache_hits.inc()
+            return text
+
+        started = time.perf_counter()
+        if settings.PDF_WORKERS:
+            page_count = len(PdfReader(stream).pages)
+            if page_count > settings.PDF_MAX_PAGES:
+                raise PDFTooLargeError(
+                    f"PDF has more than {settings.PDF_MAX_PAGES} pages"
+                )
+            stream.seek(0)
+            text = get_pool().extract(stream.read(), page_count)
+        else:
+            text = extract_pdf_text(stream)
+        extraction_seconds.observe(time.perf_counter() - started)
+
+    cache.set(key, text, timeout=settings.PDF_CACHE_TTL)
+    return text
@@ -0,0 +1,336 @@
+"""
+Materialized per-profile recommendations for JobSikari.
+
+The dashboard serves the top jobs and resources of a profile from the
+``UserRecommendation`` table instead of ranking the whole catalog on every
+request. Rows are refreshed incrementally from ``users.signals``: right
+away when a profile's skills change, and after the commit on a small thread
+pool when catalog items or their skills change. The table can be rebuilt in
+bulk with ``python manage.py rebuild_recommendations``.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, Q
+
+from jobs.models import Job
+from resources.models import LearningResource
+from sikari.caching import bump_version, user_version
+from users.matching import calculate_skill_overlap, catalog_index, rank_items
+from users.models import UserProfile, UserRecommendation
+
+logger = logging.getLogger(__name__)
+
+# Number of stored recommendations per profile and kind
+RECOMMENDATIONS_PER_KIND = 5
+
+CATALOGS = {
+    UserRecommendation.Kind.JOB: (Job, "required_skills", "job"),
+    UserRecommendation.Kind.RESOURCE: (LearningResource, "related_skills", "resource"),
+}
+
+
+def build_indexes(kinds=tuple(CATALOGS)) -> dict:
+    """Get the SkillIndex of the full catalog of each kind."""
+    return {
+        kind: catalog_index(CATALOGS[kind][0].objects.all(), CATALOGS[kind][1])
+        for kind in kinds
+    }
+
+
+def refresh_recommendations(profiles, kinds=tuple(CATALOGS), indexes=None) -> int:
+    """
+    Recompute the stored recommendations of the given profiles.
+
+    Each catalog index is built once and reused for every profile. The
+    profile rows are locked while their skills are read and their rows
+    rewritten, so a request and the refresh pool updating the same profile
+    write one after the other, each from the skills it sees.
+
+    Args:
+        profiles: UserProfile, or iterable of UserProfile objects
+        kinds: UserRecommendation kinds to refresh
+        indexes: Prebuilt indexes from ``build_indexes``, built when omitted
+
+    Returns:
+        Number of recommendation rows written
+    """
+    if isinstance(profiles, UserProfile):
+        profiles = [profiles]
+    profiles = list(profiles)
+    if not profiles:
+        return 0
+    if indexes is None:
+        indexes = build_indexes(kinds)
+
+    with transaction.atomic():
+        profile_ids = list(
+            UserProfile.objects.select_for_update()
+            .filter(pk__in=[profile.pk for profile in profiles])
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        skills = defaultdict(dict)
+        for profile_id, skill_id, name in UserProfile.skills.through.objects.filter(
+            userprofile_id__in=profile_ids
+        ).values_list("userprofile_id", "skill_id", "skill__name"):
+            skills[profile_id][skill_id] = name
+
+        rows = []
+        for profile_id in profile_ids:
+            for kind in kinds:
+                rows.extend(
+                    _recommendation_rows(
+                        profile_id, skills[profile_id], kind, indexes[kind]
+                    )
+                )
+        UserRecommendation.objects.filter(
+            profile__in=profile_ids, kind__in=kinds
+        ).delete()
+        UserRecommendation.objects.bulk_create(rows)
+    # Dashboards cached from the old rows are stale once the new ones commit
+    user_ids = {profile.user_id for profile in profiles}
+    transaction.on_commit(partial(_bump_users, user_ids))
+    return len(rows)
+
+
+def _bump_users(user_ids) -> None:
+    for user_id in user_ids:
+        bump_version(user_version(user_id))
+
+
+def _recommendation_rows(profile_id, skills, kind, index):
+    """Rank one profile against an index and yield unsaved rows."""
+    item_field = CATALOGS[kind][2]
+    ranked = rank_items(index, skills.keys(), RECOMMENDATIONS_PER_KIND)
+    for rank, (item_id, match_score, matching_ids) in enumerate(ranked):
+        yield UserRecommendation(
+            profile_id=profile_id,
+            kind=kind,
+            rank=rank,
+            match_score=match_score,
+            matching_skills=[skills[s] for s in matching_ids],
+            **{f"{item_field}_id": item_id},
+        )
+
+
+def _rank_key(score, matching, skilled, position):
+    """Sort key of an item in the order of ``rank_items``, best first."""
+    if not skilled:
+        return (1, 0, 0, position)
+    if not matching:
+        return (3, 0, 0, position)
+    tier = 0 if score >= calculate_skill_overlap(set(), set()) else 2
+    return (tier, -score, -matching, position)
+
+
+def refresh_for_items(kind, item_ids) -> int:
+    """
+    Refresh the profiles whose recommendations may change with catalog items.
+
+    A profile is affected when it currently stores one of the items, stores
+    fewer than ``RECOMMENDATIONS_PER_KIND`` rows, or one of the items now
+    ranks above its last stored row in the order of ``rank_items``: by score,
+    then number of matching skills, then catalog position, with items
+    requiring no skill right after those scoring the baseline or more. Items
+    are scored for the profiles sharing a skill with them; for every other
+    profile they rank as unskilled or non-matching, which only beats last
+    rows scoring the baseline or less. Profiles without stored rows are left
+    to ``stored_recommendations``.
+
+    Args:
+        kind: UserRecommendation kind of the changed items
+        item_ids: Ids of the changed Job or LearningResource objects, deleted
+            ones included
+
+    Returns:
+        Number of recommendation rows written
+    """
+    item_field = CATALOGS[kind][2]
+    index = build_indexes((kind,))[kind]
+    items = {
+        item_id: set(index.item_skills.get(item_id, ()))
+        for item_id in item_ids
+        if item_id in index.position
+    }
+
+    stored = UserProfile.objects.annotate(
+        stored=Count("recommendations", filter=Q(recommendations__kind=kind))
+    ).filter(stored__gt=0)
+    affected = set(
+        UserRecommendation.objects.filter(
+            kind=kind, **{f"{item_field}_id__in": item_ids}
+        ).values_list("profile_id", flat=True)
+    )
+    affected.update(
+        stored.filter(stored__lt=RECOMMENDATIONS_PER_KIND).values_list("pk", flat=True)
+    )
+    if not items:
+        return refresh_recommendations(
+            UserProfile.objects.filter(pk__in=affected), kinds=(kind,)
+        )
+
+    last_rows = UserRecommendation.objects.filter(
+        kind=kind, rank=RECOMMENDATIONS_PER_KIND - 1
+    ).values_list("profile_id", "match_score", "matching_skills", f"{item_field}_id")
+
+    def beaten(best, score, matching_skills, last_id):
+        position = index.position.get(last_id)
+        if position is None:
+            return True
+        skilled = bool(index.skill_counts[last_id])
+        return best < _rank_key(score, len(matching_skills), skilled, position)
+
+    shared = defaultdict(set)
+    for profile_id, skill_id in UserProfile.skills.through.objects.filter(
+        skill_id__in=set().union(*items.values())
+    ).values_list("userprofile_id", "skill_id"):
+        shared[profile_id].add(skill_id)
+    for profile_id, *last in last_rows.filter(profile_id__in=shared.keys() - affected):
+        skill_ids = shared[profile_id]
+        best = min(
+            _rank_key(
+                calculate_skill_overlap(skill_ids, skills),
+                len(skill_ids & skills),
+                bool(skills),
+                index.position[item_id],
+            )
+            for item_id, skills in items.items()
+        )
+        if beaten(best, *last):
+            affected.add(profile_id)
+
+    # Profiles sharing no skill with the items
+    best = min(
+        _rank_key(0.0, 0, bool(skills), index.position[item_id])
+        for item_id, skills in items.items()
+    )
+    baseline = calculate_skill_overlap(set(), set())
+    candidates = last_rows.filter(match_score__lte=baseline if best[0] == 1 else 0.0)
+    for profile_id, *last in candidates:
+        if profile_id in shared or profile_id in affected:
+            continue
+        if beaten(best, *last):
+            affected.add(profile_id)
+
+    profiles = UserProfile.objects.filter(pk__in=affected)
+    return refresh_recommendations(profiles, kinds=(kind,))
+
+
+def _refresh_pending(pending: dict, pooled: bool) -> None:
+    if pooled:
+        close_old_connections()
+    try:
+        for kind, item_ids in pending.items():
+            refresh_for_items(kind, item_ids)
+    except Exception:
+        logger.warning("Refreshing recommendations failed", exc_info=True)
+    finally:
+        if pooled:
+            close_old_connections()
+
+
+_pending = threading.local()
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _flush_pending() -> None:
+    global _executor
+    pending = _pending.__dict__.pop("items", None)
+    if not pending:
+        return
+    if not settings.RECOMMENDATION_WORKERS:
+        _refresh_pending(pending, pooled=False)
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.RECOMMENDATION_WORKERS,
+                thread_name_prefix="recommendations",
+            )
+    _executor.submit(_refresh_pending, pending, pooled=True)
+
+
+def schedule_refresh(kind, item_ids) -> None:
+    """
+    Run ``refresh_for_items`` once the current transaction commits.
+
+    Items changed in the same transaction (a job created, then given its
+    skills) are refreshed together in one pass, on the pool when
+    ``RECOMMENDATION_WORKERS`` is set, or inline after the commit when it is 0.
+    Items of a transaction that rolls back stay pending and are refreshed
+    with the thread's next batch.
+    """
+    items = _pending.__dict__.setdefault("items", defaultdict(set))
+    items[kind].update(item_ids)
+    transaction.on_commit(_flush_pending)
+
+
+def rebuild_recommendations(batch_size: int = 500) -> int:
+    """
+    Rebuild the whole recommendation table in batches of profiles.
+
+    The table is rebuilt in one transaction, so readers keep seeing the old
+    rows until it commits.
+
+    Args:
+        batch_size: Number of profiles refreshed per bulk write
+
+    Returns:
+        Number of recommendation rows written
+    """
+    indexes = build_indexes()
+    profiles = UserProfile.objects.order_by("pk")
+
+    written = 0
+    batch = []
+    with transaction.atomic():
+        UserRecommendation.objects.all().delete()
+        for profile in profiles.iterator(chunk_size=batch_size):
+            batch.append(profile)
+            if len(batch) >= batch_size:
+                written += refresh_recommendations(batch, indexes=indexes)
+                batch = []
+        written += refresh_recommendations(batch, indexes=indexes)
+    return written
+
+
+def stored_recommendations(profile) -> dict:
+    """
+    Load a profile's stored recommendations, computing them on first use.
+
+    Args:
+        profile: UserProfile instance
+
+    Returns:
+        Dict mapping each kind to a list of match dictionaries shaped like
+        the hydrated ``JobMatch``/``ResourceMatch`` results of
+        ``users.matching`` (item object, match_score, matching_skills)
+    """
+    rows = list(
+        profile.recommendations.select_related("job", "resource").prefetch_related(
+            "job__required_skills", "resource__related_skills"
+        )
+    )
+    missing = [kind for kind in CATALOGS if all(row.kind != kind for row in rows)]
+    if missing and refresh_recommendations(profile, kinds=missing):
+        return stored_recommendations(profile)
+
+    results = {kind: [] for kind in CATALOGS}
+    for row in rows:
+        item_field = CATALOGS[row.kind][2]
+        results[row.kind].append(
+            {
+                item_field: getattr(row, item_field),
+                "match_score": row.match_score,
+                "matching_skills": row.matching_skills,
+            }
+        )
+    return results
@@ -0,0 +1,125 @@
+"""
+Process-local registry resolving skill names to Skill ids.
+
+Every gunicorn worker keeps name→id and slug→id maps of the whole skill
+table, so resolving the skills of a profile, job or resource costs no
+query for known skills and a single bulk insert for new ones. Workers stay
+coherent through the ``SKILLS`` version counter of ``sikari.caching``,
+bumped on every skill write; a worker reloads its maps when the counter
+differs from the one it loaded. Without a shared cache the counter cannot
+be read and the maps are reloaded on every call.
+"""
+
+import logging
+import threading
+from collections.abc import Iterable
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import Q
+from django.utils.text import slugify
+
+from sikari.caching import SKILLS, bump_version, version_key
+from users.models import Skill
+
+logger = logging.getLogger(__name__)
+
+
+class SkillRegistry:
+    """Name and slug to id maps of the Skill table."""
+
+    def __init__(self):
+        self.by_name: dict[str, int] = {}
+        self.by_slug: dict[str, int] = {}
+        self.version = None
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """Reload both maps from the database."""
+        key = version_key(SKILLS)
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key)
+        by_name, by_slug = {}, {}
+        for skill_id, name, slug in Skill.objects.values_list("id", "name", "slug"):
+            by_name[name.casefold()] = skill_id
+            if slug:
+                by_slug[slug] = skill_id
+        with self._lock:
+            self.by_name, self.by_slug, self.version = by_name, by_slug, version
+
+    def warm(self) -> None:
+        """Load the maps at startup, tolerating a database not yet migrated."""
+        try:
+            self.load()
+        except DatabaseError:
+            logger.warning("Skill registry not warmed", exc_info=True)
+
+    def sync(self) -> None:
+        """Reload the maps if another process changed the skill table."""
+        version = cache.get(version_key(SKILLS))
+        if version is None or version != self.version:
+            self.load()
+
+    def _bump(self) -> None:
+        """Bump the version after a write whose rows are added to the maps."""
+        loaded = self.version
+        bump_version(SKILLS)
+        # Keep the maps unless another process wrote skills since they loaded
+        if loaded is not None and cache.get(version_key(SKILLS)) == loaded + 1:
+            self.version = loaded + 1
+
+    def lookup(self, name: str) -> int | None:
+        """Id of the skill matching ``name`` by slug or case-insensitive name."""
+        slug = slugify(name)
+        skill_id = self.by_slug.get(slug) if slug else None
+        if skill_id is None:
+            skill_id = self.by_name.get(name.casefold())
+        return skill_id
+
+    def resolve_many(
+        self, names: Iterable[str], create_missing: bool = True
+    ) -> list[int]:
+        """
+        Resolve skill names to Skill ids.
+
+        Names are matched by slug first, so "Node JS" and "node-js" resolve to
+        the same skill, then case-insensitively by name.
+
+        Args:
+            names: Skill names as typed by the user; blanks are skipped
+            create_missing: Create skills that do not exist yet. Otherwise
+                unknown names are left out of the result.
+
+        Returns:
+            Skill ids in the order of ``names``, without duplicates
+        """
+        self.sync()
+        names = [name.strip() for name in names if name and name.strip()]
+        missing = [name for name in names if self.lookup(name) is None]
+
+        if missing:
+            if create_missing:
+                # bulk_create skips the BEFORE_CREATE hook, so set slugs here
+                Skill.objects.bulk_create(
+                    [Skill(name=name, slug=slugify(name)) for name in missing],
+                    ignore_conflicts=True,
+                )
+                self._bump()
+            found = Skill.objects.filter(
+                Q(slug__in=[slugify(name) for name in missing]) | Q(name__in=missing)
+            ).values_list("id", "name", "slug")
+            with self._lock:
+                for skill_id, name, slug in found:
+                    self.by_name[name.casefold()] = skill_id
+                    if slug:
+                        self.by_slug[slug] = skill_id
+
+        ids = []
+        for name in names:
+            skill_id = self.lookup(name)
+            if skill_id is not None and skill_id not in ids:
+                ids.append(skill_id)
+        return ids
+
+
+skill_registry = SkillRegistry()
@@ -1,7 +1,11 @@
-from typing import Optional
+import uuid
+from datetime import datetime
+from typing import Literal, Optional
 
 from ninja import Schema
 
+from . import images
+
 
 class ProjectSchema(Schema):
     title: str
@@ -11,7 +15,23 @@ class ProjectSchema(Schema):
 
 class ProjectOutSchema(ProjectSchema):
     id: int
+    # Full-resolution original, for viewing on demand
     image: str | None = None
+    thumbnail: str | None = None
+    srcset: str | None = None
+    avif_srcset: str | None = None
+
+    @staticmethod
+    def resolve_thumbnail(obj):
+        return images.thumbnail_url(obj)
+
+    @staticmethod
+    def resolve_srcset(obj):
+        return images.srcset(obj, "webp")
+
+    @staticmethod
+    def resolve_avif_srcset(obj):
+        return images.srcset(obj, "avif")
 
 
 class UserSchema(Schema):
@@ -62,3 +82,41 @@ class UpdateProfileSchema(Schema):
 
 class CVSchemaOut(Schema):
     file: str | None = None
+
+
+class TextifySchemaOut(Schema):
+    text: str
+
+
+class ExtractionJobSchemaOut(Schema):
+    id: uuid.UUID
+    status: str
+    text: str | None = None
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+
+class UploadIntentSchema(Schema):
+    target: Literal["roadmap", "project_image"]
+    filename: str
+    content_type: str
+    size: int
+    project_id: int | None = None
+
+
+class UploadIntentSchemaOut(Schema):
+    url: str
+    fields: dict[str, str]
+    key: str
+    token: str
+    expires_in: int
+
+
+class UploadConfirmSchema(Schema):
+    token: str
+
+
+class UploadConfirmSchemaOut(Schema):
+    key: str
+    url: str
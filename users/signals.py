@@ -0,0 +1,114 @@
+"""
+Signal receivers keeping derived user data up to date.
+
+Skill sets live in M2M fields, which ``django_lifecycle`` hooks do not
+observe, so changes are picked up through ``m2m_changed``. Catalog rows
+created without skills or deleted also affect rankings and are handled
+through ``post_save``/``post_delete``. Receivers refresh the materialized
+recommendations (after the commit for catalog changes) and bump the cache
+version counters of ``sikari.caching``.
+
+The catalog counter is bumped once the change commits: bumped earlier, a
+request could cache the old catalog under the new version. A user's counter
+is bumped by ``refresh_recommendations`` once their stored rows are written.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from jobs.models import Job
+from resources.models import LearningResource
+from sikari.caching import CATALOG, bump_version, user_version
+from users import recommendations
+from users.models import User, UserProfile, UserRecommendation
+
+CATALOG_KINDS = {
+    Job: UserRecommendation.Kind.JOB,
+    LearningResource: UserRecommendation.Kind.RESOURCE,
+}
+
+
+def _changed_pks(instance, action, reverse, pk_set, model, field_name):
+    """
+    Return the ids on the other side of a reverse M2M change.
+
+    ``clear()`` does not report which rows it removes, so they are captured
+    on ``pre_clear`` and handed over to ``post_clear``.
+    """
+    if action == "pre_clear" and reverse:
+        instance._skill_clear_pks = set(
+            model.objects.filter(**{field_name: instance}).values_list("pk", flat=True)
+        )
+    if action == "post_clear":
+        return instance.__dict__.pop("_skill_clear_pks", set())
+    return pk_set or set()
+
+
+@receiver(m2m_changed, sender=UserProfile.skills.through)
+def profile_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    pks = _changed_pks(instance, action, reverse, pk_set, UserProfile, "skills")
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # skill.user_profiles.add(...): the changed ids are profiles
+        profiles = UserProfile.objects.filter(pk__in=pks)
+        recommendations.refresh_recommendations(profiles)
+    else:
+        recommendations.refresh_recommendations(instance)
+
+
+@receiver(m2m_changed, sender=UserProfile.preferred_careers.through)
+def profile_careers_changed(sender, instance, action, reverse, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear") and not reverse:
+        bump_version(user_version(instance.user_id))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    bump_version(user_version(instance.pk))
+
+
+def _bump_catalog() -> None:
+    transaction.on_commit(partial(bump_version, CATALOG))
+
+
+@receiver(m2m_changed, sender=Job.required_skills.through)
+def job_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    pks = _changed_pks(instance, action, reverse, pk_set, Job, "required_skills")
+    _catalog_skills_changed(Job, instance, action, reverse, pks)
+
+
+@receiver(m2m_changed, sender=LearningResource.related_skills.through)
+def resource_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    pks = _changed_pks(
+        instance, action, reverse, pk_set, LearningResource, "related_skills"
+    )
+    _catalog_skills_changed(LearningResource, instance, action, reverse, pks)
+
+
+def _catalog_skills_changed(model, instance, action, reverse, pks):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    _bump_catalog()
+    # skill.jobs.add(...) reports the changed catalog items as pks
+    item_ids = pks if reverse else [instance.pk]
+    recommendations.schedule_refresh(CATALOG_KINDS[model], item_ids)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=LearningResource)
+def catalog_item_saved(sender, instance, created, **kwargs):
+    _bump_catalog()
+    if created:
+        recommendations.schedule_refresh(CATALOG_KINDS[sender], [instance.pk])
+
+
+@receiver(post_delete, sender=Job)
+@receiver(post_delete, sender=LearningResource)
+def catalog_item_deleted(sender, instance, **kwargs):
+    _bump_catalog()
+    # Stored rows for the item are gone by cascade; refill affected profiles
+    recommendations.schedule_refresh(CATALOG_KINDS[sender], [instance.pk])
@@ -0,0 +1,81 @@
+import json
+
+from django.db import connection
+from django.db.models.signals import m2m_changed
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from ninja_jwt.tokens import AccessToken
+
+from users.bulk import add_m2m, resolve_careers, sync_m2m
+from users.models import Careers, Skill, User, UserProfile
+
+
+class BulkM2MTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.profile = UserProfile.objects.create(user=self.user, fullname="Test User")
+        self.skills = [Skill.objects.create(name=f"Skill {i}") for i in range(4)]
+        self.profile.skills.set(self.skills[:2])
+
+    def test_sync_only_writes_the_difference(self):
+        ids = [s.id for s in self.skills]
+        added, removed = sync_m2m(self.profile, "skills", ids[1:])
+        self.assertEqual(added, set(ids[2:]))
+        self.assertEqual(removed, {ids[0]})
+        self.assertCountEqual(self.profile.skills.values_list("id", flat=True), ids[1:])
+
+    def test_sends_m2m_changed(self):
+        actions = []
+
+        def receiver(sender, action, pk_set, **kwargs):
+            actions.append((action, pk_set))
+
+        m2m_changed.connect(receiver, sender=UserProfile.skills.through)
+        self.addCleanup(m2m_changed.disconnect, receiver, UserProfile.skills.through)
+
+        add_m2m(self.profile, "skills", [self.skills[0].id, self.skills[3].id])
+        self.assertEqual(
+            actions,
+            [("pre_add", {self.skills[3].id}), ("post_add", {self.skills[3].id})],
+        )
+
+        # Nothing to write, nothing sent
+        actions.clear()
+        add_m2m(self.profile, "skills", [self.skills[0].id])
+        self.assertEqual(actions, [])
+
+    def test_resolve_careers(self):
+        existing = Careers.objects.create(title="Data Scientist", description="")
+        ids = resolve_careers(
+            ["Data Scientist", " Web Developer ", "", "Web Developer"]
+        )
+        web = Careers.objects.get(title="Web Developer")
+        self.assertEqual(ids, [existing.id, web.id])
+
+
+class ProfileUpdateQueryCountTests(TestCase):
+    def update(self, email, skills, careers):
+        user = User.objects.create_user(email=email, password="testpass123")
+        UserProfile.objects.create(user=user, fullname="Test User")
+        token = AccessToken.for_user(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/profile",
+                json.dumps({"skills": skills, "preferred_careers": careers}),
+                content_type="application/json",
+                HTTP_AUTHORIZATION=f"Bearer {token}",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["skills"]), len(skills))
+        return len(queries)
+
+    def test_query_count_independent_of_skill_count(self):
+        small = self.update("a@example.com", [f"Small {i}" for i in range(5)], ["A"])
+        large = self.update(
+            "b@example.com",
+            [f"Large {i}" for i in range(50)],
+            [f"Career {i}" for i in range(10)],
+        )
+        self.assertEqual(small, large)
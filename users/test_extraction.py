@@ -0,0 +1,89 @@
+import io
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from ninja_jwt.tokens import AccessToken
+
+from users.extraction import MAX_ATTEMPTS, claim_next, run_job
+from users.models import ExtractionJob, User, UserProfile
+from users.test_pdf import make_pdf
+
+
+@override_settings(PDF_WORKERS=0)
+class ExtractionQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.profile = UserProfile.objects.create(user=self.user, fullname="Test User")
+        token = AccessToken.for_user(self.user)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def upload(self, data):
+        return self.client.post(
+            "/api/pdf/textify?background=true",
+            {"file": SimpleUploadedFile("cv.pdf", data)},
+            **self.auth,
+        )
+
+    def poll(self, job_id):
+        return self.client.get(f"/api/pdf/textify/{job_id}", **self.auth)
+
+    def test_queued_extraction(self):
+        response = self.upload(make_pdf(["Jane Doe", "Django"]))
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["id"]
+        self.assertEqual(self.poll(job_id).json()["status"], "pending")
+
+        out = io.StringIO()
+        call_command("run_extraction_worker", "--once", stdout=out)
+        self.assertIn("Processed 1 jobs", out.getvalue())
+
+        body = self.poll(job_id).json()
+        self.assertEqual(body["status"], "done")
+        self.assertEqual(body["text"], "Jane Doe\nDjango")
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.cv_full, "Jane Doe\nDjango")
+        self.assertEqual(bytes(ExtractionJob.objects.get(pk=job_id).payload), b"")
+
+    def test_invalid_pdf_fails_job(self):
+        job_id = self.upload(b"not a pdf").json()["id"]
+        with self.assertLogs(level="WARNING"):
+            run_job(claim_next())
+        body = self.poll(job_id).json()
+        self.assertEqual(body["status"], "failed")
+        self.assertTrue(body["error"])
+
+    @override_settings(PDF_MAX_BYTES=10)
+    def test_size_cap(self):
+        self.assertEqual(self.upload(make_pdf(["Jane Doe"])).status_code, 413)
+        self.assertFalse(ExtractionJob.objects.exists())
+
+    def test_other_users_job_not_found(self):
+        job = ExtractionJob.objects.create(
+            user=User.objects.create_user(email="other@example.com", password="x"),
+            payload=b"",
+        )
+        self.assertEqual(self.poll(job.pk).status_code, 404)
+
+    def test_job_claimed_once(self):
+        job = ExtractionJob.objects.create(user=self.user, payload=b"")
+        self.assertEqual(claim_next().pk, job.pk)
+        self.assertIsNone(claim_next())
+
+    def test_stale_job_reclaimed_until_exhausted(self):
+        job = ExtractionJob.objects.create(user=self.user, payload=b"")
+        claim_next()
+        long_ago = timezone.now() - timedelta(hours=1)
+        ExtractionJob.objects.filter(pk=job.pk).update(started_at=long_ago)
+        self.assertEqual(claim_next(stale_after=60).attempts, 2)
+
+        ExtractionJob.objects.filter(pk=job.pk).update(
+            started_at=long_ago, attempts=MAX_ATTEMPTS
+        )
+        self.assertIsNone(claim_next(stale_after=60))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExtractionJob.Status.FAILED)
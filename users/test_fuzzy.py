@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase, TestCase
+
+from users.fuzzy import TrigramIndex, fuzzy_skill_ids, trigrams, word_similarity
+from users.models import Skill
+
+
+class TrigramTests(SimpleTestCase):
+    def test_trigrams_match_pg_trgm(self):
+        self.assertEqual(trigrams("Cat"), {"  c", " ca", "cat", "at "})
+        self.assertEqual(trigrams("a-b"), {"  a", " a ", "  b", " b "})
+
+    def test_word_similarity(self):
+        self.assertEqual(word_similarity("python", "Python"), 1.0)
+        self.assertGreater(word_similarity("Djnago", "Django"), 0.4)
+        self.assertEqual(word_similarity("dhaka", "Dhaka, Bangladesh"), 1.0)
+        self.assertEqual(word_similarity("", "Django"), 0.0)
+
+    def test_index_search(self):
+        index = TrigramIndex([(1, "JavaScript"), (2, "Java"), (3, "Python"), (4, None)])
+        self.assertEqual(index.search("java", 1.0), [2])
+        self.assertEqual(index.search("pyhton"), [3])
+        # Most similar first
+        self.assertEqual(index.search("javascrpt"), [1, 2])
+        self.assertEqual(index.search("rust"), [])
+
+
+class FuzzySkillTests(TestCase):
+    def test_resolves_misspelled_skills(self):
+        django = Skill.objects.create(name="Django")
+        Skill.objects.create(name="Go")
+        self.assertEqual(fuzzy_skill_ids("Djnago"), [django.id])
+        self.assertEqual(fuzzy_skill_ids("Djnago", threshold=0.9), [])
@@ -0,0 +1,103 @@
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import check_password as django_check_password
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from users import hashing
+from users.hashing import HashingOverloaded, HashingPool
+from users.models import User
+
+
+class HashingPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = HashingPool(workers=1, max_pending=1, timeout=5)
+        self.addCleanup(self.pool._executor.shutdown)
+
+    def test_admission_control(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        busy = self.pool.submit(release.wait)
+        rejected = hashing.rejected.value
+        with self.assertRaises(HashingOverloaded):
+            self.pool.run(str, "refused")
+        self.assertEqual(hashing.rejected.value, rejected + 1)
+
+        release.set()
+        busy.result()
+        self.assertEqual(self.pool.run(str, "admitted"), "admitted")
+
+    def test_timeout(self):
+        self.pool.timeout = 0.01
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with self.assertRaises(HashingOverloaded):
+            self.pool.run(release.wait)
+
+    def test_async(self):
+        self.assertEqual(async_to_sync(self.pool.arun)(str, 42), "42")
+
+    def test_async_admission_control(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.pool.submit(release.wait)
+        with self.assertRaises(HashingOverloaded):
+            async_to_sync(self.pool.arun)(str, "refused")
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class UserPasswordTests(TestCase):
+    def test_passwords_hashed_on_pool(self):
+        hashes = hashing.hash_seconds.count
+        user = User.objects.create_user(email="test@example.com", password="s3cret!!")
+        self.assertTrue(django_check_password("s3cret!!", user.password))
+        self.assertTrue(user.check_password("s3cret!!"))
+        self.assertFalse(user.check_password("wrong"))
+        self.assertTrue(async_to_sync(user.acheck_password)("s3cret!!"))
+        self.assertEqual(hashing.hash_seconds.count, hashes + 4)
+
+    def test_async_check_does_not_hold_a_thread(self):
+        user = User.objects.create_user(email="test@example.com", password="s3cret!!")
+        with mock.patch("users.models.hashing.check_password") as check_password:
+            self.assertTrue(async_to_sync(user.acheck_password)("s3cret!!"))
+        check_password.assert_not_called()
+
+    def test_outdated_hash_upgraded(self):
+        user = User.objects.create_user(email="test@example.com", password="x")
+        with override_settings(
+            PASSWORD_HASHERS=[
+                "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+                "django.contrib.auth.hashers.MD5PasswordHasher",
+            ]
+        ):
+            self.assertTrue(user.check_password("x"))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha1$"))
+
+    def test_login(self):
+        User.objects.create_user(email="test@example.com", password="s3cret!!")
+        response = self.client.post(
+            "/api/token/pair",
+            {"email": "test@example.com", "password": "s3cret!!"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json())
+
+    def test_overloaded_register_returns_503(self):
+        with mock.patch.object(
+            HashingPool, "submit", side_effect=HashingOverloaded("busy")
+        ):
+            response = self.client.post(
+                "/api/register",
+                {
+                    "fullname": "Jane Doe",
+                    "email": "jane@example.com",
+                    "password": "s3cret!!",
+                },
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(User.objects.exists())
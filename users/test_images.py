@@ -0,0 +1,107 @@
+import io
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from ninja_jwt.tokens import AccessToken
+from PIL import Image
+
+from users.images import WIDTHS, derivative_name, render_derivatives
+from users.models import Project, User, UserProfile
+
+
+def make_image(width, height, fmt="PNG", mode="RGB") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), "steelblue").save(buffer, fmt)
+    return buffer.getvalue()
+
+
+class RenderDerivativesTests(SimpleTestCase):
+    def test_widths_and_formats(self):
+        rendered = render_derivatives(make_image(1000, 500))
+        self.assertEqual(
+            [(width, fmt) for width, fmt, _ in rendered],
+            [(320, "webp"), (320, "avif"), (640, "webp"), (640, "avif")],
+        )
+        with Image.open(io.BytesIO(rendered[0][2])) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (320, 160))
+
+    def test_small_image_not_upscaled(self):
+        rendered = render_derivatives(make_image(200, 100, mode="P"))
+        self.assertEqual({width for width, _, _ in rendered}, {200})
+
+    def test_derivative_name(self):
+        self.assertEqual(
+            derivative_name("project_images/shot.png", 320, "webp"),
+            "project_images/shot_320w.webp",
+        )
+
+
+class ProjectDerivativesTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        storages = {
+            "default": {
+                "BACKEND": "django.core.files.storage.FileSystemStorage",
+                "OPTIONS": {"location": media, "base_url": "/media/"},
+            },
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+        settings = override_settings(STORAGES=storages, IMAGE_WORKERS=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123", username="tester"
+        )
+        UserProfile.objects.create(user=self.user, fullname="Test User")
+        token = AccessToken.for_user(self.user)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def add_project(self, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/add_project",
+                {
+                    "title": "Portfolio",
+                    "description": "Site",
+                    "file": SimpleUploadedFile("shot.png", data),
+                },
+                **self.auth,
+            )
+        return Project.objects.get(pk=response.json()["project_id"])
+
+    def test_upload_renders_derivatives(self):
+        project = self.add_project(make_image(WIDTHS[-1] * 2, 400))
+        self.assertEqual(len(project.derivatives), len(WIDTHS) * 2)
+        for derivative in project.derivatives:
+            self.assertTrue(project.image.storage.exists(derivative["name"]))
+
+        body = self.client.get("/api/users/tester").json()["projects"][0]
+        self.assertTrue(body["image"].endswith(".png"))
+        self.assertTrue(body["thumbnail"].endswith("_320w.webp"))
+        self.assertEqual(body["srcset"].count("w,"), len(WIDTHS) - 1)
+        self.assertIn("_1280w.avif 1280w", body["avif_srcset"])
+
+    def test_replacing_image_drops_old_derivatives(self):
+        project = self.add_project(make_image(800, 400))
+        stale = [derivative["name"] for derivative in project.derivatives]
+
+        project.image = SimpleUploadedFile("other.png", make_image(500, 250))
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        project.refresh_from_db()
+        self.assertEqual({d["width"] for d in project.derivatives}, {320})
+        for name in stale:
+            self.assertFalse(project.image.storage.exists(name))
+
+    def test_invalid_image_keeps_upload(self):
+        with self.assertLogs("users.images", "WARNING"):
+            project = self.add_project(b"not an image")
+        self.assertEqual(project.derivatives, [])
+        self.assertTrue(project.image)
@@ -2,15 +2,28 @@
 Tests for matching logic and dashboard API endpoints.
 """
 
+from unittest import mock
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from ninja_jwt.tokens import AccessToken
 
 from jobs.models import Job
 from resources.models import LearningResource
+from users import cache as dashboard_cache
+from users import matching, recommendations
 from users.matching import (
+    SkillIndex,
     calculate_skill_overlap,
+    catalog_index,
     match_jobs_for_user,
+    match_jobs_for_users,
     match_resources_for_user,
+    skill_weights,
+    top_k,
+    weighted_skill_overlap,
 )
 from users.models import Skill, UserProfile
 
@@ -56,6 +69,110 @@ class SkillOverlapTests(TestCase):
         self.assertEqual(overlap, 0.0)
 
 
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    RECOMMENDATION_WORKERS=0,
+)
+class IDFScoringTests(TransactionTestCase):
+    """Tests for IDF-weighted scoring."""
+
+    def setUp(self):
+        """Create a catalog where Git is common and Spring Boot is rare."""
+        cache.clear()
+        self.git = Skill.objects.create(name="Git")
+        self.spring = Skill.objects.create(name="Spring Boot")
+        self.java = Skill.objects.create(name="Java")
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.profile = UserProfile.objects.create(user=self.user, fullname="Test User")
+
+        self.git_job = Job.objects.create(title="Git Job", company="A")
+        self.git_job.required_skills.set([self.git, self.java])
+        self.spring_job = Job.objects.create(title="Spring Job", company="B")
+        self.spring_job.required_skills.set([self.spring, self.java])
+        for i in range(3):
+            job = Job.objects.create(title=f"Other {i}", company="C")
+            job.required_skills.set([self.git])
+
+    def test_weighted_overlap(self):
+        """Weights scale each skill's contribution."""
+        weights = {1: 3.0, 2: 1.0}
+        self.assertEqual(weighted_skill_overlap({1}, {1, 2}, weights), 0.75)
+        self.assertEqual(weighted_skill_overlap(set(), {1, 2}, weights), 0.0)
+        self.assertEqual(weighted_skill_overlap({1}, set(), weights), 0.5)
+
+    def test_idf_breaks_overlap_ties(self):
+        """Matching a rare skill outranks matching a common one."""
+        self.profile.skills.set([self.git, self.spring])
+        jobs = Job.objects.filter(pk__in=[self.git_job.pk, self.spring_job.pk])
+
+        overlap = match_jobs_for_user(self.profile, jobs)
+        self.assertEqual(overlap[0]["match_score"], overlap[1]["match_score"])
+        self.assertEqual(overlap[0]["job_id"], self.git_job.id)
+
+        idf = match_jobs_for_user(self.profile, jobs, scoring="idf")
+        self.assertEqual(idf[0]["job_id"], self.spring_job.id)
+        self.assertGreater(idf[0]["match_score"], idf[1]["match_score"])
+
+    def test_weights_cached_and_invalidated(self):
+        """The IDF table is cached until the catalog changes."""
+        weights = skill_weights(Job, "required_skills")
+        self.assertGreater(weights[self.spring.id], weights[self.git.id])
+
+        with self.assertNumQueries(0):
+            skill_weights(Job, "required_skills")
+
+        self.git_job.required_skills.remove(self.git)
+        with self.assertNumQueries(2):
+            skill_weights(Job, "required_skills")
+
+    def test_weights_computed_before_a_change_are_not_served(self):
+        """A table racing a catalog change is stored under the old version."""
+        # Computed from the catalog before the change, stored after it
+        with mock.patch.object(matching.cache, "set") as deferred_set:
+            skill_weights(Job, "required_skills")
+        self.spring_job.required_skills.remove(self.spring)
+        cache.set(*deferred_set.call_args.args, **deferred_set.call_args.kwargs)
+
+        self.assertNotIn(self.spring.id, skill_weights(Job, "required_skills"))
+
+    def test_weights_not_cached_inside_transactions(self):
+        """Uncommitted catalog changes never reach the shared cache."""
+        with transaction.atomic():
+            self.spring_job.required_skills.remove(self.spring)
+            self.assertNotIn(self.spring.id, skill_weights(Job, "required_skills"))
+            transaction.set_rollback(True)
+
+        self.assertIn(self.spring.id, skill_weights(Job, "required_skills"))
+
+    def test_unknown_scoring_mode(self):
+        """Unknown scoring modes are rejected."""
+        with self.assertRaises(ValueError):
+            match_jobs_for_user(self.profile, Job.objects.all(), scoring="bm25")
+
+
+class TopKTests(TestCase):
+    """Tests for bounded top-k selection."""
+
+    def test_top_k_orders_and_breaks_ties_by_position(self):
+        """Higher scores win, then more matching skills, then earlier items."""
+        entries = [
+            (0.5, 1, 0, "a"),
+            (1.0, 1, 1, "b"),
+            (1.0, 3, 2, "c"),
+            (0.5, 1, 3, "d"),
+            (1.0, 1, 4, "e"),
+        ]
+        selected = top_k(iter(entries), 4)
+        self.assertEqual([e[3] for e in selected], ["c", "b", "e", "a"])
+
+    def test_top_k_zero(self):
+        """A zero limit selects nothing."""
+        self.assertEqual(top_k(iter([(1.0, 1, 0, "a")]), 0), [])
+
+
 class JobMatchingTests(TestCase):
     """Tests for job matching logic."""
 
@@ -133,6 +250,85 @@ class JobMatchingTests(TestCase):
         for match in matches:
             self.assertEqual(match["match_score"], 0.0)
 
+    def test_match_jobs_unskilled_job_baseline(self):
+        """Jobs without required skills rank at the 0.5 baseline."""
+        open_job = Job.objects.create(
+            title="Generalist", company="Any Co", job_type="Full-time"
+        )
+        self.job2.required_skills.set([self.python, self.javascript, self.react])
+
+        matches = match_jobs_for_user(self.profile, Job.objects.all(), limit=10)
+
+        self.assertEqual(
+            [m["job_id"] for m in matches],
+            [self.job1.id, open_job.id, self.job2.id, self.job3.id],
+        )
+        self.assertEqual(matches[1]["match_score"], 0.5)
+        self.assertEqual(matches[2]["matching_skills"], ["Python"])
+
+    def test_batch_matches_single_user_matches(self):
+        """Batch ranking gives each profile its single-user results."""
+        other = UserProfile.objects.create(
+            user=User.objects.create_user(
+                email="other@example.com", password="testpass123"
+            ),
+            fullname="Other User",
+        )
+        other.skills.set([self.react])
+
+        for workers in (1, 2):
+            results = list(
+                match_jobs_for_users(
+                    UserProfile.objects.order_by("pk"),
+                    Job.objects.all(),
+                    limit=2,
+                    workers=workers,
+                    chunk_size=1,
+                )
+            )
+            self.assertEqual([p for p, _ in results], [self.profile, other])
+            for profile, matches in results:
+                expected = match_jobs_for_user(profile, Job.objects.all(), limit=2)
+                for match in expected:
+                    del match["job"]
+                self.assertEqual(matches, expected)
+
+    def test_in_process_batches_do_not_share_state(self):
+        """Interleaved in-process batch runs each rank against their own jobs."""
+        other = UserProfile.objects.create(
+            user=User.objects.create_user(
+                email="other@example.com", password="testpass123"
+            ),
+            fullname="Other User",
+        )
+        other.skills.set(self.profile.skills.all())
+        profiles = UserProfile.objects.order_by("pk")
+        all_jobs = match_jobs_for_users(profiles, Job.objects.all(), chunk_size=1)
+        one_job = match_jobs_for_users(
+            profiles, Job.objects.filter(pk=self.job3.pk), chunk_size=1
+        )
+
+        _, first = next(all_jobs)
+        _, only = next(one_job)
+        _, second = next(all_jobs)
+
+        self.assertEqual([m["job_id"] for m in only], [self.job3.id])
+        self.assertEqual(second, first)
+        self.assertEqual(matching._batch_state, {})
+
+    def test_skill_index_postings(self):
+        """Index maps each skill to the jobs requiring it."""
+        index = SkillIndex.from_queryset(Job.objects.all(), "required_skills")
+
+        self.assertEqual(
+            sorted(index.postings[self.python.id]), [self.job1.id, self.job2.id]
+        )
+        self.assertEqual(index.skill_counts[self.job3.id], 2)
+        self.assertEqual(
+            index.overlap_counts({self.python.id, self.sql.id}),
+            {self.job1.id: 2, self.job2.id: 1},
+        )
+
 
 class ResourceMatchingTests(TestCase):
     """Tests for learning resource matching logic."""
@@ -232,3 +428,172 @@ class DashboardAPITests(TestCase):
         """Matching resources endpoint requires authentication."""
         response = self.client.get("/api/matching/resources")
         self.assertEqual(response.status_code, 401)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    RECOMMENDATION_WORKERS=0,
+)
+class CatalogIndexCacheTests(TransactionTestCase):
+    """The catalog index is kept per process until the catalog changes."""
+
+    def setUp(self):
+        cache.clear()
+        matching._indexes.clear()
+        self.addCleanup(matching._indexes.clear)
+        self.python = Skill.objects.create(name="Python")
+        self.job = Job.objects.create(title="Backend", company="Tech Corp")
+        self.job.required_skills.set([self.python])
+
+    def test_index_reused_until_catalog_changes(self):
+        index = catalog_index(Job.objects.all(), "required_skills")
+        with self.assertNumQueries(0):
+            self.assertIs(catalog_index(Job.objects.all(), "required_skills"), index)
+
+        other = Job.objects.create(title="Frontend", company="Tech Corp")
+        rebuilt = catalog_index(Job.objects.all(), "required_skills")
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual(rebuilt.item_ids, [self.job.id, other.id])
+
+    def test_filtered_querysets_get_their_own_index(self):
+        index = catalog_index(Job.objects.all(), "required_skills")
+        remote = catalog_index(Job.objects.filter(is_remote=True), "required_skills")
+        self.assertEqual(remote.item_ids, [])
+        self.assertIs(catalog_index(Job.objects.all(), "required_skills"), index)
+
+    def test_not_kept_inside_transactions(self):
+        with transaction.atomic():
+            index = catalog_index(Job.objects.all(), "required_skills")
+        self.assertIsNot(catalog_index(Job.objects.all(), "required_skills"), index)
+
+
+class MatchingQueryCountTests(TestCase):
+    """Recommendation endpoints run a fixed number of queries."""
+
+    def setUp(self):
+        """Create a catalog larger than the requested limits."""
+        skills = [Skill.objects.create(name=f"Skill {i}") for i in range(6)]
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.profile = UserProfile.objects.create(user=self.user, fullname="Test User")
+
+        for i in range(60):
+            job = Job.objects.create(
+                title=f"Job {i}", company="Tech Corp", job_type="Full-time"
+            )
+            job.required_skills.set(skills[i % 6 :])
+            resource = LearningResource.objects.create(
+                title=f"Resource {i}", url=f"https://example.com/{i}"
+            )
+            resource.related_skills.set(skills[: i % 6])
+        # Stores the profile's recommendations for the dashboard
+        self.profile.skills.set(skills[:3])
+
+        token = AccessToken.for_user(self.user)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def test_matching_jobs_query_count_independent_of_limit(self):
+        """Jobs are hydrated in bulk rather than re-fetched per match."""
+        for limit in (1, 50):
+            with self.assertNumQueries(7):
+                response = self.client.get(
+                    f"/api/matching/jobs?limit={limit}", **self.auth
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()), limit)
+
+    def test_dashboard_query_count(self):
+        """Dashboard runs a fixed number of queries."""
+        with self.assertNumQueries(7):
+            response = self.client.get("/api/dashboard", **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["recommended_jobs"]), 5)
+        self.assertEqual(len(response.json()["recommended_resources"]), 5)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    RECOMMENDATION_WORKERS=0,
+)
+class DashboardCacheTests(TestCase):
+    """Dashboard responses are cached per user and versioned."""
+
+    def setUp(self):
+        """Create a user with a matching job."""
+        cache.clear()
+        self.python = Skill.objects.create(name="Python")
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.profile = UserProfile.objects.create(user=self.user, fullname="Test User")
+        self.profile.skills.set([self.python])
+        self.job = Job.objects.create(title="Python Dev", company="Tech Corp")
+        self.job.required_skills.set([self.python])
+
+        token = AccessToken.for_user(self.user)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def get_dashboard(self):
+        response = self.client.get("/api/dashboard", **self.auth)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_repeated_load_is_served_from_cache(self):
+        """Only the JWT user lookup hits the database on a cache hit."""
+        hits = dashboard_cache.hits.value
+        first = self.get_dashboard()
+
+        with self.assertNumQueries(1):
+            second = self.get_dashboard()
+        self.assertEqual(first, second)
+        self.assertEqual(dashboard_cache.hits.value, hits + 1)
+
+        with self.settings(METRICS_TOKEN="s3cret"):
+            metrics = self.client.get(
+                "/api/metrics", headers={"Authorization": "Bearer s3cret"}
+            ).content.decode()
+        self.assertIn("dashboard_cache_hits_total", metrics)
+
+    def test_profile_and_catalog_changes_invalidate(self):
+        """User and catalog writes bump the versions the entry depends on."""
+        self.get_dashboard()
+
+        self.profile.fullname = "Renamed"
+        self.profile.save()
+        self.assertEqual(self.get_dashboard()["profile"]["fullname"], "Renamed")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = "Senior Python Dev"
+            self.job.save()
+        self.assertEqual(
+            self.get_dashboard()["recommended_jobs"][0]["job"]["title"],
+            "Senior Python Dev",
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.skills.clear()
+        self.assertEqual(self.get_dashboard()["profile"]["skills"], [])
+
+    def test_load_between_commit_and_refresh(self):
+        """A dashboard cached before the refresh is dropped once it writes."""
+        self.get_dashboard()
+        with self.captureOnCommitCallbacks() as callbacks:
+            better = Job.objects.create(title="Python Lead", company="Tech Corp")
+            self.job.required_skills.add(Skill.objects.create(name="Go"))
+            better.required_skills.set([self.python])
+
+        refresh = [c for c in callbacks if c is recommendations._flush_pending]
+        for callback in callbacks:
+            if callback not in refresh:
+                callback()
+        # The catalog version moved on, the stored rows did not yet
+        titles = [r["job"]["title"] for r in self.get_dashboard()["recommended_jobs"]]
+        self.assertEqual(titles, ["Python Dev"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for callback in refresh:
+                callback()
+        titles = [r["job"]["title"] for r in self.get_dashboard()["recommended_jobs"]]
+        self.assertEqual(titles, ["Python Lead", "Python Dev"])
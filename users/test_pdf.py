@@ -0,0 +1,183 @@
+import io
+import time
+from concurrent.futures import BrokenExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from ninja_jwt.tokens import AccessToken
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from users import pdf
+from users.models import User, UserProfile
+from users.pdf import (
+    ExtractionPool,
+    PDFExtractionTimeout,
+    PDFTooLargeError,
+    extract_cv_text,
+    extract_pdf_text,
+    iter_pdf_text,
+)
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def make_pdf(pages: list[str]) -> bytes:
+    """Build a PDF with one line of Helvetica text per page."""
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for text in pages:
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+class PDFExtractionTests(SimpleTestCase):
+    def setUp(self):
+        self.data = make_pdf(["Jane Doe", "Python Developer"])
+
+    def test_in_memory_upload(self):
+        upload = SimpleUploadedFile("cv.pdf", self.data)
+        self.assertEqual(list(iter_pdf_text(upload)), ["Jane Doe", "Python Developer"])
+
+    def test_spooled_upload_is_memory_mapped(self):
+        upload = TemporaryUploadedFile(
+            "cv.pdf", "application/pdf", len(self.data), None
+        )
+        upload.write(self.data)
+        upload.flush()
+        self.addCleanup(upload.close)
+        self.assertEqual(extract_pdf_text(upload), "Jane Doe\nPython Developer")
+
+    def test_caps(self):
+        with self.assertRaises(PDFTooLargeError):
+            extract_pdf_text(io.BytesIO(self.data), max_bytes=len(self.data) - 1)
+        with self.assertRaises(PDFTooLargeError):
+            extract_pdf_text(io.BytesIO(self.data), max_pages=1)
+
+    def test_empty_file(self):
+        self.assertEqual(extract_pdf_text(io.BytesIO()), "")
+
+
+class ExtractionPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = ExtractionPool(workers=2, timeout=60)
+        self.addCleanup(self.shutdown)
+
+    def shutdown(self):
+        if self.pool._executor is not None:
+            self.pool._executor.shutdown(cancel_futures=True)
+
+    def test_pages_split_across_workers(self):
+        pages = [f"Page {number}" for number in range(10)]
+        data = make_pdf(pages)
+        self.assertEqual(self.pool.extract(data, len(pages)), "\n".join(pages))
+
+    def test_timeout(self):
+        self.pool.timeout = 0
+        with self.assertRaises(PDFExtractionTimeout):
+            self.pool.extract(make_pdf(["Slow"] * 8), 8)
+        self.assertIsNone(self.pool._executor)
+
+    def test_retired_pool_terminates_stuck_workers(self):
+        executor = self.pool._get_executor()
+        stuck = executor.submit(time.sleep, 60)
+        executor.submit(int).result()
+        workers = list(executor._processes.values())
+        self.pool._retire(executor)
+        self.assertTrue(workers)
+        self.assertFalse(any(worker.is_alive() for worker in workers))
+        self.assertIsInstance(stuck.exception(timeout=5), BrokenExecutor)
+
+    def test_work_lost_to_another_timeout_is_retried(self):
+        self.pool.workers = 1
+        pages = [f"Page {number}" for number in range(12)]
+        real_wait = pdf.wait
+
+        def wait_after_timeout(futures, timeout):
+            # Another document timed out and retired the pool meanwhile
+            if self.pool._executor is not None and wait.call_count == 1:
+                self.pool._retire(self.pool._executor)
+            return real_wait(futures, timeout)
+
+        with mock.patch.object(pdf, "wait", side_effect=wait_after_timeout) as wait:
+            text = self.pool.extract(make_pdf(pages), len(pages))
+        self.assertEqual(text, "\n".join(pages))
+
+
+@override_settings(CACHES=LOCMEM, PDF_WORKERS=0)
+class ExtractionCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_same_bytes_served_from_cache(self):
+        data = make_pdf(["Jane Doe"])
+        self.assertEqual(extract_cv_text(io.BytesIO(data)), "Jane Doe")
+        hits = pdf.cache_hits.value
+        with mock.patch("users.pdf.extract_pdf_text") as extract:
+            self.assertEqual(extract_cv_text(io.BytesIO(data)), "Jane Doe")
+        extract.assert_not_called()
+        self.assertEqual(pdf.cache_hits.value, hits + 1)
+
+    def test_size_cap_checked_before_cache(self):
+        data = make_pdf(["Jane Doe"])
+        extract_cv_text(io.BytesIO(data))
+        with (
+            override_settings(PDF_MAX_BYTES=len(data) - 1),
+            self.assertRaises(PDFTooLargeError),
+        ):
+            extract_cv_text(io.BytesIO(data))
+
+
+class TextifyEndpointTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.profile = UserProfile.objects.create(user=self.user, fullname="Test User")
+        token = AccessToken.for_user(self.user)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def upload(self, data):
+        return self.client.post(
+            "/api/pdf/textify",
+            {"file": SimpleUploadedFile("cv.pdf", data)},
+            **self.auth,
+        )
+
+    def test_text_is_saved_to_profile(self):
+        response = self.upload(make_pdf(["Jane Doe", "Django"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["text"], "Jane Doe\nDjango")
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.cv_full, "Jane Doe\nDjango")
+
+    @override_settings(PDF_MAX_PAGES=1)
+    def test_page_cap(self):
+        response = self.upload(make_pdf(["One", "Two"]))
+        self.assertEqual(response.status_code, 413)
+
+    def test_invalid_pdf(self):
+        with self.assertLogs("pypdf", "WARNING"):
+            self.assertEqual(self.upload(b"not a pdf").status_code, 400)
+
+    @mock.patch("users.views.extract_cv_text", side_effect=PDFExtractionTimeout)
+    def test_timeout(self, _):
+        self.assertEqual(self.upload(make_pdf(["Jane Doe"])).status_code, 504)
@@ -0,0 +1,169 @@
+"""
+Tests for materialized per-profile recommendations.
+"""
+
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from jobs.models import Job
+from resources.models import LearningResource
+from users import recommendations
+from users.matching import match_jobs_for_user, match_resources_for_user
+from users.models import Skill, UserProfile, UserRecommendation
+from users.recommendations import RECOMMENDATIONS_PER_KIND
+
+User = get_user_model()
+
+
+@override_settings(RECOMMENDATION_WORKERS=0)
+class UserRecommendationTests(TestCase):
+    """Stored recommendations follow skill changes on both sides."""
+
+    def setUp(self):
+        """Create skills, a profile and a small catalog."""
+        self.python = Skill.objects.create(name="Python")
+        self.django = Skill.objects.create(name="Django")
+        self.react = Skill.objects.create(name="React")
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.profile = UserProfile.objects.create(user=self.user, fullname="Test User")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend = Job.objects.create(title="Backend", company="Tech Corp")
+            self.backend.required_skills.set([self.python, self.django])
+            self.frontend = Job.objects.create(title="Frontend", company="Web Co")
+            self.frontend.required_skills.set([self.react])
+
+            self.resource = LearningResource.objects.create(
+                title="React Course", url="https://example.com/react"
+            )
+            self.resource.related_skills.set([self.react])
+
+    def stored_job_ids(self):
+        return list(
+            self.profile.recommendations.filter(
+                kind=UserRecommendation.Kind.JOB
+            ).values_list("job_id", flat=True)
+        )
+
+    def assertMatchesLiveRanking(self):
+        """Stored rows equal what the live matchers return."""
+        jobs = match_jobs_for_user(
+            self.profile, Job.objects.all(), limit=RECOMMENDATIONS_PER_KIND
+        )
+        resources = match_resources_for_user(
+            self.profile,
+            LearningResource.objects.all(),
+            limit=RECOMMENDATIONS_PER_KIND,
+        )
+        stored = list(
+            self.profile.recommendations.values_list(
+                "kind", "job_id", "resource_id", "match_score", "matching_skills"
+            )
+        )
+        expected = [
+            ("job", m["job_id"], None, m["match_score"], m["matching_skills"])
+            for m in jobs
+        ] + [
+            ("resource", None, m["resource_id"], m["match_score"], m["matching_skills"])
+            for m in resources
+        ]
+        self.assertEqual(stored, expected)
+
+    def test_profile_skill_change_refreshes_rows(self):
+        """Setting profile skills re-ranks that profile."""
+        self.profile.skills.set([self.react])
+        self.assertEqual(self.stored_job_ids(), [self.frontend.id, self.backend.id])
+
+        self.profile.skills.set([self.python])
+        self.assertEqual(self.stored_job_ids(), [self.backend.id, self.frontend.id])
+        self.assertMatchesLiveRanking()
+
+    def test_catalog_changes_refresh_rows(self):
+        """Job skill changes, creations and deletions reach affected profiles."""
+        self.profile.skills.set([self.react])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend.required_skills.add(self.react)
+        self.assertMatchesLiveRanking()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            extra = Job.objects.create(title="Anything", company="Open Co")
+        self.assertIn(extra.id, self.stored_job_ids())
+        self.assertMatchesLiveRanking()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.frontend.delete()
+        self.assertMatchesLiveRanking()
+
+    def test_catalog_change_refreshes_after_commit_once(self):
+        """A job created with its skills is refreshed once, after the commit."""
+        self.profile.skills.set([self.react])
+        with (
+            mock.patch.object(
+                recommendations,
+                "refresh_for_items",
+                wraps=recommendations.refresh_for_items,
+            ) as refresh,
+            self.captureOnCommitCallbacks(execute=True),
+            transaction.atomic(),
+        ):
+            job = Job.objects.create(title="React Dev", company="UI Co")
+            job.required_skills.set([self.react])
+            refresh.assert_not_called()
+        refresh.assert_called_once_with(UserRecommendation.Kind.JOB, {job.id})
+        self.assertEqual(self.stored_job_ids()[:2], [self.frontend.id, job.id])
+
+    def test_unrelated_catalog_change_skips_full_profiles(self):
+        """Profiles whose stored rows all beat the new item are not rewritten."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(RECOMMENDATIONS_PER_KIND):
+                job = Job.objects.create(title=f"React {i}", company="UI Co")
+                job.required_skills.set([self.react])
+        self.profile.skills.set([self.react])
+        stored = set(self.profile.recommendations.values_list("pk", flat=True))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job = Job.objects.create(title="Backend", company="Tech Corp")
+            job.required_skills.set([self.python])
+        self.assertEqual(
+            set(self.profile.recommendations.values_list("pk", flat=True)), stored
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job.required_skills.add(self.react)
+        self.assertMatchesLiveRanking()
+
+    def test_new_item_winning_a_tie_on_matching_skills(self):
+        """Equal scores rank the item with more matching skills first."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(RECOMMENDATIONS_PER_KIND):
+                job = Job.objects.create(title=f"Python {i}", company="Py Co")
+                job.required_skills.set(
+                    [self.python, Skill.objects.create(name=f"Extra {i}")]
+                )
+        self.profile.skills.set([self.python, self.django])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job = Job.objects.create(title="Full stack", company="Web Co")
+            job.required_skills.set(
+                [self.python, self.django, self.react, Skill.objects.create(name="Go")]
+            )
+        self.assertEqual(self.stored_job_ids()[:2], [self.backend.id, job.id])
+        self.assertMatchesLiveRanking()
+
+    def test_rebuild_command(self):
+        """The rebuild command recreates the whole table."""
+        self.profile.skills.set([self.python])
+        UserRecommendation.objects.all().delete()
+
+        call_command("rebuild_recommendations", stdout=StringIO())
+
+        self.assertMatchesLiveRanking()
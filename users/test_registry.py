@@ -0,0 +1,81 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from ninja_jwt.tokens import AccessToken
+
+from users.models import Skill, User, UserProfile
+from users.registry import SkillRegistry
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class SkillRegistryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.python = Skill.objects.create(name="Python")
+        self.node = Skill.objects.create(name="Node JS")
+        self.registry = SkillRegistry()
+        self.registry.load()
+
+    def test_known_names_resolve_without_queries(self):
+        with self.assertNumQueries(0):
+            ids = self.registry.resolve_many(["python", " PYTHON ", "node-js", ""])
+        self.assertEqual(ids, [self.python.id, self.node.id])
+
+    def test_missing_names_are_created_in_bulk(self):
+        with self.assertNumQueries(2):
+            ids = self.registry.resolve_many(["Rust", "Go", "rust", "Python"])
+        rust, go = Skill.objects.get(slug="rust"), Skill.objects.get(slug="go")
+        self.assertEqual(ids, [rust.id, go.id, self.python.id])
+        self.assertEqual(rust.name, "Rust")
+
+        # The registry's own write does not force a reload
+        with self.assertNumQueries(0):
+            self.assertEqual(self.registry.resolve_many(["go"]), [go.id])
+
+    def test_unknown_names_without_create(self):
+        self.assertEqual(
+            self.registry.resolve_many(["Cobol"], create_missing=False), []
+        )
+        self.assertFalse(Skill.objects.filter(name="Cobol").exists())
+
+    def test_reloads_after_writes_from_other_processes(self):
+        django = Skill.objects.create(name="Django")
+        self.python.delete()
+
+        ids = self.registry.resolve_many(["Django", "Python"], create_missing=False)
+        self.assertEqual(ids, [django.id])
+
+
+class SkillEndpointTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.profile = UserProfile.objects.create(user=self.user, fullname="Test User")
+        self.python = Skill.objects.create(name="Python")
+        token = AccessToken.for_user(self.user)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def test_add_existing_and_new_skills(self):
+        response = self.client.post(
+            "/api/skills",
+            json.dumps(["python", "Docker"]),
+            content_type="application/json",
+            **self.auth,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(
+            self.profile.skills.values_list("name", flat=True), ["Python", "Docker"]
+        )
+
+    def test_remove_skill(self):
+        self.profile.skills.add(self.python)
+        response = self.client.delete("/api/skills?skill_name=PYTHON", **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.profile.skills.exists())
+
+        response = self.client.delete("/api/skills?skill_name=Cobol", **self.auth)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,149 @@
+import unittest
+
+import boto3
+import requests
+from django.core import signing
+from django.test import TestCase, override_settings
+from ninja_jwt.tokens import AccessToken
+
+from users.models import GeneratedRoadmap, Project, User
+from users.test_pdf import make_pdf
+from users.uploads import SIGNING_SALT
+
+try:
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+BUCKET = "jobsikari-test"
+
+S3_STORAGES = {
+    "default": {
+        "BACKEND": "storages.backends.s3.S3Storage",
+        "OPTIONS": {
+            "access_key": "testing",
+            "secret_key": "testing",
+            "bucket_name": BUCKET,
+            "endpoint_url": None,
+            "region_name": "us-east-1",
+        },
+    },
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class UploadTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.project = Project.objects.create(
+            user=self.user, title="Portfolio", description="Site"
+        )
+        token = AccessToken.for_user(self.user)
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def intent(self, **data):
+        body = {
+            "target": "roadmap",
+            "filename": "roadmap.pdf",
+            "content_type": "application/pdf",
+            "size": 1024,
+            **data,
+        }
+        return self.client.post(
+            "/api/uploads/intent", body, content_type="application/json", **self.auth
+        )
+
+    def confirm(self, token):
+        return self.client.post(
+            "/api/uploads/confirm",
+            {"token": token},
+            content_type="application/json",
+            **self.auth,
+        )
+
+
+@override_settings(STORAGES=S3_STORAGES)
+class UploadIntentTests(UploadTestCase):
+    def test_presigned_post(self):
+        response = self.intent()
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body["key"].startswith("cvs/"))
+        self.assertTrue(body["key"].endswith("/roadmap.pdf"))
+        self.assertEqual(body["fields"]["key"], body["key"])
+        self.assertEqual(body["fields"]["Content-Type"], "application/pdf")
+        intent = signing.loads(body["token"], salt=SIGNING_SALT)
+        self.assertEqual(intent["user"], self.user.pk)
+
+    def test_limits(self):
+        self.assertEqual(self.intent(content_type="text/html").status_code, 400)
+        self.assertEqual(self.intent(size=11 * 1024 * 1024).status_code, 400)
+
+    def test_project_must_belong_to_user(self):
+        other = User.objects.create_user(email="other@example.com", password="x")
+        project = Project.objects.create(user=other, title="Theirs", description="")
+        response = self.intent(
+            target="project_image",
+            filename="shot.png",
+            content_type="image/png",
+            project_id=project.pk,
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_forged_token(self):
+        self.assertEqual(self.confirm("not-a-token").status_code, 400)
+
+    def test_token_of_other_user(self):
+        token = self.intent().json()["token"]
+        other = User.objects.create_user(email="other@example.com", password="x")
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(other)}"}
+        self.assertEqual(self.confirm(token).status_code, 400)
+
+
+@unittest.skipUnless(mock_aws, "moto is not installed")
+@override_settings(STORAGES=S3_STORAGES)
+class DirectUploadTests(UploadTestCase):
+    def setUp(self):
+        super().setUp()
+        mock = mock_aws()
+        mock.start()
+        self.addCleanup(mock.stop)
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+
+    def upload(self, intent, data, content_type):
+        fields = {**intent["fields"], "Content-Type": content_type}
+        return requests.post(
+            intent["url"], data=fields, files={"file": ("upload", data)}, timeout=5
+        )
+
+    def test_roadmap_upload(self):
+        data = make_pdf(["Roadmap"])
+        intent = self.intent(size=len(data)).json()
+        self.assertLess(self.upload(intent, data, "application/pdf").status_code, 300)
+
+        response = self.confirm(intent["token"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["key"], intent["key"])
+        roadmap = GeneratedRoadmap.objects.get(user=self.user)
+        self.assertEqual(roadmap.file.name, intent["key"])
+        self.assertEqual(roadmap.file.read(), data)
+
+    def test_project_image_upload(self):
+        intent = self.intent(
+            target="project_image",
+            filename="shot.png",
+            content_type="image/png",
+            project_id=self.project.pk,
+        ).json()
+        self.upload(intent, b"\x89PNG fake", "image/png")
+
+        self.assertEqual(self.confirm(intent["token"]).status_code, 200)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.image.name, intent["key"])
+
+    def test_confirm_before_upload(self):
+        intent = self.intent().json()
+        self.assertEqual(self.confirm(intent["token"]).status_code, 400)
+        self.assertFalse(GeneratedRoadmap.objects.filter(user=self.user).exists())
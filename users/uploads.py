@@ -0,0 +1,169 @@
+"""
+Direct-to-S3 uploads of roadmaps and project images.
+
+Instead of streaming files through a web worker, clients ask for an upload
+intent: a presigned POST restricted to one object key, content type and
+size range, plus a signed token naming that key. The browser posts the
+file straight to S3, then sends the token to the confirm endpoint, which
+checks the object landed within the limits and records its key on the
+model field. The file bytes never reach Django.
+"""
+
+import uuid
+from dataclasses import dataclass
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+
+from .models import GeneratedRoadmap, Project
+
+SIGNING_SALT = "users.uploads"
+
+
+class UploadError(Exception):
+    """The upload intent or confirmation is invalid."""
+
+
+class DirectUploadUnavailable(Exception):
+    """The default storage does not support presigned uploads."""
+
+
+@dataclass(frozen=True)
+class Target:
+    model: type
+    field: str
+    content_types: tuple[str, ...]
+    max_bytes: int
+
+
+TARGETS = {
+    "roadmap": Target(GeneratedRoadmap, "file", ("application/pdf",), 10 * 1024 * 1024),
+    "project_image": Target(
+        Project, "image", ("image/jpeg", "image/png", "image/webp"), 5 * 1024 * 1024
+    ),
+}
+
+
+def _client():
+    connection = getattr(default_storage, "connection", None)
+    if connection is None:
+        raise DirectUploadUnavailable("Storage does not support direct uploads")
+    return connection.meta.client
+
+
+def _object_key(target: Target, filename: str) -> tuple[str, str]:
+    """Storage name and S3 key of a new upload; the key adds the location."""
+    field = target.model._meta.get_field(target.field)
+    filename = get_valid_filename(filename) or "upload"
+    name = field.generate_filename(None, f"{uuid.uuid4().hex}/{filename}")
+    return name, default_storage._normalize_name(name)
+
+
+def create_intent(
+    user,
+    target_name: str,
+    filename: str,
+    content_type: str,
+    size: int,
+    object_id: int | None = None,
+) -> dict:
+    """
+    Presign an upload of one file to a model field.
+
+    Args:
+        user: Uploading user, who must own the target instance
+        target_name: Key of ``TARGETS``
+        filename: Original file name, kept as the last path segment
+        content_type: MIME type the upload must be sent with
+        size: Size of the file in bytes
+        object_id: Project id for ``project_image``
+
+    Returns:
+        Dict with the POST ``url`` and form ``fields``, the storage ``key``,
+        the ``token`` to confirm with and ``expires_in`` seconds
+
+    Raises:
+        UploadError: Unknown target, or content type or size not allowed
+        DirectUploadUnavailable: The storage is not S3
+        Project.DoesNotExist: ``object_id`` is not a project of ``user``
+    """
+    target = TARGETS.get(target_name)
+    if target is None:
+        raise UploadError(f"Unknown upload target: {target_name}")
+    if content_type not in target.content_types:
+        raise UploadError(f"Content type {content_type} is not allowed")
+    if not 0 < size <= target.max_bytes:
+        raise UploadError(f"File must be between 1 and {target.max_bytes} bytes")
+    if target.model is Project:
+        object_id = Project.objects.only("id").get(pk=object_id, user=user).pk
+
+    name, key = _object_key(target, filename)
+    expires_in = settings.DIRECT_UPLOAD_EXPIRES
+    post = _client().generate_presigned_post(
+        Bucket=default_storage.bucket_name,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, target.max_bytes],
+        ],
+        ExpiresIn=expires_in,
+    )
+    token = signing.dumps(
+        {"user": user.pk, "target": target_name, "name": name, "id": object_id},
+        salt=SIGNING_SALT,
+    )
+    return {
+        "url": post["url"],
+        "fields": post["fields"],
+        "key": name,
+        "token": token,
+        "expires_in": expires_in,
+    }
+
+
+def confirm_upload(user, token: str):
+    """
+    Record a finished direct upload on its model field.
+
+    Returns:
+        The updated GeneratedRoadmap or Project
+
+    Raises:
+        UploadError: The token is invalid, expired or for another user, or
+            the object is missing or outside the limits
+        Project.DoesNotExist: The project was deleted since the intent
+    """
+    try:
+        intent = signing.loads(
+            token, salt=SIGNING_SALT, max_age=settings.DIRECT_UPLOAD_EXPIRES * 2
+        )
+    except signing.BadSignature as exc:
+        raise UploadError("Invalid or expired upload token") from exc
+    if intent["user"] != user.pk:
+        raise UploadError("Invalid or expired upload token")
+
+    target = TARGETS[intent["target"]]
+    name = intent["name"]
+    try:
+        head = _client().head_object(
+            Bucket=default_storage.bucket_name,
+            Key=default_storage._normalize_name(name),
+        )
+    except ClientError as exc:
+        raise UploadError("Uploaded file not found") from exc
+    if head["ContentLength"] > target.max_bytes:
+        raise UploadError("Uploaded file is too large")
+    if head.get("ContentType") not in target.content_types:
+        raise UploadError("Uploaded file has the wrong content type")
+
+    if target.model is Project:
+        instance = Project.objects.get(pk=intent["id"], user=user)
+    else:
+        instance, _ = GeneratedRoadmap.objects.get_or_create(user=user)
+    getattr(instance, target.field).name = name
+    instance.save()
+    return instance
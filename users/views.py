@@ -1,32 +1,46 @@
-import os
-import tempfile
 import uuid
 
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
-from django.db import IntegrityError
 from django.db.models import Count
 from django.shortcuts import get_object_or_404
-from django.utils.text import slugify
 from ninja import File, Form
 from ninja.errors import HttpError
 from ninja.files import UploadedFile
 from ninja_extra import api_controller, http_delete, http_get, http_post
 from ninja_jwt.authentication import JWTAuth
 from ninja_jwt.controller import NinjaJWTDefaultController
-from pypdf import PdfReader
 
 from jobs.models import Job
 
-from .models import Careers, GeneratedRoadmap, Project, Skill, User, UserProfile
+from .bulk import add_m2m, resolve_careers, sync_m2m
+from .extraction import enqueue
+from .models import (
+    Careers,
+    ExtractionJob,
+    GeneratedRoadmap,
+    Project,
+    Skill,
+    User,
+    UserProfile,
+)
+from .pdf import PDFExtractionTimeout, PDFTooLargeError, extract_cv_text
+from .registry import skill_registry
 from .schema import (
     CVSchemaOut,
+    ExtractionJobSchemaOut,
     ProfileSchema,
     ProjectSchema,
     RegisterUserSchema,
+    TextifySchemaOut,
     UpdateProfileSchema,
+    UploadConfirmSchema,
+    UploadConfirmSchemaOut,
+    UploadIntentSchema,
+    UploadIntentSchemaOut,
     UserSchema,
 )
+from .uploads import DirectUploadUnavailable, UploadError, confirm_upload, create_intent
 
 
 @api_controller(tags=["UserAPI"])
@@ -113,42 +127,13 @@ class UserAPI:
 
         # Skills: accept list of skill names, create if missing
         if data.skills is not None:
-            skill_objs = []
-            for name in data.skills:
-                name = name.strip()
-                if not name:
-                    continue
-
-                # Try to get by slug first (in case different names slugify to same slug)
-                slug = slugify(name)
-                skill_obj = None
-                try:
-                    skill_obj = Skill.objects.get(slug=slug)
-                except Skill.DoesNotExist:
-                    # Try to get by name (case-insensitive)
-                    try:
-                        skill_obj = Skill.objects.get(name__iexact=name)
-                    except Skill.DoesNotExist:
-                        # Create new skill, handling potential slug collisions
-                        try:
-                            skill_obj, _ = Skill.objects.get_or_create(name=name)
-                        except IntegrityError:
-                            # If slug collision occurs, get the existing skill by slug
-                            skill_obj = Skill.objects.get(slug=slug)
-
-                skill_objs.append(skill_obj)
-            profile.skills.set(skill_objs)
+            sync_m2m(profile, "skills", skill_registry.resolve_many(data.skills))
 
         # Preferred careers: accept list of titles
         if data.preferred_careers is not None:
-            career_objs = []
-            for title in data.preferred_careers:
-                title = title.strip()
-                if not title:
-                    continue
-                career_obj, _ = Careers.objects.get_or_create(title=title)
-                career_objs.append(career_obj)
-            profile.preferred_careers.set(career_objs)
+            sync_m2m(
+                profile, "preferred_careers", resolve_careers(data.preferred_careers)
+            )
 
         profile.save()
         return {
@@ -170,39 +155,23 @@ class UserAPI:
 
     @http_post("/skills", auth=JWTAuth())
     def add_skill(self, request, skill_names: list[str]):
-        for skill_name in skill_names:
-            skill_name = skill_name.strip()
-
-            slug = slugify(skill_name)
-            skill_obj = None
-            try:
-                Skill.objects.get(slug=slug)
-            except Skill.DoesNotExist:
-                skill_obj = Skill.objects.create(name=skill_name)
-
-            request.user.profile.skills.add(skill_obj)
+        add_m2m(
+            request.user.profile, "skills", skill_registry.resolve_many(skill_names)
+        )
         return {"message": "Skill(s) added successfully"}
 
     @http_delete("/skills", auth=JWTAuth())
     def remove_skill(self, request, skill_name: str):
-        skill_name = skill_name.strip()
-        slug = slugify(skill_name)
-        try:
-            skill_obj = Skill.objects.get(slug=slug)
-            request.user.profile.skills.remove(skill_obj)
-            return {"message": "Skill removed successfully"}
-        except Skill.DoesNotExist:
+        skill_ids = skill_registry.resolve_many([skill_name], create_missing=False)
+        if not skill_ids:
             raise HttpError(404, "Skill not found")
+        request.user.profile.skills.remove(*skill_ids)
+        return {"message": "Skill removed successfully"}
 
     @http_post("/suggested_roles", auth=JWTAuth())
     def add_suggested_role(self, request, career_titles: list[str]):
-        print(career_titles)
-        for title in career_titles:
-            title = title.strip()
-            if not title:
-                continue
-            career_obj, _ = Careers.objects.get_or_create(title=title.capitalize())
-            request.user.profile.suggested_roles.add(career_obj)
+        titles = [title.strip().capitalize() for title in career_titles]
+        add_m2m(request.user.profile, "suggested_roles", resolve_careers(titles))
         return {"message": "Suggested role(s) added successfully"}
 
     @http_post("/add_project", auth=JWTAuth())
@@ -230,7 +199,7 @@ class UserAPI:
 @api_controller(tags="Register API")
 class RegisterAPI:
     @http_post("/register", response=UserSchema)
-    def register_user(self, request, data: RegisterUserSchema):
+    async def register_user(self, request, data: RegisterUserSchema):
         # Basic validation
         if not data.fullname or not data.fullname.strip():
             raise HttpError(400, "fullname is required")
@@ -243,15 +212,16 @@ class RegisterAPI:
         if len(data.password or "") < 8:
             raise HttpError(400, "Password must be at least 8 characters")
 
-        if User.objects.filter(email=data.email).exists():
+        if await User.objects.filter(email=data.email).aexists():
             raise HttpError(400, "A user with that email already exists")
 
-        user = User.objects.create_user(
+        # Hashed on the bounded pool without holding a thread
+        user = await User.objects.acreate_user(
             username=str(uuid.uuid4()),
             email=data.email,
             password=data.password,
         )
-        profile, _ = UserProfile.objects.get_or_create(
+        profile, _ = await UserProfile.objects.aget_or_create(
             user=user,
             fullname=data.fullname,
         )
@@ -269,40 +239,44 @@ class NinjaJWTController(NinjaJWTDefaultController):
 
 @api_controller(tags=["PDF", "MISCs"])
 class PDFController:
-    @http_post("/pdf/textify", auth=JWTAuth())
-    def textify(self, request, file: File[UploadedFile]):
-        try:
-            suffix = (
-                os.path.splitext(getattr(file, "filename", "upload.pdf"))[1] or ".pdf"
-            )
-            tmp_path = None
+    @http_post(
+        "/pdf/textify",
+        auth=JWTAuth(),
+        response={200: TextifySchemaOut, 202: ExtractionJobSchemaOut},
+    )
+    def textify(self, request, file: File[UploadedFile], background: bool = False):
+        """
+        Extract the text of a CV and store it on the profile.
+
+        With ``background=true`` the upload is queued for an extraction
+        worker and a 202 with the job to poll is returned instead.
+        """
+        if background:
             try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                    tmp_path = tmp.name
-                    # Try to read from underlying file object, fallback to .read()
-                    try:
-                        file.file.seek(0)
-                        tmp.write(file.file.read())
-                    except Exception:
-                        tmp.write(file.read())
-
-                reader = PdfReader(tmp_path)
-                text_parts = []
-                for page in reader.pages:
-                    text_parts.append(page.extract_text() or "")
-
-                request.user.profile.cv_full = "\n".join(text_parts).strip()
-                request.user.profile.save()
-                return {"text": "\n".join(text_parts).strip()}
-            finally:
-                if tmp_path and os.path.exists(tmp_path):
-                    try:
-                        os.remove(tmp_path)
-                    except Exception:
-                        pass
+                return 202, enqueue(request.user, file)
+            except PDFTooLargeError as e:
+                raise HttpError(413, str(e))
+
+        try:
+            text = extract_cv_text(file)
+        except PDFTooLargeError as e:
+            raise HttpError(413, str(e))
+        except PDFExtractionTimeout as e:
+            raise HttpError(504, str(e))
         except Exception as e:
             raise HttpError(400, f"Failed to extract text from PDF: {str(e)}")
 
+        profile = request.user.profile
+        profile.cv_full = text
+        profile.save(update_fields=["cv_full"])
+        return {"text": text}
+
+    @http_get("/pdf/textify/{job_id}", auth=JWTAuth(), response=ExtractionJobSchemaOut)
+    def get_extraction_job(self, request, job_id: uuid.UUID):
+        return get_object_or_404(
+            ExtractionJob.objects.defer("payload"), pk=job_id, user=request.user
+        )
+
     @http_get("/roadmap/get", auth=JWTAuth(), response=CVSchemaOut)
     def get_user_cv(self, request):
         cv, _ = GeneratedRoadmap.objects.get_or_create(
@@ -321,6 +295,42 @@ class PDFController:
         return cv
 
 
+@api_controller(tags=["Uploads"])
+class UploadAPI:
+    """Presigned uploads straight to S3, bypassing the web workers."""
+
+    @http_post("/uploads/intent", auth=JWTAuth(), response=UploadIntentSchemaOut)
+    def create_upload_intent(self, request, data: UploadIntentSchema):
+        try:
+            return create_intent(
+                request.user,
+                data.target,
+                data.filename,
+                data.content_type,
+                data.size,
+                object_id=data.project_id,
+            )
+        except Project.DoesNotExist:
+            raise HttpError(404, "Project not found")
+        except UploadError as e:
+            raise HttpError(400, str(e))
+        except DirectUploadUnavailable as e:
+            raise HttpError(501, str(e))
+
+    @http_post("/uploads/confirm", auth=JWTAuth(), response=UploadConfirmSchemaOut)
+    def confirm_upload(self, request, data: UploadConfirmSchema):
+        try:
+            instance = confirm_upload(request.user, data.token)
+        except Project.DoesNotExist:
+            raise HttpError(404, "Project not found")
+        except UploadError as e:
+            raise HttpError(400, str(e))
+        except DirectUploadUnavailable as e:
+            raise HttpError(501, str(e))
+        file = instance.image if isinstance(instance, Project) else instance.file
+        return {"key": file.name, "url": file.url}
+
+
 def dashboard_callback(request, context):
     user_count = User.objects.count()
     job_count = Job.objects.count()